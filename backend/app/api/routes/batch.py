@@ -0,0 +1,141 @@
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Any, Dict, List, Optional
+import logging
+
+from app.services.batch import BatchCompute, spool_batch, stream_batch
+from app.services.pdf_service import PDFService
+from app.utils.helpers import generate_unique_filename
+from app.utils.uploads import cleanup_uploads
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+async def _batch_response(
+    operation: str,
+    files: List[UploadFile],
+    params: Dict[str, Any],
+    compute: BatchCompute,
+    extension: str
+) -> StreamingResponse:
+    """Spool the batch and stream its results as a ZIP download"""
+    try:
+        items = await spool_batch(files)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in batch {operation} endpoint: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    filename = f"batch_{generate_unique_filename('zip')}"
+    # The stream deletes the uploads as it goes, but never runs if the client
+    # disconnects before the first byte; the background task runs either way
+    return StreamingResponse(
+        stream_batch(operation, items, params, compute, extension),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        background=BackgroundTask(cleanup_uploads, [item.upload for item in items if item.upload])
+    )
+
+
+@router.post("/batch/compress")
+async def batch_compress(
+    files: List[UploadFile] = File(...),
+    quality: str = Form("medium")
+):
+    """
+    Compress several PDF files
+
+    Returns a ZIP with one compressed PDF per input and a manifest.json
+    listing the status of every file.
+
+    Args:
+        files: PDF files to compress
+        quality: Compression quality (low, medium, high)
+    """
+    if quality not in ["low", "medium", "high"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Quality must be 'low', 'medium', or 'high'"
+        )
+
+    async def compute(path: str):
+        output, images = await PDFService.compress_pdf(path, quality)
+        return output, {"images": images}
+
+    return await _batch_response("compress_pdf", files, {"quality": quality}, compute, "pdf")
+
+
+@router.post("/batch/rotate")
+async def batch_rotate(
+    files: List[UploadFile] = File(...),
+    rotation: int = Form(...),
+    pages: Optional[str] = Form(None)
+):
+    """
+    Rotate pages in several PDF files
+
+    Returns a ZIP with one rotated PDF per input and a manifest.json listing
+    the status of every file. A file whose page range doesn't fit it is
+    reported as failed.
+
+    Args:
+        files: PDF files to rotate
+        rotation: Rotation angle (90, 180, 270)
+        pages: Optional page ranges (e.g., "1-3,5"). If not provided, rotates all pages
+    """
+    if rotation not in [90, 180, 270]:
+        raise HTTPException(
+            status_code=400,
+            detail="Rotation must be 90, 180, or 270 degrees"
+        )
+
+    pages = pages or None
+    return await _batch_response(
+        "rotate_pdf",
+        files,
+        {"rotation": rotation, "pages": pages},
+        lambda path: PDFService.rotate_pdf(path, rotation, pages),
+        "pdf"
+    )
+
+
+@router.post("/batch/pdf-to-jpg")
+async def batch_pdf_to_jpg(
+    files: List[UploadFile] = File(...),
+    format: str = Form(default="jpeg"),
+    dpi: int = Form(default=200)
+):
+    """
+    Convert several PDF files to images
+
+    Returns a ZIP with one ZIP of page images per input and a manifest.json
+    listing the status of every file.
+
+    Args:
+        files: PDF files to convert
+        format: Image format (jpeg, png)
+        dpi: Resolution in dots per inch (72-600)
+    """
+    if format.lower() not in ["jpeg", "jpg", "png"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Format must be 'jpeg' or 'png'"
+        )
+
+    if dpi < 72 or dpi > 600:
+        raise HTTPException(
+            status_code=400,
+            detail="DPI must be between 72 and 600"
+        )
+
+    img_format = "png" if format.lower() == "png" else "jpeg"
+    return await _batch_response(
+        "pdf_to_images",
+        files,
+        {"format": img_format, "dpi": dpi},
+        lambda path: PDFService.pdf_to_images(path, img_format, dpi),
+        "zip"
+    )
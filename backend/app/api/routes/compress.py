@@ -1,10 +1,11 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
 import logging
 
 from app.services.pdf_service import PDFService
-from app.storage.local_storage import blob_storage
-from app.utils.helpers import generate_unique_filename, validate_pdf_file, format_file_size
-from app.core.config import settings
+from app.utils.helpers import validate_pdf_file, format_file_size
+from app.services.result_cache import get_or_create_result
+from app.utils.downloads import result_response, wants_direct_response
+from app.utils.uploads import spool_upload
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -12,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 @router.post("/compress")
 async def compress_pdf(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file: UploadFile = File(...),
     quality: str = Form("medium")
 ):
@@ -23,6 +24,7 @@ async def compress_pdf(
         file: PDF file to compress
         quality: Compression quality (low, medium, high)
     """
+    upload = None
     try:
         # Validate PDF file
         if not validate_pdf_file(file.filename):
@@ -38,62 +40,45 @@ async def compress_pdf(
                 detail="Quality must be 'low', 'medium', or 'high'"
             )
         
-        # Read file content
-        content = await file.read()
-        original_size = len(content)
-        
-        # Check file size
-        if original_size > settings.max_file_size_bytes:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File size exceeds {settings.max_file_size_mb}MB limit"
-            )
+        # Spool upload to a file the workers can open, hashing and size-checking it
+        upload = await spool_upload(file)
+        original_size = upload.size
         
         # Compress PDF
-        compressed_pdf = await PDFService.compress_pdf(content, quality)
-        compressed_size = len(compressed_pdf)
+        result = await get_or_create_result(
+            "compress_pdf",
+            [upload],
+            {"quality": quality},
+            lambda: PDFService.compress_pdf(upload.path, quality),
+            extension="pdf",
+            content_type="application/pdf",
+            direct=wants_direct_response(request)
+        )
+        compressed_size = result["size"]
         
         # Calculate reduction percentage
         reduction = ((original_size - compressed_size) / original_size) * 100
         
-        # Generate unique filename
-        output_filename = generate_unique_filename("pdf")
-        
-        # Upload to Azure Blob Storage
-        blob_url = await blob_storage.upload_file(
-            compressed_pdf,
-            output_filename,
-            content_type="application/pdf"
-        )
-        
-        # Schedule cleanup
-        background_tasks.add_task(
-            schedule_file_cleanup,
-            output_filename
-        )
-        
-        return {
+        return result_response(result, {
             "success": True,
             "message": "PDF compressed successfully",
-            "filename": output_filename,
-            "download_url": blob_url,
+            "filename": result["filename"],
+            "download_url": result["download_url"],
+            "cached": result["cached"],
             "original_size": original_size,
             "compressed_size": compressed_size,
             "original_size_formatted": format_file_size(original_size),
             "compressed_size_formatted": format_file_size(compressed_size),
             "reduction_percentage": round(reduction, 2),
-            "quality": quality
-        }
+            "quality": quality,
+            "images": result["extra"]
+        })
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error in compress endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-
-
-async def schedule_file_cleanup(filename: str):
-    """Background task to cleanup file after retention period"""
-    import asyncio
-    await asyncio.sleep(settings.file_retention_minutes * 60)
-    await blob_storage.delete_file(filename)
+    finally:
+        if upload:
+            upload.cleanup()
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import logging
+
+from app.storage import blob_storage
+from app.utils.downloads import RangeNotSatisfiableError, is_not_modified, parse_range, validator_headers
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.api_route("/download/{filename}", methods=["GET", "HEAD"])
+async def download_file(filename: str, request: Request):
+    """
+    Download a processed file
+
+    Streams the file from the storage backend with its stored MIME type.
+    Supports conditional requests (If-None-Match, If-Modified-Since -> 304)
+    and single byte ranges (Range, If-Range -> 206) for resumable downloads.
+    """
+    properties = await blob_storage.get_properties(filename)
+    if properties is None:
+        return JSONResponse(status_code=404, content={"detail": "File not found"})
+
+    headers = validator_headers(properties)
+    if is_not_modified(request.headers, properties):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        byte_range = parse_range(request.headers, properties)
+    except RangeNotSatisfiableError:
+        headers["Content-Range"] = f"bytes */{properties.size}"
+        return Response(status_code=416, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if byte_range is None:
+        status_code, offset, length = 200, 0, properties.size
+    else:
+        first, last = byte_range
+        status_code, offset, length = 206, first, last - first + 1
+        headers["Content-Range"] = f"bytes {first}-{last}/{properties.size}"
+    headers["Content-Length"] = str(length)
+
+    if request.method == "HEAD":
+        return Response(status_code=status_code, headers=headers, media_type=properties.content_type)
+
+    chunks = await blob_storage.stream_file(filename, offset=offset, length=length)
+    if chunks is None:
+        # Deleted (expired) between the properties lookup and the read
+        return JSONResponse(status_code=404, content={"detail": "File not found"})
+    return StreamingResponse(chunks, status_code=status_code, headers=headers, media_type=properties.content_type)
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
 from typing import Optional
 import logging
 
 from app.services.pdf_service import PDFService
-from app.storage.local_storage import blob_storage
-from app.utils.helpers import generate_unique_filename, validate_pdf_file
-from app.core.config import settings
+from app.utils.helpers import validate_pdf_file
+from app.services.result_cache import get_or_create_result
+from app.utils.downloads import result_response, wants_direct_response
+from app.utils.uploads import spool_upload
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -13,16 +14,20 @@ logger = logging.getLogger(__name__)
 
 @router.post("/add-watermark")
 async def add_watermark(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file: UploadFile = File(...),
     watermark_text: str = Form(...),
-    opacity: float = Form(default=0.3)
+    opacity: float = Form(default=0.3),
+    incremental: bool = Form(default=False)
 ):
     """
     Add text watermark to PDF
     
-    Upload a PDF file and add a diagonal text watermark to all pages
+    Upload a PDF file and add a diagonal text watermark to all pages.
+    With incremental set, the changes are appended to the original file
+    instead of rewriting it; the unwatermarked revision stays recoverable.
     """
+    upload = None
     try:
         # Validate PDF file
         if not validate_pdf_file(file.filename):
@@ -51,41 +56,29 @@ async def add_watermark(
                 detail="Opacity must be between 0.1 and 1.0"
             )
         
-        # Read file content
-        content = await file.read()
-        
-        # Check file size
-        if len(content) > settings.max_file_size_bytes:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File size exceeds maximum allowed ({settings.max_file_size}MB)"
-            )
+        # Spool upload to a file the workers can open, hashing and size-checking it
+        upload = await spool_upload(file)
         
         # Add watermark
-        watermarked_content = await PDFService.add_watermark(content, watermark_text.strip(), opacity)
-        
-        # Generate filename and save
-        output_filename = generate_unique_filename("pdf")
-        download_url = await blob_storage.upload_file(
-            watermarked_content,
-            output_filename,
-            content_type="application/pdf"
-        )
-        
-        # Schedule cleanup
-        background_tasks.add_task(
-            blob_storage.delete_file,
-            output_filename,
-            delay_seconds=settings.file_retention_minutes * 60
+        result = await get_or_create_result(
+            "add_watermark",
+            [upload],
+            {"text": watermark_text.strip(), "opacity": opacity, "incremental": incremental},
+            lambda: PDFService.add_watermark(upload.path, watermark_text.strip(), opacity, incremental),
+            extension="pdf",
+            content_type="application/pdf",
+            direct=wants_direct_response(request)
         )
         
-        return {
+        return result_response(result, {
             "success": True,
             "message": "Watermark added successfully",
-            "download_url": download_url,
-            "filename": output_filename,
-            "watermark": watermark_text.strip()
-        }
+            "download_url": result["download_url"],
+            "cached": result["cached"],
+            "filename": result["filename"],
+            "watermark": watermark_text.strip(),
+            "incremental": result["extra"]["incremental"]
+        })
         
     except HTTPException:
         raise
@@ -95,19 +88,26 @@ async def add_watermark(
             status_code=500,
             detail=f"Failed to add watermark: {str(e)}"
         )
+    finally:
+        if upload:
+            upload.cleanup()
 
 
 @router.post("/add-page-numbers")
 async def add_page_numbers(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file: UploadFile = File(...),
-    position: str = Form(default="bottom-center")
+    position: str = Form(default="bottom-center"),
+    incremental: bool = Form(default=False)
 ):
     """
     Add page numbers to PDF
     
-    Upload a PDF file and add page numbers to all pages
+    Upload a PDF file and add page numbers to all pages.
+    With incremental set, the changes are appended to the original file
+    instead of rewriting it.
     """
+    upload = None
     try:
         # Validate PDF file
         if not validate_pdf_file(file.filename):
@@ -124,41 +124,29 @@ async def add_page_numbers(
                 detail=f"Position must be one of: {', '.join(valid_positions)}"
             )
         
-        # Read file content
-        content = await file.read()
-        
-        # Check file size
-        if len(content) > settings.max_file_size_bytes:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File size exceeds maximum allowed ({settings.max_file_size}MB)"
-            )
+        # Spool upload to a file the workers can open, hashing and size-checking it
+        upload = await spool_upload(file)
         
         # Add page numbers
-        numbered_content = await PDFService.add_page_numbers(content, position)
-        
-        # Generate filename and save
-        output_filename = generate_unique_filename("pdf")
-        download_url = await blob_storage.upload_file(
-            numbered_content,
-            output_filename,
-            content_type="application/pdf"
-        )
-        
-        # Schedule cleanup
-        background_tasks.add_task(
-            blob_storage.delete_file,
-            output_filename,
-            delay_seconds=settings.file_retention_minutes * 60
+        result = await get_or_create_result(
+            "add_page_numbers",
+            [upload],
+            {"position": position, "incremental": incremental},
+            lambda: PDFService.add_page_numbers(upload.path, position, incremental),
+            extension="pdf",
+            content_type="application/pdf",
+            direct=wants_direct_response(request)
         )
         
-        return {
+        return result_response(result, {
             "success": True,
             "message": "Page numbers added successfully",
-            "download_url": download_url,
-            "filename": output_filename,
-            "position": position
-        }
+            "download_url": result["download_url"],
+            "cached": result["cached"],
+            "filename": result["filename"],
+            "position": position,
+            "incremental": result["extra"]["incremental"]
+        })
         
     except HTTPException:
         raise
@@ -168,3 +156,6 @@ async def add_page_numbers(
             status_code=500,
             detail=f"Failed to add page numbers: {str(e)}"
         )
+    finally:
+        if upload:
+            upload.cleanup()
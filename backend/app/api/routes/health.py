@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 from datetime import datetime
 
+from app.services.result_cache import result_cache
+
 router = APIRouter()
 
 
@@ -17,3 +19,13 @@ async def health_check():
         "timestamp": datetime.utcnow().isoformat(),
         "version": "1.0.0"
     }
+
+
+@router.get("/health/cache")
+async def cache_stats():
+    """
+    Result cache statistics
+
+    Returns entry count, byte usage and hit/miss counters for sizing the cache
+    """
+    return result_cache.stats()
@@ -0,0 +1,112 @@
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fastapi.responses import JSONResponse
+from typing import Optional
+import logging
+
+from app.services.jobs import job_queue, job_to_response
+from app.utils.helpers import validate_pdf_file
+from app.utils.uploads import spool_upload
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+async def _submit(operation: str, file: UploadFile, params: dict = None) -> JSONResponse:
+    if not validate_pdf_file(file.filename):
+        raise HTTPException(
+            status_code=400,
+            detail="File must be a PDF"
+        )
+
+    upload = await spool_upload(file)
+    try:
+        job = await job_queue.submit(operation, upload, params)
+    finally:
+        # No-op once the queue has moved the file into the job directory
+        upload.cleanup()
+    response = job_to_response(job)
+    response["status_url"] = f"/api/jobs/{job['id']}"
+    return JSONResponse(status_code=202, content={"success": True, **response})
+
+
+@router.post("/jobs/pdf-to-word")
+async def submit_pdf_to_word(
+    file: UploadFile = File(...),
+    pages: Optional[str] = Form(None)
+):
+    """
+    Queue a PDF to Word conversion
+
+    Returns a job ID immediately; poll /api/jobs/{job_id} for the result
+    """
+    try:
+        return await _submit("pdf-to-word", file, {"pages": pages or None})
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error submitting PDF to Word job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/jobs/pdf-to-excel")
+async def submit_pdf_to_excel(file: UploadFile = File(...)):
+    """
+    Queue a PDF to Excel conversion
+
+    Returns a job ID immediately; poll /api/jobs/{job_id} for the result
+    """
+    try:
+        return await _submit("pdf-to-excel", file)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error submitting PDF to Excel job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/jobs/pdf-to-jpg")
+async def submit_pdf_to_jpg(
+    file: UploadFile = File(...),
+    format: str = Form(default="jpeg"),
+    dpi: int = Form(default=200)
+):
+    """
+    Queue a PDF to images conversion
+
+    Returns a job ID immediately; poll /api/jobs/{job_id} for the ZIP result
+    """
+    try:
+        if format.lower() not in ["jpeg", "jpg", "png"]:
+            raise HTTPException(
+                status_code=400,
+                detail="Format must be 'jpeg' or 'png'"
+            )
+
+        if dpi < 72 or dpi > 600:
+            raise HTTPException(
+                status_code=400,
+                detail="DPI must be between 72 and 600"
+            )
+
+        img_format = "png" if format.lower() == "png" else "jpeg"
+        return await _submit("pdf-to-jpg", file, {"format": img_format, "dpi": dpi})
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error submitting PDF to JPG job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the state, progress and result of a background job
+
+    Args:
+        job_id: ID returned when the job was submitted
+    """
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {"success": True, **job_to_response(job)}
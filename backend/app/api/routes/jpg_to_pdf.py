@@ -1,11 +1,11 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from typing import List
 import logging
 
 from app.services.pdf_service import PDFService
-from app.storage.local_storage import blob_storage
-from app.utils.helpers import generate_unique_filename
-from app.core.config import settings
+from app.services.result_cache import get_or_create_result
+from app.utils.downloads import result_response, wants_direct_response
+from app.utils.uploads import spool_uploads, cleanup_uploads
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -23,7 +23,7 @@ def validate_image_file(filename: str) -> bool:
 
 @router.post("/jpg-to-pdf")
 async def jpg_to_pdf(
-    background_tasks: BackgroundTasks,
+    request: Request,
     files: List[UploadFile] = File(...)
 ):
     """
@@ -32,6 +32,7 @@ async def jpg_to_pdf(
     Upload one or more images (JPG, PNG, etc.) to convert them to a PDF document.
     Each image will be placed on its own page.
     """
+    uploads = None
     try:
         # Validate files
         if len(files) < 1:
@@ -40,9 +41,6 @@ async def jpg_to_pdf(
                 detail="At least 1 image file is required"
             )
         
-        image_contents = []
-        total_size = 0
-        
         for file in files:
             # Validate image file
             if not validate_image_file(file.filename):
@@ -50,45 +48,29 @@ async def jpg_to_pdf(
                     status_code=400,
                     detail=f"File {file.filename} is not a supported image format. Supported: JPG, PNG, GIF, BMP, WebP, TIFF"
                 )
-            
-            # Read file content
-            content = await file.read()
-            total_size += len(content)
-            
-            # Check total size
-            if total_size > settings.max_file_size_bytes:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"Total file size exceeds maximum allowed ({settings.max_file_size}MB)"
-                )
-            
-            image_contents.append(content)
         
-        # Convert images to PDF
-        pdf_content = await PDFService.images_to_pdf(image_contents)
+        # Stream uploads to disk, enforcing the per-file and total size limits
+        uploads = await spool_uploads(files)
         
-        # Generate filename and save
-        output_filename = generate_unique_filename("pdf")
-        download_url = await blob_storage.upload_file(
-            pdf_content,
-            output_filename,
-            content_type="application/pdf"
-        )
-        
-        # Schedule cleanup
-        background_tasks.add_task(
-            blob_storage.delete_file,
-            output_filename,
-            delay_seconds=settings.file_retention_minutes * 60
+        # Convert images to PDF
+        result = await get_or_create_result(
+            "images_to_pdf",
+            uploads,
+            None,
+            lambda: PDFService.images_to_pdf([upload.path for upload in uploads]),
+            extension="pdf",
+            content_type="application/pdf",
+            direct=wants_direct_response(request)
         )
         
-        return {
+        return result_response(result, {
             "success": True,
             "message": f"Converted {len(files)} image(s) to PDF successfully",
-            "download_url": download_url,
-            "filename": output_filename,
+            "download_url": result["download_url"],
+            "cached": result["cached"],
+            "filename": result["filename"],
             "pages": len(files)
-        }
+        })
         
     except HTTPException:
         raise
@@ -98,3 +80,5 @@ async def jpg_to_pdf(
             status_code=500,
             detail=f"Failed to convert images to PDF: {str(e)}"
         )
+    finally:
+        cleanup_uploads(uploads or [])
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from typing import List
 import logging
 
 from app.services.pdf_service import PDFService
-from app.storage.local_storage import blob_storage
-from app.utils.helpers import generate_unique_filename, validate_pdf_file
-from app.core.config import settings
+from app.utils.helpers import validate_pdf_file
+from app.services.result_cache import get_or_create_result
+from app.utils.downloads import result_response, wants_direct_response
+from app.utils.uploads import spool_uploads, cleanup_uploads
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -13,7 +14,7 @@ logger = logging.getLogger(__name__)
 
 @router.post("/merge")
 async def merge_pdfs(
-    background_tasks: BackgroundTasks,
+    request: Request,
     files: List[UploadFile] = File(...)
 ):
     """
@@ -21,6 +22,7 @@ async def merge_pdfs(
     
     Upload 2 or more PDF files to merge them into a single document
     """
+    uploads = None
     try:
         # Validate files
         if len(files) < 2:
@@ -29,9 +31,6 @@ async def merge_pdfs(
                 detail="At least 2 PDF files are required for merging"
             )
         
-        pdf_contents = []
-        total_size = 0
-        
         for file in files:
             # Validate PDF file
             if not validate_pdf_file(file.filename):
@@ -39,57 +38,35 @@ async def merge_pdfs(
                     status_code=400,
                     detail=f"File {file.filename} is not a PDF"
                 )
-            
-            # Read file content
-            content = await file.read()
-            total_size += len(content)
-            
-            # Check total size
-            if total_size > settings.max_file_size_bytes:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"Total file size exceeds {settings.max_file_size_mb}MB limit"
-                )
-            
-            pdf_contents.append(content)
-        
-        # Merge PDFs
-        merged_pdf = await PDFService.merge_pdfs(pdf_contents)
         
-        # Generate unique filename
-        output_filename = generate_unique_filename("pdf")
+        # Stream uploads to disk, enforcing the per-file and total size limits
+        uploads = await spool_uploads(files)
         
-        # Upload to Azure Blob Storage
-        blob_url = await blob_storage.upload_file(
-            merged_pdf,
-            output_filename,
-            content_type="application/pdf"
-        )
-        
-        # Schedule cleanup
-        background_tasks.add_task(
-            schedule_file_cleanup,
-            output_filename
+        # Merge PDFs
+        result = await get_or_create_result(
+            "merge_pdfs",
+            uploads,
+            None,
+            lambda: PDFService.merge_pdfs([upload.path for upload in uploads]),
+            extension="pdf",
+            content_type="application/pdf",
+            direct=wants_direct_response(request)
         )
         
-        return {
+        return result_response(result, {
             "success": True,
             "message": "PDFs merged successfully",
-            "filename": output_filename,
-            "download_url": blob_url,
-            "file_size": len(merged_pdf),
+            "filename": result["filename"],
+            "download_url": result["download_url"],
+            "cached": result["cached"],
+            "file_size": result["size"],
             "pages_count": len(files)
-        }
+        })
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error in merge endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-
-
-async def schedule_file_cleanup(filename: str):
-    """Background task to cleanup file after retention period"""
-    import asyncio
-    await asyncio.sleep(settings.file_retention_minutes * 60)
-    await blob_storage.delete_file(filename)
+    finally:
+        cleanup_uploads(uploads or [])
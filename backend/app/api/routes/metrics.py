@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import CONTENT_TYPE, registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Metrics in the Prometheus text exposition format
+
+    Request latency per route, PDFService latency and throughput, worker queue
+    depth, storage latency and error counts, from the in-process registry
+    """
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
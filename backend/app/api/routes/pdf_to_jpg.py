@@ -1,10 +1,11 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
 import logging
 
 from app.services.pdf_service import PDFService
-from app.storage.local_storage import blob_storage
-from app.utils.helpers import generate_unique_filename, validate_pdf_file
-from app.core.config import settings
+from app.utils.helpers import validate_pdf_file
+from app.services.result_cache import get_or_create_result
+from app.utils.downloads import result_response, wants_direct_response
+from app.utils.uploads import spool_upload
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -12,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 @router.post("/pdf-to-jpg")
 async def pdf_to_jpg(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file: UploadFile = File(...),
     format: str = Form(default="jpeg"),
     dpi: int = Form(default=200)
@@ -23,6 +24,7 @@ async def pdf_to_jpg(
     Upload a PDF file to convert all pages to images.
     Returns a ZIP file containing all images.
     """
+    upload = None
     try:
         # Validate PDF file
         if not validate_pdf_file(file.filename):
@@ -45,45 +47,32 @@ async def pdf_to_jpg(
                 detail="DPI must be between 72 and 600"
             )
         
-        # Read file content
-        content = await file.read()
-        
-        # Check file size
-        if len(content) > settings.max_file_size_bytes:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File size exceeds maximum allowed ({settings.max_file_size}MB)"
-            )
+        # Spool upload to a file the workers can open, hashing and size-checking it
+        upload = await spool_upload(file)
         
         # Convert format name
         img_format = "png" if format.lower() == "png" else "jpeg"
         
         # Convert PDF to images
-        zip_content = await PDFService.pdf_to_images(content, img_format, dpi)
-        
-        # Generate filename and save
-        output_filename = generate_unique_filename("zip")
-        download_url = await blob_storage.upload_file(
-            zip_content,
-            output_filename,
-            content_type="application/zip"
-        )
-        
-        # Schedule cleanup
-        background_tasks.add_task(
-            blob_storage.delete_file,
-            output_filename,
-            delay_seconds=settings.file_retention_minutes * 60
+        result = await get_or_create_result(
+            "pdf_to_images",
+            [upload],
+            {"format": img_format, "dpi": dpi},
+            lambda: PDFService.pdf_to_images(upload.path, img_format, dpi),
+            extension="zip",
+            content_type="application/zip",
+            direct=wants_direct_response(request)
         )
         
-        return {
+        return result_response(result, {
             "success": True,
             "message": "PDF converted to images successfully",
-            "download_url": download_url,
-            "filename": output_filename,
+            "download_url": result["download_url"],
+            "cached": result["cached"],
+            "filename": result["filename"],
             "format": img_format,
             "dpi": dpi
-        }
+        })
         
     except HTTPException:
         raise
@@ -93,3 +82,6 @@ async def pdf_to_jpg(
             status_code=500,
             detail=f"Failed to convert PDF to images: {str(e)}"
         )
+    finally:
+        if upload:
+            upload.cleanup()
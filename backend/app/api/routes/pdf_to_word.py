@@ -1,10 +1,13 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
+from typing import Optional
 import logging
 
+from app.services.document import PageRangeError
 from app.services.pdf_service import PDFService
-from app.storage.local_storage import blob_storage
-from app.utils.helpers import generate_unique_filename, validate_pdf_file
-from app.core.config import settings
+from app.utils.helpers import validate_pdf_file
+from app.services.result_cache import get_or_create_result
+from app.utils.downloads import result_response, wants_direct_response
+from app.utils.uploads import spool_upload
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -12,14 +15,20 @@ logger = logging.getLogger(__name__)
 
 @router.post("/pdf-to-word")
 async def pdf_to_word(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
+    request: Request,
+    file: UploadFile = File(...),
+    pages: Optional[str] = Form(None)
 ):
     """
     Convert PDF to Word document (DOCX)
     
     Upload a PDF file to convert it to an editable Word document
+    
+    Args:
+        file: PDF file to convert
+        pages: Optional page ranges (e.g., "1-3,5"). If not provided, converts all pages
     """
+    upload = None
     try:
         # Validate PDF file
         if not validate_pdf_file(file.filename):
@@ -28,42 +37,33 @@ async def pdf_to_word(
                 detail="File must be a PDF"
             )
         
-        # Read file content
-        content = await file.read()
-        
-        # Check file size
-        if len(content) > settings.max_file_size_bytes:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File size exceeds maximum allowed ({settings.max_file_size}MB)"
-            )
+        # Spool upload to a file the workers can open, hashing and size-checking it
+        upload = await spool_upload(file)
+        pages = pages or None
         
         # Convert PDF to Word
-        docx_content = await PDFService.pdf_to_word(content)
-        
-        # Generate filename and save
-        output_filename = generate_unique_filename("docx")
-        download_url = await blob_storage.upload_file(
-            docx_content,
-            output_filename,
-            content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        )
-        
-        # Schedule cleanup
-        background_tasks.add_task(
-            blob_storage.delete_file,
-            output_filename,
-            delay_seconds=settings.file_retention_minutes * 60
-        )
+        try:
+            result = await get_or_create_result(
+                "pdf_to_word",
+                [upload],
+                {"pages": pages} if pages else None,
+                lambda: PDFService.pdf_to_word(upload.path, pages),
+                extension="docx",
+                content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                direct=wants_direct_response(request)
+            )
+        except PageRangeError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        return {
+        return result_response(result, {
             "success": True,
             "message": "PDF converted to Word successfully",
-            "download_url": download_url,
-            "filename": output_filename,
-            "original_size": len(content),
-            "converted_size": len(docx_content)
-        }
+            "download_url": result["download_url"],
+            "cached": result["cached"],
+            "filename": result["filename"],
+            "original_size": upload.size,
+            "converted_size": result["size"]
+        })
         
     except HTTPException:
         raise
@@ -73,3 +73,6 @@ async def pdf_to_word(
             status_code=500,
             detail=f"Failed to convert PDF to Word: {str(e)}"
         )
+    finally:
+        if upload:
+            upload.cleanup()
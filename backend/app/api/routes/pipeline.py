@@ -0,0 +1,88 @@
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
+import logging
+
+from app.services.pdf_service import PDFService
+from app.services.pipeline import PipelineError, parse_pipeline
+from app.utils.helpers import validate_pdf_file
+from app.services.result_cache import get_or_create_result
+from app.utils.downloads import result_response, wants_direct_response
+from app.utils.uploads import spool_upload
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.post("/pipeline")
+async def run_pipeline(
+    request: Request,
+    file: UploadFile = File(...),
+    steps: str = Form(...)
+):
+    """
+    Apply several operations to a PDF in one request
+
+    The document is parsed once, every step is applied to it in memory, and
+    it is saved once at the end.
+
+    Args:
+        file: PDF file to process
+        steps: JSON array of steps, applied in order, e.g.
+            [{"op": "rotate", "rotation": 90, "pages": "1-2"},
+             {"op": "reorder", "page_order": [2, 1, 3]},
+             {"op": "add-page-numbers", "position": "bottom-center"},
+             {"op": "compress", "quality": "medium"}]
+            Ops: rotate, reorder, split, add-watermark, add-page-numbers, compress,
+            with the same parameters as the single-operation endpoints.
+            Page numbers refer to the document as it is at that step.
+    """
+    upload = None
+    try:
+        # Validate PDF file
+        if not validate_pdf_file(file.filename):
+            raise HTTPException(
+                status_code=400,
+                detail="File must be a PDF"
+            )
+
+        # Validate the pipeline before reading the upload
+        try:
+            pipeline_steps = parse_pipeline(steps)
+        except PipelineError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # Spool upload to a file the workers can open, hashing and size-checking it
+        upload = await spool_upload(file)
+
+        # Run the pipeline
+        try:
+            result = await get_or_create_result(
+                "pipeline",
+                [upload],
+                {"steps": pipeline_steps},
+                lambda: PDFService.run_pipeline(upload.path, pipeline_steps),
+                extension="pdf",
+                content_type="application/pdf",
+                direct=wants_direct_response(request)
+            )
+        except PipelineError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return result_response(result, {
+            "success": True,
+            "message": f"Pipeline of {len(pipeline_steps)} steps completed successfully",
+            "filename": result["filename"],
+            "download_url": result["download_url"],
+            "cached": result["cached"],
+            "file_size": result["size"],
+            "total_pages": result["extra"]["total_pages"],
+            "steps": result["extra"]["steps"]
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in pipeline endpoint: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if upload:
+            upload.cleanup()
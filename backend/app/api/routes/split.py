@@ -1,10 +1,13 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
+from typing import Optional
 import logging
 
 from app.services.pdf_service import PDFService
-from app.storage.local_storage import blob_storage
-from app.utils.helpers import generate_unique_filename, validate_pdf_file, parse_page_ranges
-from app.core.config import settings
+from app.services.document import PageRangeError
+from app.utils.helpers import validate_pdf_file
+from app.services.result_cache import get_or_create_result
+from app.utils.downloads import result_response, wants_direct_response
+from app.utils.uploads import SpooledUpload, spool_upload
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -12,17 +15,24 @@ logger = logging.getLogger(__name__)
 
 @router.post("/split")
 async def split_pdf(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file: UploadFile = File(...),
-    pages: str = Form(...)
+    pages: Optional[str] = Form(None),
+    mode: str = Form("extract"),
+    every: Optional[int] = Form(None)
 ):
     """
-    Extract specific pages from a PDF
+    Extract specific pages from a PDF, or split it into several files
     
     Args:
         file: PDF file to split
-        pages: Page ranges (e.g., "1-3,5,7-9")
+        pages: Page ranges (e.g., "1-3,5,7-9"); required for the extract and ranges modes
+        mode: "extract" - one PDF with the selected pages,
+              "ranges" - a ZIP with one PDF per range in pages,
+              "every" - a ZIP with one PDF per every pages
+        every: Pages per file in the every mode
     """
+    upload = None
     try:
         # Validate PDF file
         if not validate_pdf_file(file.filename):
@@ -31,64 +41,89 @@ async def split_pdf(
                 detail="File must be a PDF"
             )
         
-        # Read file content
-        content = await file.read()
+        # Validate mode parameters
+        if mode not in ["extract", "ranges", "every"]:
+            raise HTTPException(
+                status_code=400,
+                detail="Mode must be 'extract', 'ranges', or 'every'"
+            )
         
-        # Check file size
-        if len(content) > settings.max_file_size_bytes:
+        if mode == "every":
+            if every is None or every < 1:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Every must be a positive number of pages"
+                )
+        elif not pages or not pages.strip():
             raise HTTPException(
-                status_code=413,
-                detail=f"File size exceeds {settings.max_file_size_mb}MB limit"
+                status_code=400,
+                detail="Pages are required (e.g., \"1-3,5\")"
             )
         
-        # Get PDF info to validate pages
-        pdf_info = PDFService.get_pdf_info(content)
-        total_pages = pdf_info["pages"]
+        # Spool upload to a file the workers can open, hashing and size-checking it
+        upload = await spool_upload(file)
         
-        # Parse page ranges
+        if mode != "extract":
+            return await _split_to_files(request, upload, pages if mode == "ranges" else None,
+                                         every if mode == "every" else None)
+        
+        # Split PDF; pages are validated against the document in the same parse
         try:
-            page_indices = parse_page_ranges(pages, total_pages)
-        except ValueError as e:
+            result = await get_or_create_result(
+                "split_pdf",
+                [upload],
+                {"pages": pages},
+                lambda: PDFService.split_pdf(upload.path, pages),
+                extension="pdf",
+                content_type="application/pdf",
+                direct=wants_direct_response(request)
+            )
+        except PageRangeError as e:
             raise HTTPException(status_code=400, detail=str(e))
         
-        # Split PDF
-        split_pdf = await PDFService.split_pdf(content, page_indices)
-        
-        # Generate unique filename
-        output_filename = generate_unique_filename("pdf")
-        
-        # Upload to Azure Blob Storage
-        blob_url = await blob_storage.upload_file(
-            split_pdf,
-            output_filename,
-            content_type="application/pdf"
-        )
-        
-        # Schedule cleanup
-        background_tasks.add_task(
-            schedule_file_cleanup,
-            output_filename
-        )
-        
-        return {
+        return result_response(result, {
             "success": True,
             "message": "PDF split successfully",
-            "filename": output_filename,
-            "download_url": blob_url,
-            "file_size": len(split_pdf),
-            "pages_extracted": len(page_indices),
-            "original_pages": total_pages
-        }
+            "filename": result["filename"],
+            "download_url": result["download_url"],
+            "cached": result["cached"],
+            "file_size": result["size"],
+            "pages_extracted": result["extra"]["pages_extracted"],
+            "original_pages": result["extra"]["original_pages"]
+        })
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error in split endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if upload:
+            upload.cleanup()
 
 
-async def schedule_file_cleanup(filename: str):
-    """Background task to cleanup file after retention period"""
-    import asyncio
-    await asyncio.sleep(settings.file_retention_minutes * 60)
-    await blob_storage.delete_file(filename)
+async def _split_to_files(request: Request, upload: SpooledUpload, pages: Optional[str], every: Optional[int]):
+    """Split into one PDF per range or per every pages, returned as a ZIP"""
+    try:
+        result = await get_or_create_result(
+            "split_pdf_to_files",
+            [upload],
+            {"pages": pages, "every": every},
+            lambda: PDFService.split_pdf_to_files(upload.path, pages, every),
+            extension="zip",
+            content_type="application/zip",
+            direct=wants_direct_response(request)
+        )
+    except PageRangeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return result_response(result, {
+        "success": True,
+        "message": "PDF split successfully",
+        "filename": result["filename"],
+        "download_url": result["download_url"],
+        "cached": result["cached"],
+        "file_size": result["size"],
+        "files": result["extra"]["files"],
+        "original_pages": result["extra"]["original_pages"]
+    })
@@ -0,0 +1,124 @@
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Query, Request
+from fastapi.responses import JSONResponse, Response
+from typing import Optional
+import logging
+import re
+
+from app.core.config import settings
+from app.services.thumbnails import get_or_render_thumbnails, thumbnail_name
+from app.storage import blob_storage
+from app.utils.downloads import is_not_modified, validator_headers
+from app.utils.helpers import validate_pdf_file
+from app.utils.uploads import spool_upload
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Documents are identified by the SHA-256 of their content
+DOCUMENT_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+MIN_THUMBNAIL_WIDTH = 32
+
+
+def _validate_width(width: int):
+    if width < MIN_THUMBNAIL_WIDTH or width > settings.thumbnail_max_width:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Width must be between {MIN_THUMBNAIL_WIDTH} and {settings.thumbnail_max_width} pixels"
+        )
+
+
+@router.post("/thumbnails")
+async def create_thumbnails(
+    file: UploadFile = File(...),
+    width: Optional[int] = Form(None)
+):
+    """
+    Render small previews of every page
+    
+    Previews are cached per document and width, so uploading the same PDF
+    again returns the existing previews without rendering.
+    
+    Args:
+        file: PDF file to preview
+        width: Thumbnail width in pixels (default THUMBNAIL_WIDTH)
+    
+    Returns:
+        The document id and one URL per page, fetched with GET /api/thumbnails/{document_id}/{page}
+    """
+    upload = None
+    try:
+        # Validate PDF file
+        if not validate_pdf_file(file.filename):
+            raise HTTPException(
+                status_code=400,
+                detail="File must be a PDF"
+            )
+        
+        width = width or settings.thumbnail_width
+        _validate_width(width)
+        
+        # Spool upload to a file the workers can open, hashing and size-checking it
+        upload = await spool_upload(file)
+        
+        result = await get_or_render_thumbnails(upload, width)
+        document_id = result["document_id"]
+        
+        return {
+            "success": True,
+            "message": "Thumbnails rendered successfully",
+            "document_id": document_id,
+            "page_count": result["page_count"],
+            "width": width,
+            "cached": result["cached"],
+            "thumbnails": [
+                f"/api/thumbnails/{document_id}/{page}?width={width}"
+                for page in range(1, result["page_count"] + 1)
+            ]
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in thumbnails endpoint: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to render thumbnails: {str(e)}"
+        )
+    finally:
+        if upload:
+            upload.cleanup()
+
+
+@router.get("/thumbnails/{document_id}/{page}")
+async def get_thumbnail(
+    document_id: str,
+    page: int,
+    request: Request,
+    width: Optional[int] = Query(None)
+):
+    """
+    Serve one page preview
+    
+    Previews never change for a document id, so responses carry an ETag and
+    a max-age up to their expiry; revalidation returns 304.
+    """
+    width = width or settings.thumbnail_width
+    _validate_width(width)
+    if not DOCUMENT_ID_PATTERN.match(document_id) or page < 1:
+        return JSONResponse(status_code=404, content={"detail": "Thumbnail not found"})
+    
+    name = thumbnail_name(document_id, width, page)
+    properties = await blob_storage.get_properties(name)
+    if properties is None:
+        return JSONResponse(status_code=404, content={"detail": "Thumbnail not found"})
+    
+    headers = validator_headers(properties)
+    if is_not_modified(request.headers, properties):
+        return Response(status_code=304, headers=headers)
+    
+    content = await blob_storage.download_file(name)
+    if content is None:
+        # Deleted (expired) between the properties lookup and the read
+        return JSONResponse(status_code=404, content={"detail": "Thumbnail not found"})
+    headers["Content-Disposition"] = "inline"
+    return Response(content, headers=headers, media_type="image/jpeg")
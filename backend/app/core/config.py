@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
+import os
 
 
 class Settings(BaseSettings):
@@ -8,13 +9,57 @@ class Settings(BaseSettings):
     # Azure Storage Configuration (optional for local development)
     azure_storage_connection_string: Optional[str] = None
     azure_storage_container_name: str = "pdf-files"
+    azure_block_size_mb: int = 4  # outputs larger than one block are staged in parallel
+    azure_upload_concurrency: int = 4  # blocks in flight per upload
+    azure_max_connections: int = 16  # pooled connections per process
     
     # Use local storage for development
     use_local_storage: bool = True
+    storage_backend: Optional[str] = None  # "local", "azure" or "memory"; overrides use_local_storage
     
     # File Processing Configuration
-    max_file_size_mb: int = 50
+    max_file_size_mb: int = 50  # per uploaded file
+    max_total_upload_mb: int = 200  # all files of one merge or jpg-to-pdf request
     file_retention_minutes: int = 30
+    retention_tick_seconds: int = 30
+    retention_batch_size: int = 100
+    
+    # Worker Pool Configuration
+    worker_backend: str = "process"  # "process" or "thread"
+    worker_processes: int = 0  # 0 = one worker per CPU core
+    worker_max_pending: int = 64
+    worker_queue_limit: int = 16
+    worker_queue_limits: str = "pdf_to_word:4,pdf_to_excel:4,pdf_to_images:4"
+    worker_retry_after_seconds: int = 5
+    pdf_to_images_chunk_pages: int = 8  # pages rendered per worker task
+    pdf_to_word_chunk_pages: int = 20  # pages converted per worker task
+    pdf_to_excel_chunk_pages: int = 10  # pages searched for tables per worker task
+    excel_to_pdf_chunk_rows: int = 40  # spreadsheet rows per table in Excel to PDF
+    table_engine: str = "auto"  # "auto", "tabula" (warm JVM) or "text" (no Java)
+    split_parts_per_task: int = 8  # split output files written per worker task
+    compress_image_threads: int = 4  # image re-encoding threads per compress task
+    
+    # Result Cache Configuration
+    result_cache_enabled: bool = True
+    result_cache_max_mb: int = 512
+    
+    # Direct Response Configuration (?response_mode=direct)
+    direct_response_max_mb: int = 10  # larger outputs fall back to a download URL
+    
+    # Batch Configuration (/api/batch/*)
+    batch_max_files: int = 50
+    batch_max_total_mb: int = 200
+    batch_concurrency: int = 4  # files of one batch processed at once
+    
+    # Thumbnail Configuration (/api/thumbnails)
+    thumbnail_width: int = 96  # default preview width in pixels
+    thumbnail_max_width: int = 512
+    thumbnail_chunk_pages: int = 32  # pages rendered per worker task
+    thumbnail_cache_documents: int = 256  # documents indexed for reuse
+    
+    # Background Job Configuration
+    job_runners: int = 2
+    job_poll_interval_seconds: float = 1.0
     
     # CORS Configuration
     cors_origins: str = "http://localhost:5173"
@@ -34,6 +79,58 @@ class Settings(BaseSettings):
         """Convert MB to bytes"""
         return self.max_file_size_mb * 1024 * 1024
     
+    @property
+    def max_request_size_bytes(self) -> int:
+        """Largest request body accepted, allowing for multipart overhead"""
+        return self.max_file_size_bytes + 1024 * 1024
+    
+    @property
+    def max_total_upload_bytes(self) -> int:
+        """Convert MB to bytes"""
+        return self.max_total_upload_mb * 1024 * 1024
+    
+    @property
+    def max_multi_file_request_size_bytes(self) -> int:
+        """Largest merge or jpg-to-pdf request body accepted, allowing for multipart overhead"""
+        return self.max_total_upload_bytes + 1024 * 1024
+    
+    @property
+    def azure_block_size_bytes(self) -> int:
+        """Convert MB to bytes"""
+        return self.azure_block_size_mb * 1024 * 1024
+    
+    @property
+    def direct_response_max_bytes(self) -> int:
+        """Convert MB to bytes"""
+        return self.direct_response_max_mb * 1024 * 1024
+    
+    @property
+    def batch_max_total_bytes(self) -> int:
+        """Convert MB to bytes"""
+        return self.batch_max_total_mb * 1024 * 1024
+    
+    @property
+    def batch_max_request_size_bytes(self) -> int:
+        """Largest batch request body accepted, allowing for multipart overhead"""
+        return self.batch_max_total_bytes + 1024 * 1024
+    
+    @property
+    def worker_count(self) -> int:
+        """Number of worker processes/threads for CPU-bound PDF work"""
+        if self.worker_processes > 0:
+            return self.worker_processes
+        return os.cpu_count() or 1
+    
+    @property
+    def worker_queue_limits_map(self) -> Dict[str, int]:
+        """Convert comma-separated operation:limit pairs to dict"""
+        limits = {}
+        for item in self.worker_queue_limits.split(","):
+            if ":" in item:
+                operation, limit = item.split(":", 1)
+                limits[operation.strip()] = int(limit.strip())
+        return limits
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,13 +1,19 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse
 import logging
 import sys
-import os
+import time
 
 from app.core.config import settings
-from app.api.routes import merge, split, compress, rotate, reorder, health, pdf_to_word, pdf_to_jpg, jpg_to_pdf, edit, pdf_to_excel, excel_to_pdf, word_to_pdf
-from app.storage.local_storage import UPLOAD_DIR
+from app.core.metrics import http_request_duration_seconds, http_requests_total, record_error
+from app.api.routes import merge, split, compress, rotate, reorder, health, pdf_to_word, pdf_to_jpg, jpg_to_pdf, edit, pdf_to_excel, excel_to_pdf, word_to_pdf, jobs, metrics, download, pipeline, batch, thumbnails
+from app.storage import blob_storage
+from app.services.executor import worker_pool
+from app.services.jobs import job_queue
+from app.services.result_cache import drain_background_stores
+from app.services.retention import retention_scheduler
+from app.utils.downloads import DIRECT_RESPONSE_HEADERS
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +35,32 @@ app = FastAPI(
     redoc_url="/redoc" if settings.environment == "development" else None,
 )
 
+# Routes taking several files, limited by MAX_TOTAL_UPLOAD_MB instead of MAX_FILE_SIZE_MB
+MULTI_FILE_PATHS = {"/api/merge", "/api/jpg-to-pdf"}
+
+
+# Reject oversized uploads from Content-Length before the body is parsed.
+# Registered before CORS so rejections still carry CORS headers.
+@app.middleware("http")
+async def limit_request_size(request: Request, call_next):
+    content_length = request.headers.get("content-length")
+    if request.url.path.startswith("/api/batch/"):
+        limit = settings.batch_max_request_size_bytes
+        detail = f"Total batch size exceeds {settings.batch_max_total_mb}MB limit"
+    elif request.url.path in MULTI_FILE_PATHS:
+        limit = settings.max_multi_file_request_size_bytes
+        detail = f"Total upload size exceeds {settings.max_total_upload_mb}MB limit"
+    else:
+        limit = settings.max_request_size_bytes
+        detail = f"File size exceeds {settings.max_file_size_mb}MB limit"
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": detail}
+        )
+    return await call_next(request)
+
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -36,9 +68,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=DIRECT_RESPONSE_HEADERS,
 )
 
 
+# Record request metrics. Registered last so it is outermost and also sees the
+# size-limit rejections; routes are labelled by path template, not raw URL.
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    except Exception as e:
+        record_error("http", _route_label(request), e)
+        raise
+    finally:
+        route = _route_label(request)
+        http_request_duration_seconds.observe(time.perf_counter() - start, method=request.method, route=route)
+        http_requests_total.inc(method=request.method, route=route, status=str(status))
+
+
+def _route_label(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -55,11 +112,14 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # Include routers
 app.include_router(health.router, prefix="/api", tags=["Health"])
+app.include_router(metrics.router, prefix="/api", tags=["Health"])
 app.include_router(merge.router, prefix="/api", tags=["PDF Operations"])
 app.include_router(split.router, prefix="/api", tags=["PDF Operations"])
 app.include_router(compress.router, prefix="/api", tags=["PDF Operations"])
 app.include_router(rotate.router, prefix="/api", tags=["PDF Operations"])
 app.include_router(reorder.router, prefix="/api", tags=["PDF Operations"])
+app.include_router(pipeline.router, prefix="/api", tags=["PDF Operations"])
+app.include_router(batch.router, prefix="/api", tags=["Batch"])
 app.include_router(pdf_to_word.router, prefix="/api", tags=["Conversion"])
 app.include_router(pdf_to_jpg.router, prefix="/api", tags=["Conversion"])
 app.include_router(jpg_to_pdf.router, prefix="/api", tags=["Conversion"])
@@ -67,6 +127,9 @@ app.include_router(pdf_to_excel.router, prefix="/api", tags=["Conversion"])
 app.include_router(excel_to_pdf.router, prefix="/api", tags=["Conversion"])
 app.include_router(word_to_pdf.router, prefix="/api", tags=["Conversion"])
 app.include_router(edit.router, prefix="/api", tags=["PDF Editor"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
+app.include_router(download.router, prefix="/api", tags=["Downloads"])
+app.include_router(thumbnails.router, prefix="/api", tags=["Previews"])
 
 
 @app.on_event("startup")
@@ -76,12 +139,20 @@ async def startup_event():
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Max file size: {settings.max_file_size_mb}MB")
     logger.info(f"File retention: {settings.file_retention_minutes} minutes")
+    worker_pool.start()
+    await retention_scheduler.start()
+    job_queue.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown"""
     logger.info("Shutting down application")
+    await job_queue.stop()
+    await drain_background_stores()
+    await retention_scheduler.stop()
+    worker_pool.shutdown()
+    await blob_storage.close()
 
 
 @app.get("/")
@@ -95,20 +166,6 @@ async def root():
     }
 
 
-@app.get("/api/download/{filename}")
-async def download_file(filename: str):
-    """Download a processed PDF file"""
-    file_path = os.path.join(UPLOAD_DIR, filename)
-    if os.path.exists(file_path):
-        return FileResponse(
-            file_path,
-            media_type="application/pdf",
-            filename=filename,
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
-    return JSONResponse(status_code=404, content={"detail": "File not found"})
-
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,258 @@
+from fastapi import HTTPException, UploadFile
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import asyncio
+import json
+import logging
+import os
+import zipfile
+
+from app.core.config import settings
+from app.services.executor import ExecutorBusyError
+from app.services.result_cache import ComputeOutput, ComputeResult
+from app.utils.helpers import validate_pdf_file
+from app.utils.uploads import SpooledUpload, cleanup_uploads, spool_upload
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+ZIP_CHUNK_SIZE = 1024 * 1024
+# Times a file waits out a full operation queue before it is reported as failed
+BUSY_RETRIES = 3
+
+# Computes one file's output from the path of its spooled input
+BatchCompute = Callable[[str], Awaitable[ComputeResult]]
+
+
+class BatchItem:
+    """One file of a batch: its spooled upload, or why it was rejected"""
+
+    def __init__(self, filename: str, upload: Optional[SpooledUpload] = None, error: Optional[str] = None):
+        self.filename = filename
+        self.upload = upload
+        self.error = error
+
+
+class _ZipStream:
+    """Write-only file object that collects ZIP bytes until they are drained"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def spool_batch(files: List[UploadFile]) -> List[BatchItem]:
+    """
+    Spool the files of a batch request
+
+    Files that aren't PDFs or exceed MAX_FILE_SIZE_MB are kept as failed items
+    for the manifest instead of failing the whole batch.
+
+    Args:
+        files: Uploaded files from the request
+
+    Returns:
+        One BatchItem per file, in request order
+
+    Raises:
+        HTTPException: 400 for too many or no valid files, 413 when the batch
+            exceeds BATCH_MAX_TOTAL_MB
+    """
+    if len(files) > settings.batch_max_files:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch is limited to {settings.batch_max_files} files"
+        )
+
+    items: List[BatchItem] = []
+    remaining = settings.batch_max_total_bytes
+    try:
+        for file in files:
+            if not validate_pdf_file(file.filename or ""):
+                items.append(BatchItem(file.filename, error="File must be a PDF"))
+                continue
+
+            limit = min(settings.max_file_size_bytes, remaining)
+            try:
+                upload = await spool_upload(file, max_bytes=limit)
+            except HTTPException as e:
+                if limit < settings.max_file_size_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Total batch size exceeds {settings.batch_max_total_mb}MB limit"
+                    )
+                items.append(BatchItem(file.filename, error=e.detail))
+                continue
+            items.append(BatchItem(file.filename, upload=upload))
+            remaining -= upload.size
+    except BaseException:
+        cleanup_uploads([item.upload for item in items if item.upload])
+        raise
+
+    if not any(item.upload for item in items):
+        raise HTTPException(
+            status_code=400,
+            detail=items[0].error if items else "No files uploaded"
+        )
+    return items
+
+
+def _output_name(filename: str, extension: str, used: Set[str]) -> str:
+    """Archive name for a file's output: its input name with the new extension, made unique"""
+    stem = os.path.splitext(os.path.basename(filename.replace("\\", "/")))[0] or "file"
+    name = f"{stem}.{extension}"
+    counter = 2
+    while name in used:
+        name = f"{stem}_{counter}.{extension}"
+        counter += 1
+    used.add(name)
+    return name
+
+
+def _remove_output(output: ComputeOutput):
+    if isinstance(output, str) and os.path.exists(output):
+        os.remove(output)
+
+
+async def _compute_item(
+    index: int,
+    item: BatchItem,
+    compute: BatchCompute,
+    semaphore: asyncio.Semaphore
+) -> Tuple[int, Optional[ComputeOutput], Dict[str, Any], Optional[str]]:
+    """Run one file, returning (index, output, extra, error)"""
+    async with semaphore:
+        for attempt in range(BUSY_RETRIES + 1):
+            try:
+                result = await compute(item.upload.path)
+                break
+            except ExecutorBusyError as e:
+                if attempt == BUSY_RETRIES:
+                    return index, None, {}, e.detail
+                await asyncio.sleep(settings.worker_retry_after_seconds)
+            except (HTTPException, ValueError) as e:
+                return index, None, {}, getattr(e, "detail", None) or str(e)
+            except Exception as e:
+                logger.error(f"Error processing batch file {item.filename}: {e}")
+                # Report errors against the client's file name, not the spool path
+                return index, None, {}, str(e).replace(item.upload.path, item.filename)
+
+    output, extra = result if isinstance(result, tuple) else (result, {})
+    return index, output, extra, None
+
+
+async def _zip_entry(archive: zipfile.ZipFile, stream: _ZipStream, name: str,
+                     output: ComputeOutput) -> AsyncIterator[bytes]:
+    """Add one output to the archive, yielding the ZIP bytes as they are produced"""
+    with archive.open(name, "w") as entry:
+        if isinstance(output, str):
+            with open(output, 'rb') as f:
+                while True:
+                    chunk = await asyncio.to_thread(f.read, ZIP_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    entry.write(chunk)
+                    yield stream.drain()
+        else:
+            for start in range(0, len(output), ZIP_CHUNK_SIZE):
+                entry.write(output[start:start + ZIP_CHUNK_SIZE])
+                yield stream.drain()
+    yield stream.drain()
+
+
+async def stream_batch(
+    operation: str,
+    items: List[BatchItem],
+    params: Dict[str, Any],
+    compute: BatchCompute,
+    extension: str
+) -> AsyncIterator[bytes]:
+    """
+    Process a batch and stream the results as a ZIP archive
+
+    Up to BATCH_CONCURRENCY files are processed at once. Each output is added
+    to the archive as soon as it is ready, so the download starts with the
+    first finished file. The archive ends with manifest.json, which lists
+    every input with its status, output name and size or error.
+
+    Outputs are not stored or cached; the uploads are deleted when the stream
+    ends or the client disconnects.
+
+    Args:
+        operation: Operation name, recorded in the manifest
+        items: Spooled batch files
+        params: Operation parameters, recorded in the manifest
+        compute: Coroutine producing one file's output from its input path
+        extension: Output file extension
+
+    Yields:
+        ZIP archive bytes
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.batch_concurrency))
+    tasks = [
+        asyncio.create_task(_compute_item(index, item, compute, semaphore))
+        for index, item in enumerate(items)
+        if item.upload
+    ]
+    manifest: List[Dict[str, Any]] = [
+        {"file": item.filename, "status": "failed", "error": item.error}
+        for item in items
+    ]
+    used_names = {MANIFEST_NAME}
+    stream = _ZipStream()
+
+    try:
+        # Outputs are already compressed (PDF, JPEG, PNG), so store them as-is
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED) as archive:
+            for next_done in asyncio.as_completed(tasks):
+                index, output, extra, error = await next_done
+                item = items[index]
+                item.upload.cleanup()
+                if error is not None:
+                    manifest[index]["error"] = error
+                    continue
+
+                name = _output_name(item.filename, extension, used_names)
+                try:
+                    async for chunk in _zip_entry(archive, stream, name, output):
+                        if chunk:
+                            yield chunk
+                finally:
+                    _remove_output(output)
+                manifest[index] = {
+                    "file": item.filename,
+                    "status": "succeeded",
+                    "output": name,
+                    "size": archive.getinfo(name).file_size,
+                    **extra
+                }
+
+            succeeded = sum(1 for entry in manifest if entry["status"] == "succeeded")
+            archive.writestr(MANIFEST_NAME, json.dumps({
+                "operation": operation,
+                "params": params,
+                "total": len(items),
+                "succeeded": succeeded,
+                "failed": len(items) - succeeded,
+                "files": manifest,
+            }, indent=2, default=str))
+        yield stream.drain()
+        logger.info(f"Batch {operation} finished: {succeeded}/{len(items)} files succeeded")
+
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            if task.done() and not task.cancelled() and task.exception() is None:
+                _remove_output(task.result()[1])
+        cleanup_uploads([item.upload for item in items if item.upload])
@@ -0,0 +1,140 @@
+from pikepdf import AccessMode, Pdf
+from typing import Any, Dict, List, Optional, Union
+import io
+import os
+
+from app.services.incremental import IncrementalUpdate
+from app.utils.helpers import parse_page_ranges
+
+
+class PageRangeError(ValueError):
+    """Raised when requested pages don't exist in the document"""
+
+
+class DocumentHandle:
+    """
+    A PDF opened at most once per worker task
+
+    Validation and the operation share the handle, so the page count, metadata
+    and the pages themselves come from a single parse. pikepdf reads objects on
+    demand from the memory-mapped file, so the page count and metadata only
+    touch the xref, the page tree and the document info dictionary.
+    """
+
+    def __init__(self, source: Union[bytes, str]):
+        self.source = source
+        self._pdf: Optional[Pdf] = None
+        # Documents that pages were copied out of; copied streams are read from them on save
+        self._sources: List[Pdf] = []
+
+    @property
+    def pdf(self) -> Pdf:
+        """The parsed document, opened on first use"""
+        if self._pdf is None:
+            if isinstance(self.source, str):
+                self._pdf = Pdf.open(self.source, access_mode=AccessMode.mmap)
+            else:
+                self._pdf = Pdf.open(io.BytesIO(self.source))
+        return self._pdf
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pdf.pages)
+
+    @property
+    def size_bytes(self) -> int:
+        return os.path.getsize(self.source) if isinstance(self.source, str) else len(self.source)
+
+    @property
+    def metadata(self) -> Dict[str, str]:
+        """Document info dictionary as strings"""
+        return {str(key): str(value) for key, value in self.pdf.docinfo.items()}
+
+    def resolve_pages(self, pages: Union[str, List[int]]) -> List[int]:
+        """
+        Resolve a page selection against this document
+
+        Args:
+            pages: Page ranges like "1-3,5" (1-indexed), or page indices (0-indexed)
+
+        Returns:
+            Page indices (0-indexed); ranges come back sorted and de-duplicated
+
+        Raises:
+            PageRangeError: A page is outside the document
+        """
+        if isinstance(pages, str):
+            try:
+                return parse_page_ranges(pages, self.page_count)
+            except ValueError as e:
+                raise PageRangeError(str(e)) from None
+        return self.check_indices(pages)
+
+    def check_indices(self, indices: List[int]) -> List[int]:
+        """Ensure every 0-indexed page exists, keeping order and repeats"""
+        total_pages = self.page_count
+        for index in indices:
+            if index < 0 or index >= total_pages:
+                raise PageRangeError(f"Invalid page number: {index + 1}")
+        return list(indices)
+
+    def select_pages(self, indices: List[int]):
+        """
+        Keep only the given pages (0-indexed, repeats allowed), in that order
+
+        When pages are dropped, the selected ones are copied into a new document
+        that replaces this one. Only objects reachable from those pages are read
+        and written, so the cost follows the pages kept rather than the source
+        size, and outlines or links pointing at dropped pages can't keep them
+        alive. When every page is kept, the page list is reordered in place.
+        """
+        source = self.pdf
+        if len(set(indices)) == len(source.pages):
+            pages = list(source.pages)
+            selected_pages = [pages[i] for i in indices]
+            del source.pages[:]
+            source.pages.extend(selected_pages)
+            return
+
+        self._sources.append(source)
+        self._pdf = self.extract_pages(indices)
+
+    def extract_pages(self, indices: List[int]) -> Pdf:
+        """
+        Copy the given pages (0-indexed, repeats allowed) into a new document
+
+        The source stays open and must not be closed before the new document
+        is saved, since copied streams are read from it then.
+        """
+        source = self.pdf
+        extracted = Pdf.new()
+        if "/Info" in source.trailer:
+            extracted.docinfo = extracted.copy_foreign(source.docinfo)
+        pages = source.pages
+        for index in indices:
+            extracted.pages.append(pages[index])
+        return extracted
+
+    def save(self, **options: Any) -> bytes:
+        """Serialize the document"""
+        output = io.BytesIO()
+        self.pdf.save(output, **options)
+        return output.getvalue()
+
+    def incremental_update(self) -> IncrementalUpdate:
+        """Start tracking page edits so they can be appended to the original instead of rewriting it"""
+        return IncrementalUpdate(self.pdf, self.source)
+
+    def close(self):
+        for pdf in self._sources:
+            pdf.close()
+        self._sources = []
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    def __enter__(self) -> "DocumentHandle":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
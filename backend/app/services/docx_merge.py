@@ -0,0 +1,74 @@
+from copy import deepcopy
+from docx import Document
+from docx.document import Document as DocxDocument
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
+from typing import List
+import io
+
+# Attributes that hold relationship ids (images, hyperlinks, linked objects)
+_REL_ATTRIBUTES = (qn("r:embed"), qn("r:id"), qn("r:link"))
+
+
+def _copy_relationships(source: DocxDocument, target: DocxDocument, element):
+    """Point relationship ids inside a copied element at relationships of the target"""
+    mapping = {}
+    for node in element.iter():
+        for attribute in _REL_ATTRIBUTES:
+            rid = node.get(attribute)
+            if rid is None:
+                continue
+            if rid not in mapping:
+                rel = source.part.rels[rid]
+                if rel.is_external:
+                    mapping[rid] = target.part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+                elif rel.reltype == RT.IMAGE:
+                    # Re-adding by content stores an image shared by several chunks only once
+                    mapping[rid], _ = target.part.get_or_add_image(io.BytesIO(rel.target_part.blob))
+                else:
+                    mapping[rid] = target.part.relate_to(rel.target_part, rel.reltype)
+            node.set(attribute, mapping[rid])
+
+
+def _append(target: DocxDocument, source: DocxDocument):
+    """Append the body of source after the body of target, starting a new section"""
+    body = target.element.body
+    # The last section of target moves into a section break, and source's last
+    # section properties become the document's final ones
+    sentinel = body.add_section_break()
+    body.replace(sentinel, deepcopy(source.element.body.sectPr))
+
+    final = body.sectPr
+    for element in source.element.body.iterchildren():
+        if element.tag == qn("w:sectPr"):
+            continue
+        element = deepcopy(element)
+        _copy_relationships(source, target, element)
+        final.addprevious(element)
+
+
+def merge_docx_files(paths: List[str]) -> bytes:
+    """
+    Join DOCX files converted from consecutive page ranges into one document
+
+    Each file keeps its own sections, so page sizes and margins are preserved,
+    and the next file starts on a new page. Images and hyperlinks are carried
+    over; an image repeated across files is stored once.
+
+    Args:
+        paths: DOCX files in page order
+
+    Returns:
+        The merged document as bytes
+    """
+    merged = Document(paths[0])
+    for path in paths[1:]:
+        _append(merged, Document(path))
+
+    # Drawing ids must be unique within a document, and every file numbered its own from 1
+    for number, doc_pr in enumerate(merged.element.body.iter(qn("wp:docPr")), 1):
+        doc_pr.set("id", str(number))
+
+    output = io.BytesIO()
+    merged.save(output)
+    return output.getvalue()
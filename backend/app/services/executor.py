@@ -0,0 +1,191 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+import asyncio
+import functools
+import logging
+import multiprocessing
+
+from app.core.config import settings
+from app.core.metrics import collect_worker_pages, pdf_pages_processed_total, worker_queue_depth
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorBusyError(HTTPException):
+    """Raised when an operation queue is full; surfaces as 503 with Retry-After"""
+
+    def __init__(self, operation: str):
+        super().__init__(
+            status_code=503,
+            detail=f"Server is busy processing {operation} requests, please retry shortly",
+            headers={"Retry-After": str(settings.worker_retry_after_seconds)}
+        )
+
+
+def _init_worker():
+    """Configure logging inside freshly spawned worker processes"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
+def _call_collecting_pages(func: Callable, *args, **kwargs) -> Tuple[Any, int]:
+    """Run func in a worker and return its result with the page count it recorded"""
+    collect_worker_pages()
+    result = func(*args, **kwargs)
+    return result, collect_worker_pages()
+
+
+class WorkerPool:
+    """Bounded pool that runs CPU-bound PDF work off the event loop"""
+
+    def __init__(self):
+        self._executor: Optional[Executor] = None
+        self._pending: Dict[str, int] = {}
+        self._total_pending = 0
+
+    def start(self):
+        """Create the underlying executor if it is not running yet"""
+        if self._executor is not None:
+            return
+
+        if settings.worker_backend == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.worker_count,
+                thread_name_prefix="pdf-worker"
+            )
+        else:
+            # spawn avoids forking a process that already runs event loop threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.worker_count,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        logger.info(f"Started {settings.worker_backend} worker pool with {settings.worker_count} workers")
+
+    def shutdown(self):
+        """Stop the executor, waiting for running work to finish"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("Worker pool shut down")
+
+    def queue_depth(self, operation: Optional[str] = None) -> int:
+        """
+        Number of submitted but unfinished jobs
+
+        Args:
+            operation: Restrict count to one operation (None = all operations)
+        """
+        if operation is None:
+            return self._total_pending
+        return self._pending.get(operation, 0)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Pending task count for every operation seen so far"""
+        return dict(self._pending)
+
+    def _queue_limit(self, operation: str) -> int:
+        return settings.worker_queue_limits_map.get(operation, settings.worker_queue_limit)
+
+    def _admit(self, operation: str):
+        if (self._pending.get(operation, 0) >= self._queue_limit(operation)
+                or self._total_pending >= settings.worker_max_pending):
+            logger.warning(f"Rejecting {operation}: queue full ({self._total_pending} pending)")
+            raise ExecutorBusyError(operation)
+
+        self.start()
+        self._pending[operation] = self._pending.get(operation, 0) + 1
+        self._total_pending += 1
+
+    def _release(self, operation: str):
+        self._pending[operation] -= 1
+        self._total_pending -= 1
+
+    def _reset_broken(self, operation: str, executor: Executor):
+        # A worker died (e.g. OOM killed); replace the pool for later requests
+        logger.error(f"Worker pool broken while running {operation}, restarting")
+        if self._executor is executor:
+            self._executor = None
+            executor.shutdown(wait=False)
+
+    async def run(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a function in the worker pool, rejecting work when queues are full
+
+        Args:
+            operation: Operation name used for per-operation queue limits
+            func: Picklable module-level function to execute
+
+        Returns:
+            Return value of func
+
+        Raises:
+            ExecutorBusyError: If the operation or global queue is full
+        """
+        self._admit(operation)
+        executor = self._executor
+        try:
+            loop = asyncio.get_running_loop()
+            result, pages = await loop.run_in_executor(
+                executor,
+                functools.partial(_call_collecting_pages, func, *args, **kwargs)
+            )
+            pdf_pages_processed_total.inc(pages, operation=operation)
+            return result
+        except BrokenProcessPool:
+            self._reset_broken(operation, executor)
+            raise
+        finally:
+            self._release(operation)
+
+    async def map(self, operation: str, func: Callable, arg_tuples: Iterable[Tuple]) -> AsyncIterator[Any]:
+        """
+        Fan one request out over the pool, yielding results in submission order
+
+        The request is admitted (and counted against queue limits) once, so its
+        chunks cannot be rejected halfway through. Close the generator (e.g. with
+        contextlib.aclosing) to cancel chunks that have not started.
+
+        Args:
+            operation: Operation name used for per-operation queue limits
+            func: Picklable module-level function to execute
+            arg_tuples: Positional arguments for each call
+
+        Yields:
+            Return value of func for each argument tuple
+
+        Raises:
+            ExecutorBusyError: If the operation or global queue is full
+        """
+        self._admit(operation)
+        executor = self._executor
+        futures = []
+        try:
+            loop = asyncio.get_running_loop()
+            futures = [
+                loop.run_in_executor(executor, functools.partial(_call_collecting_pages, func, *args))
+                for args in arg_tuples
+            ]
+            for future in futures:
+                result, pages = await future
+                pdf_pages_processed_total.inc(pages, operation=operation)
+                yield result
+        except BrokenProcessPool:
+            self._reset_broken(operation, executor)
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+            self._release(operation)
+
+
+# Global worker pool instance
+worker_pool = WorkerPool()
+
+worker_queue_depth.set_function(
+    lambda: {(operation,): depth for operation, depth in worker_pool.queue_depths().items()}
+)
@@ -0,0 +1,281 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+import io
+import logging
+import math
+import zlib
+
+from PIL import Image
+from pikepdf import Array, Dictionary, Matrix, Name, Object, Page, Pdf, Stream, parse_content_stream
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Downsampling profiles per compression quality ("low" quality = smallest file)
+COMPRESSION_PROFILES = {
+    "low": {"target_dpi": 72, "jpeg_quality": 40},
+    "medium": {"target_dpi": 150, "jpeg_quality": 65},
+    "high": {"target_dpi": 225, "jpeg_quality": 80},
+}
+
+# Images smaller than this are not worth decoding
+MIN_IMAGE_BYTES = 16 * 1024
+
+# Only resample when the image is noticeably sharper than the target
+DOWNSAMPLE_MARGIN = 1.2
+
+# A re-encoded image must save at least this fraction to replace the original
+MIN_SAVINGS_RATIO = 0.1
+
+# Filters that qpdf cannot decode for us; only DCT is handled (by Pillow)
+_SPECIALIZED_FILTERS = {"/DCTDecode", "/JPXDecode", "/JBIG2Decode", "/CCITTFaxDecode"}
+
+
+@dataclass
+class _ImageJob:
+    """Everything a thread needs to re-encode one image without touching the Pdf"""
+    objgen: Tuple[int, int]
+    name: str
+    page: int
+    width: int
+    height: int
+    effective_dpi: float
+    bits: int
+    mode: str
+    raw_size: int
+    data: bytes
+    is_jpeg: bool
+
+
+def _filters(image: Stream) -> List[str]:
+    filters = image.get("/Filter")
+    if filters is None:
+        return []
+    if isinstance(filters, Array):
+        return [str(f) for f in filters]
+    return [str(filters)]
+
+
+def _colorspace_mode(image: Stream) -> Optional[str]:
+    """Pillow mode for colour spaces we can round-trip unchanged, else None"""
+    colorspace = image.get("/ColorSpace")
+    if colorspace == Name.DeviceRGB:
+        return "RGB"
+    if colorspace == Name.DeviceGray:
+        return "L"
+    if isinstance(colorspace, Array) and len(colorspace) == 2 and colorspace[0] == Name.ICCBased:
+        return {1: "L", 3: "RGB"}.get(int(colorspace[1].get("/N", 0)))
+    return None
+
+
+def _collect_placements(
+    content: Union[Object, Page],
+    resources: Dictionary,
+    ctm: Matrix,
+    placements: Dict[Tuple[int, int], float],
+    visiting: set
+):
+    """Record the smallest effective resolution each image is drawn at, following Form XObjects"""
+    xobjects = resources.get("/XObject", Dictionary()) if resources is not None else Dictionary()
+    stack = []
+    for operands, operator in parse_content_stream(content, "q Q cm Do"):
+        op = str(operator)
+        if op == "q":
+            stack.append(ctm)
+        elif op == "Q":
+            ctm = stack.pop() if stack else ctm
+        elif op == "cm":
+            ctm = Matrix(*[float(x) for x in operands]) @ ctm
+        elif op == "Do":
+            xobject = xobjects.get(operands[0])
+            if not isinstance(xobject, Stream):
+                continue
+            subtype = xobject.get("/Subtype")
+            if subtype == Name.Image:
+                # The unit square maps to the image; its transformed edges are the drawn size in points
+                shown_width = math.hypot(ctm.a, ctm.b) / 72
+                shown_height = math.hypot(ctm.c, ctm.d) / 72
+                if shown_width <= 0 or shown_height <= 0:
+                    continue
+                dpi = min(int(xobject.Width) / shown_width, int(xobject.Height) / shown_height)
+                key = xobject.objgen
+                placements[key] = min(dpi, placements.get(key, dpi))
+            elif subtype == Name.Form and xobject.objgen not in visiting:
+                visiting.add(xobject.objgen)
+                matrix = Matrix(*[float(x) for x in xobject.get("/Matrix", [1, 0, 0, 1, 0, 0])])
+                _collect_placements(xobject, xobject.get("/Resources"), matrix @ ctm, placements, visiting)
+                visiting.discard(xobject.objgen)
+
+
+def _prepare_job(
+    pdf: Pdf,
+    image: Stream,
+    name: str,
+    page: int,
+    effective_dpi: float
+) -> Optional[_ImageJob]:
+    """Extract what is needed to re-encode an image, or None if it should be left alone"""
+    if image.get("/ImageMask", False) or "/Decode" in image or "/SMaskInData" in image:
+        return None
+
+    raw_size = len(image.read_raw_bytes())
+    if raw_size < MIN_IMAGE_BYTES:
+        return None
+
+    mode = _colorspace_mode(image)
+    bits = int(image.get("/BitsPerComponent", 8))
+    filters = _filters(image)
+    specialized = [f for f in filters if f in _SPECIALIZED_FILTERS]
+
+    if mode is None or bits not in (1, 8) or (bits == 1 and mode != "L"):
+        return None
+
+    if specialized and (specialized != ["/DCTDecode"] or filters[-1] != "/DCTDecode"):
+        return None
+
+    is_jpeg = bool(specialized)
+    if not is_jpeg:
+        data = image.read_bytes()
+    elif len(filters) == 1:
+        data = image.read_raw_bytes()
+    else:
+        # Undo outer filters (e.g. reportlab's ASCII85) on a scratch stream to reach the JPEG
+        outer = Stream(pdf, image.read_raw_bytes())
+        outer.Filter = Array([Name(f) for f in filters[:-1]])
+        parms = image.get("/DecodeParms")
+        if isinstance(parms, Array):
+            outer.DecodeParms = Array(list(parms)[:-1])
+        data = outer.read_bytes()
+
+    return _ImageJob(
+        objgen=image.objgen,
+        name=name,
+        page=page,
+        width=int(image.Width),
+        height=int(image.Height),
+        effective_dpi=effective_dpi,
+        bits=bits,
+        mode=mode,
+        raw_size=raw_size,
+        data=data,
+        is_jpeg=is_jpeg
+    )
+
+
+def _reencode(job: _ImageJob, target_dpi: int, jpeg_quality: int) -> Optional[Dict[str, Any]]:
+    """Downsample and re-encode one image (runs in a thread; Pillow releases the GIL)"""
+    if job.is_jpeg:
+        image = Image.open(io.BytesIO(job.data))
+        if image.mode not in ("L", "RGB"):
+            return None
+    elif job.bits == 1:
+        image = Image.frombytes("1", (job.width, job.height), job.data).convert("L")
+    else:
+        image = Image.frombytes(job.mode, (job.width, job.height), job.data)
+
+    scale = 1.0
+    if job.effective_dpi > target_dpi * DOWNSAMPLE_MARGIN:
+        scale = target_dpi / job.effective_dpi
+        size = (max(1, round(job.width * scale)), max(1, round(job.height * scale)))
+        image = image.resize(size, Image.LANCZOS)
+
+    if job.bits == 1:
+        # Line art stays bilevel and lossless
+        image = image.point(lambda value: 255 if value >= 128 else 0).convert("1")
+        data = zlib.compress(image.tobytes(), 9)
+        image_filter = Name.FlateDecode
+    else:
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=jpeg_quality, optimize=True)
+        data = buffer.getvalue()
+        image_filter = Name.DCTDecode
+
+    if len(data) > job.raw_size * (1 - MIN_SAVINGS_RATIO):
+        return None
+
+    return {
+        "data": data,
+        "filter": image_filter,
+        "width": image.width,
+        "height": image.height,
+        "dpi": round(job.effective_dpi * scale),
+    }
+
+
+def downsample_images(pdf: Pdf, quality: str) -> Dict[str, Any]:
+    """
+    Downsample and re-encode image XObjects in place according to a quality profile
+
+    Args:
+        pdf: Open document to modify
+        quality: Compression quality (low, medium, high)
+
+    Returns:
+        Report with counts, total bytes saved and per-image savings
+    """
+    profile = COMPRESSION_PROFILES.get(quality, COMPRESSION_PROFILES["medium"])
+
+    # Resolution each image is actually shown at (the largest rendering wins)
+    placements: Dict[Tuple[int, int], float] = {}
+    first_page: Dict[Tuple[int, int], Tuple[int, str]] = {}
+    for page_number, page in enumerate(pdf.pages, start=1):
+        before = set(placements)
+        _collect_placements(page, page.get("/Resources"), Matrix(), placements, set())
+        xobjects = page.get("/Resources", Dictionary()).get("/XObject", Dictionary())
+        names = {xobjects[key].objgen: key for key in xobjects.keys() if isinstance(xobjects[key], Stream)}
+        for objgen in set(placements) - before:
+            first_page[objgen] = (page_number, names.get(objgen, ""))
+
+    jobs: List[_ImageJob] = []
+    images: Dict[Tuple[int, int], Stream] = {}
+    skipped = 0
+    for objgen, dpi in placements.items():
+        image = pdf.get_object(objgen)
+        page_number, name = first_page[objgen]
+        job = _prepare_job(pdf, image, name, page_number, dpi)
+        if job is None:
+            skipped += 1
+            continue
+        jobs.append(job)
+        images[objgen] = image
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.compress_image_threads)) as pool:
+        results = list(pool.map(
+            lambda job: _reencode(job, profile["target_dpi"], profile["jpeg_quality"]),
+            jobs
+        ))
+
+    report = []
+    for job, result in zip(jobs, results):
+        if result is None:
+            skipped += 1
+            continue
+        image = images[job.objgen]
+        image.write(result["data"], filter=result["filter"])
+        image.Width = result["width"]
+        image.Height = result["height"]
+        image.BitsPerComponent = job.bits
+        if "/DecodeParms" in image:
+            del image["/DecodeParms"]
+        report.append({
+            "page": job.page,
+            "name": job.name,
+            "original_size": [job.width, job.height],
+            "new_size": [result["width"], result["height"]],
+            "original_dpi": round(job.effective_dpi),
+            "new_dpi": result["dpi"],
+            "original_bytes": job.raw_size,
+            "new_bytes": len(result["data"]),
+            "saved_bytes": job.raw_size - len(result["data"]),
+        })
+
+    saved = sum(item["saved_bytes"] for item in report)
+    logger.info(f"Re-encoded {len(report)} images ({skipped} skipped), saved {saved} bytes")
+    return {
+        "images_processed": len(report),
+        "images_skipped": skipped,
+        "image_bytes_saved": saved,
+        "images": report,
+    }
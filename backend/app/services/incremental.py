@@ -0,0 +1,269 @@
+from pikepdf import Array, Dictionary, Name, Object, Page, Pdf, Stream
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import logging
+import os
+import shutil
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the end of the original file to find its last xref section
+TAIL_SIZE = 2048
+
+# Keys of the old trailer (or xref stream dictionary) that the new section replaces
+_SECTION_KEYS = {"/Prev", "/Size", "/XRefStm", "/Type", "/W", "/Index", "/Length", "/Filter", "/DecodeParms"}
+
+ObjGen = Tuple[int, int]
+
+
+class IncrementalUnsupportedError(Exception):
+    """Raised when a document can't be updated incrementally and must be rewritten"""
+
+
+def _is_stream(obj: Object) -> bool:
+    return isinstance(obj, Stream)
+
+
+def _fingerprint(obj: Object) -> bytes:
+    """Serialized form of an object, used to tell whether an edit changed it"""
+    if _is_stream(obj):
+        return obj.stream_dict.unparse(resolved=True) + obj.read_raw_bytes()
+    return obj.unparse(resolved=True)
+
+
+def _children(obj: Object) -> Iterator[Object]:
+    """Containers and references directly inside obj (pikepdf returns scalars as Python values)"""
+    if _is_stream(obj):
+        values = obj.stream_dict.values()
+    elif isinstance(obj, Dictionary):
+        values = obj.values()
+    elif isinstance(obj, Array):
+        values = obj
+    else:
+        return
+    for value in values:
+        if isinstance(value, Object):
+            yield value
+
+
+def _serialize(obj: Object) -> bytes:
+    """One "N G obj ... endobj" block"""
+    num, gen = obj.objgen
+    if _is_stream(obj):
+        raw = obj.read_raw_bytes()
+        header = Dictionary({key: value for key, value in obj.stream_dict.items() if key != "/Length"})
+        header.Length = len(raw)
+        body = header.unparse() + b"\nstream\n" + raw + b"\nendstream"
+    else:
+        body = obj.unparse(resolved=True)
+    return b"%d %d obj\n" % (num, gen) + body + b"\nendobj\n"
+
+
+def _read_tail(source: Union[bytes, str]) -> Tuple[bytes, int]:
+    """Last TAIL_SIZE bytes of the original and its total size"""
+    if isinstance(source, str):
+        size = os.path.getsize(source)
+        with open(source, 'rb') as f:
+            f.seek(max(0, size - TAIL_SIZE))
+            return f.read(), size
+    return source[-TAIL_SIZE:], len(source)
+
+
+def _read_at(source: Union[bytes, str], offset: int, length: int) -> bytes:
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+    return source[offset:offset + length]
+
+
+class IncrementalUpdate:
+    """
+    Save page-level edits as an incremental update of the original file
+
+    The original bytes are kept as they are. Only the objects the edit changed
+    or created are appended, followed by a new cross-reference section that
+    points back to the original one. The cost of saving grows with the number
+    of changed pages, not with the size of the document: untouched pages,
+    images and fonts are never re-serialized.
+
+    Call watch() for every page before changing it, then save().
+    """
+
+    def __init__(self, pdf: Pdf, source: Union[bytes, str]):
+        self.pdf = pdf
+        self.source = source
+        # New objects are numbered from the original trailer's /Size. Objects qpdf
+        # created before this point, such as resources it pushed down from the
+        # page tree, are new too, so the /Size wins over a probe allocation
+        probe = pdf.make_indirect(Dictionary()).objgen[0]
+        size = pdf.trailer.get("/Size")
+        self._first_new = min(int(size), probe) if isinstance(size, int) else probe
+        self._watched: Dict[ObjGen, bytes] = {}
+
+    def watch(self, page: Union[Page, Object]):
+        """
+        Record the state of a page before it is edited
+
+        The page dictionary, its resource dictionaries and its content streams
+        are compared against this snapshot when saving.
+        """
+        obj = page.obj if isinstance(page, Page) else page
+        self._snapshot(obj)
+        resources = obj.get("/Resources")
+        if resources is not None:
+            self._snapshot(resources)
+            for category in resources.values():
+                if isinstance(category, Object):
+                    self._snapshot(category)
+        contents = obj.get("/Contents")
+        if contents is not None:
+            self._snapshot(contents)
+            if isinstance(contents, Array):
+                for stream in contents:
+                    self._snapshot(stream)
+
+    def _snapshot(self, obj: Object):
+        if obj.is_indirect and obj.objgen not in self._watched:
+            self._watched[obj.objgen] = _fingerprint(obj)
+
+    def _is_new(self, obj: Object) -> bool:
+        return obj.is_indirect and obj.objgen[0] >= self._first_new
+
+    def _changed_objects(self) -> List[Object]:
+        """Watched objects that differ from their snapshot, plus every new object they reach"""
+        changed = []
+        for objgen, before in self._watched.items():
+            obj = self.pdf.get_object(objgen)
+            if _fingerprint(obj) != before:
+                changed.append(obj)
+
+        found: Dict[ObjGen, Object] = {obj.objgen: obj for obj in changed}
+        pending = list(changed)
+        while pending:
+            for child in _children(pending.pop()):
+                if child.is_indirect:
+                    if self._is_new(child) and child.objgen not in found:
+                        found[child.objgen] = child
+                        pending.append(child)
+                else:
+                    pending.append(child)
+        return sorted(found.values(), key=lambda obj: obj.objgen)
+
+    def _previous_section(self) -> Tuple[int, bool, int]:
+        """Offset of the original's last xref section, whether it is an xref stream, and the file size"""
+        tail, size = _read_tail(self.source)
+        position = tail.rfind(b"startxref")
+        if position < 0:
+            raise IncrementalUnsupportedError("startxref not found")
+        try:
+            offset = int(tail[position + len(b"startxref"):].split()[0])
+        except (IndexError, ValueError):
+            raise IncrementalUnsupportedError("malformed startxref")
+        if not 0 <= offset < size:
+            raise IncrementalUnsupportedError("startxref points outside the file")
+        is_stream = not _read_at(self.source, offset, 4).startswith(b"xref")
+        return offset, is_stream, size
+
+    def _trailer(self, size: int, prev: int) -> Dictionary:
+        trailer = Dictionary({key: value for key, value in self.pdf.trailer.items() if key not in _SECTION_KEYS})
+        trailer.Size = size
+        trailer.Prev = prev
+        return trailer
+
+    def save(self) -> str:
+        """
+        Write the original followed by the update to a new file
+
+        Returns:
+            Path of the updated PDF (the caller removes it)
+
+        Raises:
+            IncrementalUnsupportedError: The original is encrypted, was repaired
+                while opening, or its last xref section can't be found
+        """
+        if self.pdf.is_encrypted:
+            raise IncrementalUnsupportedError("document is encrypted")
+        if self.pdf.get_warnings():
+            # qpdf reconstructed part of the file, so the original xref can't be trusted
+            raise IncrementalUnsupportedError("document needed repairs while opening")
+        prev, xref_is_stream, original_size = self._previous_section()
+        objects = self._changed_objects()
+
+        fd, output_path = tempfile.mkstemp(suffix=".pdf")
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                if isinstance(self.source, str):
+                    with open(self.source, 'rb') as original:
+                        shutil.copyfileobj(original, out)
+                else:
+                    out.write(self.source)
+                position = original_size
+                if _read_at(self.source, original_size - 1, 1) not in (b"\n", b"\r"):
+                    position += out.write(b"\n")
+
+                offsets: Dict[ObjGen, int] = {}
+                for obj in objects:
+                    offsets[obj.objgen] = position
+                    position += out.write(_serialize(obj))
+
+                size = max([int(self.pdf.trailer.get("/Size", 0))] + [num + 1 for num, _ in offsets])
+                if xref_is_stream:
+                    out.write(self._xref_stream(offsets, size, prev, position))
+                else:
+                    out.write(self._xref_table(offsets, size, prev, position))
+        except BaseException:
+            os.remove(output_path)
+            raise
+
+        logger.info(f"Incremental update appended {len(objects)} objects")
+        return output_path
+
+    def _xref_table(self, offsets: Dict[ObjGen, int], size: int, prev: int, position: int) -> bytes:
+        lines = [b"xref\n"]
+        for first, run in _runs(offsets):
+            lines.append(b"%d %d\n" % (first, len(run)))
+            lines.extend(b"%010d %05d n\r\n" % (offset, gen) for gen, offset in run)
+        lines.append(b"trailer\n" + self._trailer(size, prev).unparse() + b"\n")
+        lines.append(b"startxref\n%d\n%%%%EOF\n" % position)
+        return b"".join(lines)
+
+    def _xref_stream(self, offsets: Dict[ObjGen, int], size: int, prev: int, position: int) -> bytes:
+        # The xref stream is an object too and lists its own offset
+        number = size
+        offsets = {**offsets, (number, 0): position}
+        offset_width = max(4, (position.bit_length() + 7) // 8)
+
+        index = Array()
+        data = bytearray()
+        for first, run in _runs(offsets):
+            index.extend([first, len(run)])
+            for gen, offset in run:
+                data += b"\x01" + offset.to_bytes(offset_width, "big") + gen.to_bytes(2, "big")
+
+        header = self._trailer(number + 1, prev)
+        header.Type = Name.XRef
+        header.W = Array([1, offset_width, 2])
+        header.Index = index
+        header.Length = len(data)
+        return (
+            b"%d 0 obj\n" % number + header.unparse() + b"\nstream\n" + bytes(data)
+            + b"\nendstream\nendobj\n" + b"startxref\n%d\n%%%%EOF\n" % position
+        )
+
+
+def _runs(offsets: Dict[ObjGen, int]) -> Iterator[Tuple[int, List[Tuple[int, int]]]]:
+    """Group xref entries into subsections of consecutive object numbers: (first, [(gen, offset)])"""
+    first: Optional[int] = None
+    run: List[Tuple[int, int]] = []
+    previous = None
+    for (num, gen), offset in sorted(offsets.items()):
+        if previous is not None and num != previous + 1:
+            yield first, run
+            first, run = None, []
+        if first is None:
+            first = num
+        run.append((gen, offset))
+        previous = num
+    if run:
+        yield first, run
@@ -0,0 +1,392 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+import asyncio
+import json
+import logging
+import os
+import shutil
+import socket
+import sqlite3
+import time
+import uuid
+
+from app.core.config import settings
+from app.services.executor import ExecutorBusyError
+from app.services.pdf_service import PDFService
+from app.services.result_cache import store_output
+from app.services.retention import retention_scheduler
+from app.storage.local_storage import UPLOAD_DIR
+from app.utils.uploads import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+# Job state lives next to the stored files but outside the download namespace
+JOBS_DIR = os.path.join(UPLOAD_DIR, ".jobs")
+JOBS_DB_PATH = os.path.join(JOBS_DIR, "jobs.sqlite3")
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# operation -> output extension, content type and coroutine factory
+JOB_OPERATIONS: Dict[str, Dict[str, Any]] = {
+    "pdf-to-word": {
+        "extension": "docx",
+        "content_type": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "run": lambda path, params: PDFService.pdf_to_word(path, params.get("pages")),
+    },
+    "pdf-to-excel": {
+        "extension": "xlsx",
+        "content_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "run": lambda path, params: PDFService.pdf_to_excel(path),
+    },
+    "pdf-to-jpg": {
+        "extension": "zip",
+        "content_type": "application/zip",
+        "run": lambda path, params: PDFService.pdf_to_images(path, params["format"], params["dpi"]),
+    },
+}
+
+_JOB_COLUMNS = (
+    "id", "operation", "params", "status", "progress", "input_path", "input_filename",
+    "result_filename", "download_url", "result_size", "error", "claimed_by",
+    "created_at", "updated_at"
+)
+
+
+class JobQueue:
+    """Persistent SQLite-backed queue for long-running conversions"""
+
+    def __init__(self, db_path: str = JOBS_DB_PATH):
+        self.db_path = db_path
+        # The process start time tells this process apart from an earlier one
+        # that had the same PID, e.g. PID 1 before a container restart
+        started = _process_started(os.getpid())
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}" + (f":{started}" if started else "")
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._initialized:
+            self._init_db()
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create the jobs directory and table if they don't exist"""
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    operation TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    input_path TEXT,
+                    input_filename TEXT,
+                    result_filename TEXT,
+                    download_url TEXT,
+                    result_size INTEGER,
+                    error TEXT,
+                    claimed_by TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def _row_to_job(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = {column: row[column] for column in _JOB_COLUMNS}
+        job["params"] = json.loads(job["params"])
+        return job
+
+    def _update(self, job_id: str, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                (*fields.values(), job_id)
+            )
+
+    def _insert(self, job_id: str, operation: str, params: Dict[str, Any], input_path: str, input_filename: str):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, operation, params, status, progress, input_path, input_filename, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, 0, ?, ?, ?, ?)",
+                (job_id, operation, json.dumps(params), JOB_QUEUED, input_path, input_filename, now, now)
+            )
+
+    def _claim_next(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest queued job to running"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JOB_QUEUED,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, progress = 10, claimed_by = ?, updated_at = ? WHERE id = ?",
+                    (JOB_RUNNING, self.worker_id, time.time(), row["id"])
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        job = self._row_to_job(row)
+        job["status"] = JOB_RUNNING
+        return job
+
+    def _recover(self) -> int:
+        """
+        Requeue jobs left running by a process on this host that no longer exists
+
+        Runs before this process claims anything, so a claim carrying its own
+        PID was made by an earlier process that had the same PID.
+        """
+        hostname = socket.gethostname()
+        requeued = 0
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, claimed_by FROM jobs WHERE status = ?", (JOB_RUNNING,)
+            ).fetchall()
+            for row in rows:
+                # claimed_by is "host:pid:start time" ("host:pid" where the start time is unknown)
+                host, pid, started = ((row["claimed_by"] or "").split(":") + ["", ""])[:3]
+                if host != hostname or not pid.isdigit() or _claim_alive(int(pid), started):
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET status = ?, progress = 0, claimed_by = NULL, updated_at = ? WHERE id = ?",
+                    (JOB_QUEUED, time.time(), row["id"])
+                )
+                requeued += 1
+        return requeued
+
+    def _purge_expired(self) -> List[Dict[str, Any]]:
+        """Remove finished jobs older than the retention period"""
+        cutoff = time.time() - settings.file_retention_minutes * 60
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (JOB_COMPLETED, JOB_FAILED, cutoff)
+            ).fetchall()
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (JOB_COMPLETED, JOB_FAILED, cutoff)
+            )
+        return [self._row_to_job(row) for row in rows]
+
+    async def submit(self, operation: str, upload: SpooledUpload,
+                     params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Take ownership of a spooled upload and enqueue a job for it
+
+        Args:
+            operation: Key of JOB_OPERATIONS
+            upload: Spooled input file, moved into the job directory
+            params: Operation parameters (must be JSON serializable)
+
+        Returns:
+            The newly created job
+        """
+        if operation not in JOB_OPERATIONS:
+            raise ValueError(f"Unsupported job operation: {operation}")
+
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(JOBS_DIR, job_id)
+        input_path = os.path.join(job_dir, "input")
+
+        def _persist():
+            os.makedirs(job_dir, exist_ok=True)
+            os.replace(upload.path, input_path)
+            self._insert(job_id, operation, params or {}, input_path, upload.filename)
+
+        await asyncio.to_thread(_persist)
+        logger.info(f"Queued job {job_id} ({operation})")
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job by ID
+
+        Args:
+            job_id: Job identifier returned by submit
+
+        Returns:
+            Job dictionary or None if not found
+        """
+        def _select():
+            with self._connect() as conn:
+                return conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        row = await asyncio.to_thread(_select)
+        return self._row_to_job(row) if row else None
+
+    def start(self):
+        """Create the queue, recover interrupted jobs and start the background runners"""
+        if self._tasks:
+            return
+        self._init_db()
+        requeued = self._recover()
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted jobs")
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run_loop(), name=f"job-runner-{i}")
+            for i in range(settings.job_runners)
+        ]
+        logger.info(f"Started {settings.job_runners} job runners")
+
+    async def stop(self):
+        """Cancel the background runners; running jobs are requeued on next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run_loop(self):
+        last_purge = 0.0
+        while True:
+            try:
+                if time.time() - last_purge > 60:
+                    last_purge = time.time()
+                    for job in await asyncio.to_thread(self._purge_expired):
+                        _remove_job_dir(job["id"])
+
+                job = await asyncio.to_thread(self._claim_next)
+                if job is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), settings.job_poll_interval_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self._execute(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job runner error: {e}", exc_info=True)
+                await asyncio.sleep(settings.job_poll_interval_seconds)
+
+    async def _execute(self, job: Dict[str, Any]):
+        operation = JOB_OPERATIONS[job["operation"]]
+        try:
+            while True:
+                try:
+                    result = await operation["run"](job["input_path"], job["params"])
+                    break
+                except ExecutorBusyError:
+                    # Worker pool is saturated by interactive requests; wait our turn
+                    await asyncio.sleep(settings.worker_retry_after_seconds)
+
+            await asyncio.to_thread(self._update, job["id"], progress=90)
+
+            output_filename, download_url, result_size = await store_output(
+                result, operation["extension"], operation["content_type"]
+            )
+            await retention_scheduler.schedule(output_filename)
+
+            await asyncio.to_thread(
+                self._update, job["id"],
+                status=JOB_COMPLETED, progress=100, result_filename=output_filename,
+                download_url=download_url, result_size=result_size
+            )
+            logger.info(f"Job {job['id']} completed")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job {job['id']} failed: {e}")
+            await asyncio.to_thread(self._update, job["id"], status=JOB_FAILED, error=str(e))
+
+        await asyncio.to_thread(_remove_job_dir, job["id"])
+
+
+def _remove_job_dir(job_id: str):
+    shutil.rmtree(os.path.join(JOBS_DIR, job_id), ignore_errors=True)
+
+
+def _process_started(pid: int) -> Optional[str]:
+    """Start time of a process in clock ticks since boot, or None where /proc isn't available"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name in field 2 may contain spaces; the start time is field 22
+    return stat.rpartition(")")[2].split()[19]
+
+
+def _claim_alive(pid: int, started: str) -> bool:
+    """Whether the process that claimed a job is still running"""
+    if pid == os.getpid() or not _pid_alive(pid):
+        return False
+    # A live process with a different start time reused the PID
+    return not started or _process_started(pid) in (None, started)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def job_to_response(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a job record into the public API representation
+
+    Args:
+        job: Job dictionary from JobQueue
+
+    Returns:
+        Dictionary safe to return from an endpoint
+    """
+    return {
+        "job_id": job["id"],
+        "operation": job["operation"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "filename": job["input_filename"],
+        "result": {
+            "filename": job["result_filename"],
+            "download_url": job["download_url"],
+            "file_size": job["result_size"],
+        } if job["status"] == JOB_COMPLETED else None,
+        "error": job["error"],
+        "created_at": datetime.utcfromtimestamp(job["created_at"]).isoformat(),
+        "updated_at": datetime.utcfromtimestamp(job["updated_at"]).isoformat(),
+        "expires_at": (
+            datetime.utcfromtimestamp(job["updated_at"]) + timedelta(minutes=settings.file_retention_minutes)
+        ).isoformat() if job["status"] in (JOB_COMPLETED, JOB_FAILED) else None,
+    }
+
+
+# Global job queue instance
+job_queue = JobQueue()
@@ -1,716 +1,1484 @@
-from PyPDF2 import PdfReader, PdfWriter
-from pikepdf import Pdf
+from pikepdf import Array, Dictionary, Name, Object, ObjectStreamMode, Page, Pdf, Rectangle, Stream
 from PIL import Image
+import numpy as np
+from contextlib import ExitStack, aclosing, contextmanager
+from functools import lru_cache
+import asyncio
+import functools
+import hashlib
 import io
+import itertools
+import os
+import re
+import shutil
+import tempfile
+import time
 import zipfile
-from typing import List, BinaryIO
+from typing import Any, Callable, Dict, Iterator, List, BinaryIO, Optional, Set, Tuple, Union
 import logging
 
+from app.core.config import settings
+from app.core.metrics import (
+    pdf_input_bytes_total,
+    pdf_operation_duration_seconds,
+    pdf_output_bytes_total,
+    record_error,
+    record_pages,
+)
+from app.services.executor import worker_pool
+from app.services.image_compression import downsample_images
+from app.services.document import DocumentHandle, PageRangeError
+from app.services.incremental import IncrementalUnsupportedError, IncrementalUpdate
+from app.services.pipeline import PipelineError
+from app.services.table_extraction import ExtractedTable, get_extractor, resolve_engine
+from app.utils.helpers import parse_page_range_groups, parse_page_ranges
+
 logger = logging.getLogger(__name__)
 
+# Operation inputs are either raw bytes or the path of a spooled upload on disk
+FileSource = Union[bytes, str]
+
+# Base resolution for thumbnails; poppler scales the page to the requested width
+THUMBNAIL_DPI = 72
+
+# Table cells stored as numbers in Excel; leading zeros (IDs, codes) stay text
+NUMBER_PATTERN = re.compile(r"-?(0|[1-9]\d*)(\.\d+)?")
+
+# Longest cell text printed by Excel to PDF
+EXCEL_CELL_CHARS = 50
+
+
+def _as_stream(source: FileSource) -> Union[BinaryIO, str]:
+    """Return a path or in-memory stream that PDF/image libraries can open"""
+    return source if isinstance(source, str) else io.BytesIO(source)
+
+
+def _source_size(source: FileSource) -> int:
+    """Size of the input in bytes"""
+    return os.path.getsize(source) if isinstance(source, str) else len(source)
+
+
+@contextmanager
+def _source_path(source: FileSource, suffix: str) -> Iterator[str]:
+    """Yield a filesystem path for the input, writing bytes to a temp file if needed"""
+    if isinstance(source, str):
+        yield source
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp:
+        temp.write(source)
+        path = temp.name
+    try:
+        yield path
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _stream_key(stream: Stream) -> bytes:
+    """Content hash of a stream: raw (still encoded) data plus its dictionary"""
+    digest = hashlib.sha256(stream.read_raw_bytes())
+    digest.update(stream.stream_dict.unparse())
+    return digest.digest()
+
+
+def _remap_references(obj: Object, remap: Dict[Tuple[int, int], Object]):
+    """Point every reference to a duplicate at its canonical object, descending into direct containers"""
+    if isinstance(obj, Stream):
+        obj = obj.stream_dict
+    if isinstance(obj, Dictionary):
+        keys = list(obj.keys())
+        get, put = obj.get, obj.__setitem__
+    elif isinstance(obj, Array):
+        keys = range(len(obj))
+        get, put = obj.__getitem__, obj.__setitem__
+    else:
+        return
+
+    for key in keys:
+        value = get(key)
+        if not isinstance(value, Object):
+            continue  # scalars come back as Python values
+        if value.is_indirect:
+            if value.objgen in remap:
+                put(key, remap[value.objgen])
+        elif isinstance(value, (Dictionary, Array)):
+            _remap_references(value, remap)
+
+
+def _dedup_streams(pdf: Pdf) -> int:
+    """
+    Collapse byte-identical streams (fonts, ICC profiles, images) into one object
+
+    Streams that reference other streams (e.g. images with an /SMask) only become
+    identical once their referents are merged, so passes repeat until stable.
+    Orphaned duplicates are dropped when the PDF is saved.
+    """
+    # Duplicates stay in pdf.objects until save, so remember what was already merged away
+    merged_away: Set[Tuple[int, int]] = set()
+    while True:
+        canonical: Dict[bytes, Object] = {}
+        remap: Dict[Tuple[int, int], Object] = {}
+        for obj in pdf.objects:
+            if not isinstance(obj, Stream) or obj.objgen in merged_away:
+                continue
+            key = _stream_key(obj)
+            if key in canonical:
+                remap[obj.objgen] = canonical[key]
+            else:
+                canonical[key] = obj
+
+        if not remap:
+            return len(merged_away)
+
+        merged_away.update(remap)
+        for obj in pdf.objects:
+            if obj.objgen not in merged_away:
+                _remap_references(obj, remap)
+
+
+def _merge_pdfs(pdf_files: List[FileSource]) -> bytes:
+    """Merge multiple PDF files into one (runs in the worker pool)"""
+    try:
+        with ExitStack() as stack:
+            merged = stack.enter_context(Pdf.new())
+            
+            # Splice whole page trees; sources stay open until save because
+            # copied stream data is read from them lazily
+            for pdf_content in pdf_files:
+                source = stack.enter_context(Pdf.open(_as_stream(pdf_content)))
+                merged.pages.extend(source.pages)
+            
+            record_pages(len(merged.pages))
+            removed = _dedup_streams(merged)
+            
+            # Write to bytes
+            output = io.BytesIO()
+            merged.save(output, object_stream_mode=ObjectStreamMode.generate)
+        
+        logger.info(f"Merged {len(pdf_files)} PDFs successfully ({removed} duplicate streams shared)")
+        return output.getvalue()
+        
+    except Exception as e:
+        logger.error(f"Error merging PDFs: {e}")
+        raise
+
+
+def _split_pdf(pdf_content: FileSource, pages: Union[str, List[int]]) -> Tuple[bytes, Dict[str, Any]]:
+    """Extract specific pages from PDF (runs in the worker pool)"""
+    try:
+        with DocumentHandle(pdf_content) as document:
+            total_pages = document.page_count
+            page_indices = document.resolve_pages(pages)
+            document.select_pages(page_indices)
+            output = document.save()
+        
+        record_pages(len(page_indices))
+        
+        logger.info(f"Split PDF with {len(page_indices)} pages")
+        return output, {"original_pages": total_pages, "pages_extracted": len(page_indices)}
+        
+    except PageRangeError:
+        raise
+    except Exception as e:
+        logger.error(f"Error splitting PDF: {e}")
+        raise
+
+
+# pikepdf save options per compression quality
+COMPRESSION_SAVE_OPTIONS = {
+    "low": {"compress_streams": True, "preserve_pdfa": False, "object_stream_mode": ObjectStreamMode.generate},
+    "medium": {"compress_streams": True, "preserve_pdfa": True, "object_stream_mode": ObjectStreamMode.preserve},
+    "high": {"compress_streams": True, "preserve_pdfa": True, "object_stream_mode": ObjectStreamMode.disable}
+}
+
+
+def _write_split_parts(pdf_path: str, parts: List[Tuple[str, List[int]]], output_dir: str) -> List[str]:
+    """Write each (name, page indices) part as its own PDF file (runs in the worker pool)"""
+    paths = []
+    with DocumentHandle(pdf_path) as document:
+        for name, indices in parts:
+            path = os.path.join(output_dir, name)
+            with document.extract_pages(indices) as part:
+                part.save(path)
+            paths.append(path)
+            record_pages(len(indices))
+    return paths
+
+
+def _page_label(indices: List[int]) -> str:
+    first, last = indices[0] + 1, indices[-1] + 1
+    return f"page_{first}" if first == last else f"pages_{first}-{last}"
+
+
+def _move_to_zip(zip_file: zipfile.ZipFile, paths: List[str]):
+    """Move finished files into the ZIP archive under their own names"""
+    for path in paths:
+        zip_file.write(path, os.path.basename(path), compress_type=zipfile.ZIP_STORED)
+        os.remove(path)
+
+
+def _compress_pdf(pdf_content: FileSource, quality: str = "medium") -> Tuple[bytes, Dict[str, Any]]:
+    """Compress PDF file using pikepdf (runs in the worker pool)"""
+    try:
+        save_options = COMPRESSION_SAVE_OPTIONS.get(quality, COMPRESSION_SAVE_OPTIONS["medium"])
+        
+        # Open, shrink images, and compress
+        pdf = Pdf.open(_as_stream(pdf_content))
+        record_pages(len(pdf.pages))
+        report = downsample_images(pdf, quality)
+        output = io.BytesIO()
+        
+        pdf.save(output, **save_options)
+        pdf.close()
+        
+        output.seek(0)
+        compressed_data = output.getvalue()
+        
+        original_size = _source_size(pdf_content)
+        compressed_size = len(compressed_data)
+        reduction = ((original_size - compressed_size) / original_size) * 100
+        
+        logger.info(f"Compressed PDF: {reduction:.1f}% reduction")
+        return compressed_data, report
+        
+    except Exception as e:
+        logger.error(f"Error compressing PDF: {e}")
+        raise
+
+
+def _save_edits(document: DocumentHandle, update: Optional[IncrementalUpdate]) -> Tuple[FileSource, bool]:
+    """Save as an incremental update when one is tracked and possible, else rewrite the document"""
+    if update is not None:
+        try:
+            return update.save(), True
+        except IncrementalUnsupportedError as e:
+            logger.info(f"Incremental save not possible ({e}), rewriting the document")
+    return document.save(), False
+
+
+def _rotate_pdf(
+    pdf_content: FileSource,
+    rotation: int,
+    pages: Union[str, List[int], None] = None,
+    incremental: bool = False
+) -> Tuple[FileSource, Dict[str, Any]]:
+    """Rotate PDF pages (runs in the worker pool)"""
+    try:
+        with DocumentHandle(pdf_content) as document:
+            # Start tracking before the page tree is read, which can create objects
+            update = document.incremental_update() if incremental else None
+            total_pages = document.page_count
+            page_indices = document.resolve_pages(pages) if pages is not None else range(total_pages)
+            for i in page_indices:
+                page = document.pdf.pages[i]
+                if update is not None:
+                    update.watch(page)
+                page.rotate(rotation, relative=True)
+            output, appended = _save_edits(document, update)
+        
+        record_pages(total_pages)
+        
+        logger.info(f"Rotated PDF by {rotation} degrees")
+        return output, {"total_pages": total_pages, "pages_rotated": len(page_indices), "incremental": appended}
+        
+    except PageRangeError:
+        raise
+    except Exception as e:
+        logger.error(f"Error rotating PDF: {e}")
+        raise
+
+
+def _reorder_pdf(pdf_content: FileSource, page_order: List[int]) -> Tuple[bytes, Dict[str, Any]]:
+    """Reorder PDF pages (runs in the worker pool)"""
+    try:
+        with DocumentHandle(pdf_content) as document:
+            total_pages = document.page_count
+            document.select_pages(document.check_indices(page_order))
+            output = document.save()
+        
+        record_pages(len(page_order))
+        
+        logger.info(f"Reordered PDF with {len(page_order)} pages")
+        return output, {"original_pages": total_pages}
+        
+    except PageRangeError:
+        raise
+    except Exception as e:
+        logger.error(f"Error reordering PDF: {e}")
+        raise
+
+
+def _get_pdf_info(pdf_content: FileSource) -> dict:
+    """Get PDF metadata (runs in the worker pool)"""
+    try:
+        with DocumentHandle(pdf_content) as document:
+            return {
+                "pages": document.page_count,
+                "size_bytes": document.size_bytes,
+                "metadata": document.metadata
+            }
+        
+    except Exception as e:
+        logger.error(f"Error getting PDF info: {e}")
+        raise
+
+
+def _pdf_to_word(pdf_content: FileSource, pages: Optional[List[int]] = None) -> bytes:
+    """Convert PDF (or the given 0-indexed pages) to Word document (DOCX) (runs in the worker pool)"""
+    try:
+        with _source_path(pdf_content, '.pdf') as pdf_path:
+            docx_path = _convert_to_docx(pdf_path, pages)
+            
+            try:
+                # Read the output file
+                with open(docx_path, 'rb') as f:
+                    docx_content = f.read()
+                
+                logger.info("Converted PDF to Word successfully")
+                return docx_content
+                
+            finally:
+                # Cleanup temp files
+                if os.path.exists(docx_path):
+                    os.remove(docx_path)
+                
+    except Exception as e:
+        logger.error(f"Error converting PDF to Word: {e}")
+        raise
+
+
+def _convert_to_docx(pdf_path: str, pages: Optional[List[int]] = None, output_dir: Optional[str] = None) -> str:
+    """Convert pages of a PDF on disk to a DOCX file, returning its path (runs in the worker pool)"""
+    from pdf2docx import Converter
+    
+    fd, docx_path = tempfile.mkstemp(suffix='.docx', dir=output_dir)
+    os.close(fd)
+    try:
+        cv = Converter(pdf_path)
+        try:
+            cv.convert(docx_path, pages=pages)
+            record_pages(len(pages) if pages else len(cv.fitz_doc))
+        finally:
+            cv.close()
+    except BaseException:
+        os.remove(docx_path)
+        raise
+    return docx_path
+
+
+def _merge_docx_parts(paths: List[str]) -> bytes:
+    """Stitch chunk conversions back into one document (runs in the worker pool)"""
+    from app.services.docx_merge import merge_docx_files
+    
+    return merge_docx_files(paths)
+
+
+def _count_pages(pdf_path: str) -> int:
+    """Number of pages in a PDF on disk"""
+    with Pdf.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def _render_page_range(
+    pdf_path: str,
+    first_page: int,
+    last_page: int,
+    image_format: str,
+    dpi: int,
+    output_dir: str,
+    width: Optional[int] = None
+) -> List[str]:
+    """Render a range of pages straight to image files (runs in the worker pool)"""
+    from pdf2image import convert_from_path
+    
+    # poppler encodes directly to disk, so no page is ever held as a PIL image here
+    fmt = "png" if image_format.lower() == "png" else "jpeg"
+    record_pages(last_page - first_page + 1)
+    return convert_from_path(
+        pdf_path,
+        dpi=dpi,
+        first_page=first_page,
+        last_page=last_page,
+        size=(width, None) if width else None,
+        fmt=fmt,
+        jpegopt={"quality": 95} if fmt == "jpeg" else None,
+        output_folder=output_dir,
+        output_file=f"chunk{first_page:06d}",
+        paths_only=True
+    )
+
+
+def _append_to_zip(zip_file: zipfile.ZipFile, paths: List[str], first_page: int, ext: str):
+    """Move rendered page files into the ZIP archive"""
+    for offset, path in enumerate(paths):
+        # Images are already compressed; deflating them again only costs CPU
+        zip_file.write(path, f'page_{first_page + offset}.{ext}', compress_type=zipfile.ZIP_STORED)
+        os.remove(path)
+
+
+def _images_to_pdf(image_contents: List[FileSource]) -> bytes:
+    """Convert images to PDF (runs in the worker pool)"""
+    try:
+        from reportlab.lib.pagesizes import letter, A4
+        from reportlab.pdfgen import canvas
+        
+        output = io.BytesIO()
+        c = canvas.Canvas(output, pagesize=A4)
+        a4_width, a4_height = A4
+        
+        for img_content in image_contents:
+            # Open image with PIL
+            img = Image.open(_as_stream(img_content))
+            
+            # Convert to RGB if necessary
+            if img.mode in ('RGBA', 'P'):
+                img = img.convert('RGB')
+            
+            # Get image dimensions
+            img_width, img_height = img.size
+            
+            # Calculate scaling to fit A4 page while maintaining aspect ratio
+            width_ratio = a4_width / img_width
+            height_ratio = a4_height / img_height
+            scale = min(width_ratio, height_ratio) * 0.95  # 5% margin
+            
+            new_width = img_width * scale
+            new_height = img_height * scale
+            
+            # Center the image on the page
+            x = (a4_width - new_width) / 2
+            y = (a4_height - new_height) / 2
+            
+            # Save image to temporary buffer
+            img_buffer = io.BytesIO()
+            img.save(img_buffer, format='JPEG', quality=95)
+            img_buffer.seek(0)
+            
+            # Create ImageReader from buffer
+            from reportlab.lib.utils import ImageReader
+            img_reader = ImageReader(img_buffer)
+            
+            # Draw image on canvas
+            c.drawImage(img_reader, x, y, new_width, new_height)
+            c.showPage()
+        
+        c.save()
+        output.seek(0)
+        
+        record_pages(len(image_contents))
+        logger.info(f"Converted {len(image_contents)} images to PDF")
+        return output.getvalue()
+        
+    except Exception as e:
+        logger.error(f"Error converting images to PDF: {e}")
+        raise
+
+
+@lru_cache(maxsize=32)
+def _render_watermark(page_width: float, page_height: float, watermark_text: str, opacity: float) -> bytes:
+    """Render a one-page watermark overlay; cached per worker process"""
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.colors import Color
+    
+    watermark_buffer = io.BytesIO()
+    c = canvas.Canvas(watermark_buffer, pagesize=(page_width, page_height))
+    
+    # Set watermark properties
+    c.setFillColor(Color(0.5, 0.5, 0.5, alpha=opacity))
+    c.setFont("Helvetica-Bold", 50)
+    
+    # Rotate and position watermark
+    c.saveState()
+    c.translate(page_width / 2, page_height / 2)
+    c.rotate(45)
+    c.drawCentredString(0, 0, watermark_text)
+    c.restoreState()
+    
+    c.save()
+    return watermark_buffer.getvalue()
+
+
+def _shared_resource_name(page: Page, resource: Object, resource_type: Name, prefix: str) -> Name:
+    """
+    Name of a shared resource in the page's resources, adding it only if it isn't there yet
+    
+    Pages often share one /Resources dictionary, so adding a fresh alias per
+    page would grow that dictionary with every page.
+    """
+    entries = page.resources.get(resource_type)
+    if entries is not None:
+        for name, value in entries.items():
+            if isinstance(value, Object) and value.is_indirect and value.objgen == resource.objgen:
+                return Name(name)
+    return page.add_resource(resource, resource_type, prefix=prefix, replace_existing=False)
+
+
+def _apply_watermark(pdf: Pdf, watermark_text: str, opacity: float) -> int:
+    """Overlay the watermark on every page in place; returns the number of distinct overlays"""
+    # One Form XObject per distinct page size, referenced from every page of that size
+    overlays = {}
+    save_state = pdf.make_stream(b"q\n")
+    restore_state = pdf.make_stream(b"\nQ\n")
+    for page in pdf.pages:
+        rect = Rectangle(page.mediabox)
+        key = (round(rect.width, 2), round(rect.height, 2))
+        
+        if key not in overlays:
+            with Pdf.open(io.BytesIO(_render_watermark(*key, watermark_text, opacity))) as overlay_pdf:
+                overlays[key] = pdf.copy_foreign(overlay_pdf.pages[0].as_form_xobject())
+        
+        overlay = overlays[key]
+        name = _shared_resource_name(page, overlay, Name.XObject, "Fx")
+        page.contents_add(save_state, prepend=True)
+        page.contents_add(restore_state)
+        page.contents_add(pdf.make_stream(
+            page.calc_form_xobject_placement(overlay, name, rect, allow_shrink=True, allow_expand=True)
+        ))
+    return len(overlays)
+
+
+def _add_watermark(
+    pdf_content: FileSource,
+    watermark_text: str,
+    opacity: float = 0.3,
+    incremental: bool = False
+) -> Tuple[FileSource, Dict[str, Any]]:
+    """Add text watermark to PDF (runs in the worker pool)"""
+    try:
+        with DocumentHandle(pdf_content) as document:
+            update = _watch_all_pages(document) if incremental else None
+            overlay_count = _apply_watermark(document.pdf, watermark_text, opacity)
+            output, appended = _save_edits(document, update)
+            total_pages = document.page_count
+        
+        record_pages(total_pages)
+        logger.info(f"Added watermark '{watermark_text}' to PDF ({overlay_count} distinct overlays)")
+        return output, {"incremental": appended}
+        
+    except Exception as e:
+        logger.error(f"Error adding watermark: {e}")
+        raise
+
+
+def _watch_all_pages(document: DocumentHandle) -> IncrementalUpdate:
+    update = document.incremental_update()
+    for page in document.pdf.pages:
+        update.watch(page)
+    return update
+
+
+def _apply_page_numbers(pdf: Pdf, position: str = "bottom-center"):
+    """Stamp "Page i of n" on every page in place"""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    
+    total_pages = len(pdf.pages)
+    
+    # Shared template: one font object and one save/restore pair for every page,
+    # only the text-drawing stream differs per page
+    font = pdf.make_indirect(Dictionary(
+        Type=Name.Font,
+        Subtype=Name.Type1,
+        BaseFont=Name.Helvetica,
+        Encoding=Name.WinAnsiEncoding
+    ))
+    save_state = pdf.make_stream(b"q\n")
+    restore_state = pdf.make_stream(b"\nQ\n")
+    
+    for i, page in enumerate(pdf.pages):
+        rect = Rectangle(page.mediabox)
+        page_text = f"Page {i + 1} of {total_pages}"
+        text_width = stringWidth(page_text, "Helvetica", 10)
+        
+        # Position based on setting
+        y_pos = rect.lly + 30
+        if position == "bottom-center":
+            x_pos = rect.llx + (rect.width - text_width) / 2
+        elif position == "bottom-right":
+            x_pos = rect.urx - 50 - text_width
+        else:  # bottom-left
+            x_pos = rect.llx + 50
+        
+        font_name = _shared_resource_name(page, font, Name.Font, "PgNum")
+        page.contents_add(save_state, prepend=True)
+        page.contents_add(restore_state)
+        page.contents_add(pdf.make_stream(
+            f"q 0 g BT {font_name} 10 Tf {x_pos:.2f} {y_pos:.2f} Td ({page_text}) Tj ET Q\n".encode()
+        ))
+
+
+def _add_page_numbers(
+    pdf_content: FileSource,
+    position: str = "bottom-center",
+    incremental: bool = False
+) -> Tuple[FileSource, Dict[str, Any]]:
+    """Add page numbers to PDF (runs in the worker pool)"""
+    try:
+        with DocumentHandle(pdf_content) as document:
+            update = _watch_all_pages(document) if incremental else None
+            total_pages = document.page_count
+            _apply_page_numbers(document.pdf, position)
+            output, appended = _save_edits(document, update)
+        
+        record_pages(total_pages)
+        logger.info(f"Added page numbers to {total_pages} pages")
+        return output, {"incremental": appended}
+        
+    except Exception as e:
+        logger.error(f"Error adding page numbers: {e}")
+        raise
+
+
+def _extract_tables(pdf_path: str, pages: List[int], engine: str) -> List[ExtractedTable]:
+    """Find the tables on a chunk of pages (runs in the worker pool)"""
+    tables = get_extractor(engine).extract(pdf_path, pages)
+    record_pages(len(pages))
+    return tables
+
+
+def _cell_value(value: Any) -> Any:
+    """Store numbers found as text as numbers, so they can be summed in Excel"""
+    if isinstance(value, str) and NUMBER_PATTERN.fullmatch(value):
+        return float(value) if "." in value else int(value)
+    return value
+
+
+def _tables_to_excel(tables: List[ExtractedTable]) -> bytes:
+    """Write each table to its own sheet of an Excel document (runs in the worker pool)"""
+    try:
+        from openpyxl import Workbook
+        
+        # Rows are streamed to the file instead of building every cell object first
+        workbook = Workbook(write_only=True)
+        if tables:
+            for i, table in enumerate(tables):
+                sheet = workbook.create_sheet(f'Table_{i + 1}'[:31])  # Excel sheet name limit
+                for row in table.rows:
+                    sheet.append([_cell_value(value) for value in row])
+        else:
+            # If no tables found, create a sheet with a message
+            sheet = workbook.create_sheet('Sheet1')
+            sheet.append(['Note'])
+            sheet.append(['No tables found in PDF. This PDF may contain text/images instead of tabular data.'])
+        
+        output = io.BytesIO()
+        workbook.save(output)
+        
+        logger.info(f"Converted PDF to Excel successfully ({len(tables)} tables)")
+        return output.getvalue()
+                
+    except Exception as e:
+        logger.error(f"Error converting PDF to Excel: {e}")
+        raise
+
+
+def _draw_flowables(canv, flowables: Iterator[Any], frame_box: Tuple[float, float, float, float]):
+    """
+    Lay out flowables page by page as they are produced
+    
+    SimpleDocTemplate.build needs the whole story as a list. Placing each
+    flowable with Frame.add, and Frame.split when it runs past the page,
+    keeps only the table being placed in memory.
+    """
+    from reportlab.platypus import Frame
+    from reportlab.platypus.doctemplate import LayoutError
+    
+    frame = Frame(*frame_box)
+    empty = True
+    for flowable in flowables:
+        pending = [flowable]
+        while pending:
+            current = pending.pop(0)
+            if frame.add(current, canv):
+                empty = False
+                continue
+            parts = frame.split(current, canv)
+            if parts:
+                pending[:0] = parts
+            elif empty:
+                raise LayoutError(f"{type(current).__name__} is too large to fit on a page")
+            else:
+                # Page is full: continue on a new one
+                canv.showPage()
+                frame = Frame(*frame_box)
+                empty = True
+                pending.insert(0, current)
+    canv.showPage()
+
+
+def _cell_strings(rows: List[tuple], columns: int) -> np.ndarray:
+    """Cells of a chunk of rows as strings, truncated to EXCEL_CELL_CHARS"""
+    values = np.full((len(rows), columns), None, dtype=object)
+    for i, row in enumerate(rows):
+        values[i, :len(row)] = row[:columns]
+    values[np.equal(values, None)] = ''
+    # Casting to a fixed-width string type converts and truncates every cell in one step
+    return values.astype(f'<U{EXCEL_CELL_CHARS}')
+
+
+def _column_widths(header: np.ndarray, body: np.ndarray, frame_width: float) -> List[float]:
+    """Widths fitting the longest value of each column in the first chunk, scaled to the frame"""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    
+    widths = []
+    for column in range(header.shape[0]):
+        width = stringWidth(str(header[column]), 'Helvetica-Bold', 10)
+        if body.shape[0]:
+            longest = body[np.argmax(np.char.str_len(body[:, column])), column]
+            width = max(width, stringWidth(str(longest), 'Helvetica', 8))
+        widths.append(width + 12)  # default cell padding
+    total = sum(widths)
+    if total > frame_width:
+        widths = [width * frame_width / total for width in widths]
+    return widths
+
+
+def _sheet_flowables(sheet, title_style, table_style, frame_width: float) -> Iterator[Any]:
+    """Title and chunked tables of one worksheet, reading rows as they are needed"""
+    from reportlab.platypus import Paragraph, Spacer, Table
+    from xml.sax.saxutils import escape
+    
+    # Fully empty rows carry no data and would only print as blank lines
+    rows = (row for row in sheet.iter_rows(values_only=True) if any(value is not None for value in row))
+    header_row = next(rows, None)
+    if header_row is None:
+        return
+    
+    chunk_rows = max(1, settings.excel_to_pdf_chunk_rows)
+    columns = max(len(header_row), sheet.max_column or 0)
+    header = _cell_strings([header_row], columns)[0]
+    widths = None
+    
+    while True:
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            break
+        body = _cell_strings(chunk, columns)
+        if widths is None:
+            # Sheets with a header but no data rows are skipped, as before
+            yield Paragraph(f"<b>{escape(str(sheet.title))}</b>", title_style)
+            yield Spacer(1, 12)
+            widths = _column_widths(header, body, frame_width)
+        
+        table = Table([header.tolist()] + body.tolist(), colWidths=widths, repeatRows=1)
+        table.setStyle(table_style)
+        yield table
+    
+    if widths is not None:
+        yield Spacer(1, 24)
+
+
+def _excel_to_pdf(excel_content: FileSource) -> bytes:
+    """Convert Excel document to PDF (runs in the worker pool)"""
+    try:
+        from openpyxl import load_workbook
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.pdfgen import canvas
+        from reportlab.platypus import TableStyle
+        from reportlab.lib.styles import getSampleStyleSheet
+        
+        # Read-only mode streams rows from the XML instead of loading every cell
+        workbook = load_workbook(_as_stream(excel_content), read_only=True, data_only=True)
+        
+        try:
+            # Create PDF
+            output = io.BytesIO()
+            page_width, page_height = landscape(A4)
+            margin = 30
+            frame_box = (margin, margin, page_width - 2 * margin, page_height - 2 * margin)
+            canv = canvas.Canvas(output, pagesize=(page_width, page_height))
+            
+            styles = getSampleStyleSheet()
+            table_style = TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ])
+            
+            flowables = itertools.chain.from_iterable(
+                _sheet_flowables(sheet, styles['Heading2'], table_style, frame_box[2])
+                for sheet in workbook.worksheets
+            )
+            _draw_flowables(canv, flowables, frame_box)
+            canv.save()
+        finally:
+            workbook.close()
+        
+        logger.info("Converted Excel to PDF successfully")
+        return output.getvalue()
+        
+    except Exception as e:
+        logger.error(f"Error converting Excel to PDF: {e}")
+        raise
+
+
+def _word_to_pdf(word_content: FileSource) -> bytes:
+    """Convert Word document to PDF (runs in the worker pool)"""
+    try:
+        from docx import Document
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib import colors
+        from reportlab.lib.units import inch
+        
+        # Read Word document
+        doc = Document(_as_stream(word_content))
+        
+        # Create PDF
+        output = io.BytesIO()
+        pdf = SimpleDocTemplate(output, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+        
+        styles = getSampleStyleSheet()
+        
+        # Create custom styles
+        heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading1'],
+            fontSize=16,
+            spaceAfter=12
+        )
+        
+        normal_style = ParagraphStyle(
+            'CustomNormal',
+            parent=styles['Normal'],
+            fontSize=11,
+            spaceAfter=6,
+            leading=14
+        )
+        
+        elements = []
+        
+        for para in doc.paragraphs:
+            text = para.text.strip()
+            if not text:
+                elements.append(Spacer(1, 6))
+                continue
+            
+            # Check if it's a heading
+            if para.style.name.startswith('Heading'):
+                elements.append(Paragraph(text, heading_style))
+            else:
+                elements.append(Paragraph(text, normal_style))
+        
+        # Handle tables
+        for table in doc.tables:
+            table_data = []
+            for row in table.rows:
+                row_data = [cell.text[:100] for cell in row.cells]  # Limit cell text
+                table_data.append(row_data)
+            
+            if table_data:
+                t = Table(table_data)
+                t.setStyle(TableStyle([
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                    ('FONTSIZE', (0, 0), (-1, -1), 9),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ]))
+                elements.append(Spacer(1, 12))
+                elements.append(t)
+                elements.append(Spacer(1, 12))
+        
+        if not elements:
+            elements.append(Paragraph("Empty document", normal_style))
+        
+        pdf.build(elements)
+        output.seek(0)
+        
+        logger.info("Converted Word to PDF successfully")
+        return output.getvalue()
+        
+    except Exception as e:
+        logger.error(f"Error converting Word to PDF: {e}")
+        raise
+
+
+def _apply_pipeline_step(document: DocumentHandle, step: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one validated pipeline step in place; returns step details for the report"""
+    op = step["op"]
+    pdf = document.pdf
+    
+    if op == "rotate":
+        page_indices = document.resolve_pages(step["pages"]) if step["pages"] else range(document.page_count)
+        for i in page_indices:
+            pdf.pages[i].rotate(step["rotation"], relative=True)
+        return {}
+    
+    if op == "reorder":
+        document.select_pages(document.check_indices([page - 1 for page in step["page_order"]]))
+        return {}
+    
+    if op == "split":
+        document.select_pages(document.resolve_pages(step["pages"]))
+        return {}
+    
+    if op == "add-watermark":
+        _apply_watermark(pdf, step["watermark_text"], step["opacity"])
+        return {}
+    
+    if op == "add-page-numbers":
+        _apply_page_numbers(pdf, step["position"])
+        return {}
+    
+    if op == "compress":
+        return {"images": downsample_images(pdf, step["quality"])}
+    
+    raise PipelineError(f"Unknown op {op!r}")
+
+
+def _run_pipeline(pdf_content: FileSource, steps: List[Dict[str, Any]]) -> Tuple[bytes, Dict[str, Any]]:
+    """Apply a sequence of operations to one parsed document and save once (runs in the worker pool)"""
+    try:
+        with DocumentHandle(pdf_content) as document:
+            record_pages(document.page_count)
+            save_options: Dict[str, Any] = {}
+            report = []
+            
+            for index, step in enumerate(steps):
+                try:
+                    details = _apply_pipeline_step(document, step)
+                except PageRangeError as e:
+                    # Page ranges are only known to be valid against the page count at this step
+                    raise PipelineError(f"Step {index + 1} ({step['op']}): {e}") from None
+                if step["op"] == "compress":
+                    save_options = COMPRESSION_SAVE_OPTIONS[step["quality"]]
+                report.append({"op": step["op"], "pages": document.page_count, **details})
+            
+            output = document.save(**save_options)
+            total_pages = document.page_count
+        
+        logger.info(f"Ran {len(steps)}-step pipeline: {' -> '.join(step['op'] for step in steps)}")
+        return output, {"steps": report, "total_pages": total_pages}
+        
+    except PipelineError:
+        raise
+    except Exception as e:
+        logger.error(f"Error running pipeline: {e}")
+        raise
+
+
+def _payload_size(value: Any) -> int:
+    """Bytes in an operation input or output (bytes, file path, list, or result tuple)"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return os.path.getsize(value) if os.path.isfile(value) else 0
+    if isinstance(value, list):
+        return sum(_payload_size(item) for item in value)
+    if isinstance(value, tuple) and value:
+        return _payload_size(value[0])
+    return 0
+
+
+def _instrumented(func: Callable) -> Callable:
+    """Record latency, payload sizes and errors of a PDFService method"""
+    operation = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if args:
+            pdf_input_bytes_total.inc(_payload_size(args[0]), operation=operation)
+        start = time.perf_counter()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            record_error("pdf_service", operation, e)
+            raise
+        finally:
+            pdf_operation_duration_seconds.observe(time.perf_counter() - start, operation=operation)
+        pdf_output_bytes_total.inc(_payload_size(result), operation=operation)
+        return result
+    return wrapper
+
 
 class PDFService:
     """Service for PDF manipulation operations"""
     
     @staticmethod
-    async def merge_pdfs(pdf_files: List[bytes]) -> bytes:
+    @_instrumented
+    async def merge_pdfs(pdf_files: List[FileSource]) -> bytes:
         """
         Merge multiple PDF files into one
         
         Args:
-            pdf_files: List of PDF file contents as bytes
+            pdf_files: List of PDF file contents as bytes or file paths
             
         Returns:
             Merged PDF as bytes
         """
-        try:
-            writer = PdfWriter()
-            
-            for pdf_content in pdf_files:
-                reader = PdfReader(io.BytesIO(pdf_content))
-                for page in reader.pages:
-                    writer.add_page(page)
-            
-            # Write to bytes
-            output = io.BytesIO()
-            writer.write(output)
-            output.seek(0)
-            
-            logger.info(f"Merged {len(pdf_files)} PDFs successfully")
-            return output.getvalue()
-            
-        except Exception as e:
-            logger.error(f"Error merging PDFs: {e}")
-            raise
+        return await worker_pool.run("merge_pdfs", _merge_pdfs, pdf_files)
     
     @staticmethod
-    async def split_pdf(pdf_content: bytes, page_ranges: List[int]) -> bytes:
+    @_instrumented
+    async def split_pdf(pdf_content: FileSource, pages: Union[str, List[int]]) -> Tuple[bytes, Dict[str, Any]]:
         """
         Extract specific pages from PDF
         
+        The document is parsed once in the worker; page ranges are validated
+        against it there.
+        
         Args:
-            pdf_content: PDF file content as bytes
-            page_ranges: List of page indices (0-indexed) to extract
+            pdf_content: PDF file content as bytes or path to the file
+            pages: Page ranges like "1-3,5" (1-indexed), or page indices (0-indexed)
             
         Returns:
-            New PDF with selected pages as bytes
+            Tuple of the new PDF as bytes and page counts
+            
+        Raises:
+            PageRangeError: A requested page doesn't exist
         """
-        try:
-            reader = PdfReader(io.BytesIO(pdf_content))
-            writer = PdfWriter()
+        return await worker_pool.run("split_pdf", _split_pdf, pdf_content, pages)
+    
+    @staticmethod
+    @_instrumented
+    async def split_pdf_to_files(
+        pdf_content: FileSource,
+        pages: Optional[str] = None,
+        every: Optional[int] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Split a PDF into several files (returns ZIP file with the parts)
+        
+        Either one file per range in pages, or one file per every pages. Parts
+        are written in chunks across the worker pool, each chunk opening the
+        source once, and moved into a ZIP file on disk as each chunk finishes.
+        
+        Args:
+            pdf_content: PDF file content as bytes or path to the file
+            pages: Page ranges like "1-3,4-10,11"; each range becomes one file
+            every: Number of pages per file, used when pages is not given
             
-            for page_num in page_ranges:
-                if 0 <= page_num < len(reader.pages):
-                    writer.add_page(reader.pages[page_num])
+        Returns:
+            Tuple of the ZIP file path (the caller removes it) and the page and file counts
             
-            output = io.BytesIO()
-            writer.write(output)
-            output.seek(0)
+        Raises:
+            PageRangeError: A requested page doesn't exist
+        """
+        fd, zip_path = tempfile.mkstemp(suffix=".zip")
+        os.close(fd)
+        parts_dir = tempfile.mkdtemp(prefix="split-")
+        
+        try:
+            with _source_path(pdf_content, ".pdf") as pdf_path:
+                page_count = await asyncio.to_thread(_count_pages, pdf_path)
+                if pages is not None:
+                    try:
+                        groups = parse_page_range_groups(pages, page_count)
+                    except ValueError as e:
+                        raise PageRangeError(str(e)) from None
+                else:
+                    groups = [list(range(first, min(first + every, page_count))) for first in range(0, page_count, every)]
+                
+                width = len(str(len(groups)))
+                parts = [
+                    (f"part_{number:0{width}d}_{_page_label(group)}.pdf", group)
+                    for number, group in enumerate(groups, 1)
+                ]
+                chunk_parts = max(1, settings.split_parts_per_task)
+                chunks = [
+                    (pdf_path, parts[first:first + chunk_parts], parts_dir)
+                    for first in range(0, len(parts), chunk_parts)
+                ]
+                
+                with zipfile.ZipFile(zip_path, 'w') as zip_file:
+                    results = worker_pool.map("split_pdf", _write_split_parts, chunks)
+                    async with aclosing(results):
+                        async for paths in results:
+                            await asyncio.to_thread(_move_to_zip, zip_file, paths)
             
-            logger.info(f"Split PDF with {len(page_ranges)} pages")
-            return output.getvalue()
+            logger.info(f"Split PDF into {len(parts)} files")
+            return zip_path, {"original_pages": page_count, "files": len(parts)}
             
         except Exception as e:
-            logger.error(f"Error splitting PDF: {e}")
+            if not isinstance(e, PageRangeError):
+                logger.error(f"Error splitting PDF into files: {e}")
+            if os.path.exists(zip_path):
+                os.remove(zip_path)
             raise
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
     
     @staticmethod
-    async def compress_pdf(pdf_content: bytes, quality: str = "medium") -> bytes:
+    @_instrumented
+    async def compress_pdf(pdf_content: FileSource, quality: str = "medium") -> Tuple[bytes, Dict[str, Any]]:
         """
         Compress PDF file using pikepdf
         
+        Images are downsampled to the profile's target resolution and
+        re-encoded before the document is saved with compressed streams.
+        
         Args:
-            pdf_content: PDF file content as bytes
+            pdf_content: PDF file content as bytes or path to the file
             quality: Compression quality (low, medium, high)
             
         Returns:
-            Compressed PDF as bytes
+            Tuple of compressed PDF as bytes and the image savings report
         """
-        try:
-            from pikepdf import ObjectStreamMode
-            
-            # Quality settings using proper enum values
-            quality_settings = {
-                "low": {"compress_streams": True, "preserve_pdfa": False, "object_stream_mode": ObjectStreamMode.generate},
-                "medium": {"compress_streams": True, "preserve_pdfa": True, "object_stream_mode": ObjectStreamMode.preserve},
-                "high": {"compress_streams": True, "preserve_pdfa": True, "object_stream_mode": ObjectStreamMode.disable}
-            }
-            
-            settings = quality_settings.get(quality, quality_settings["medium"])
-            
-            # Open and compress
-            pdf = Pdf.open(io.BytesIO(pdf_content))
-            output = io.BytesIO()
-            
-            pdf.save(
-                output,
-                compress_streams=settings["compress_streams"],
-                preserve_pdfa=settings["preserve_pdfa"],
-                object_stream_mode=settings["object_stream_mode"]
-            )
-            
-            output.seek(0)
-            compressed_data = output.getvalue()
-            
-            original_size = len(pdf_content)
-            compressed_size = len(compressed_data)
-            reduction = ((original_size - compressed_size) / original_size) * 100
-            
-            logger.info(f"Compressed PDF: {reduction:.1f}% reduction")
-            return compressed_data
-            
-        except Exception as e:
-            logger.error(f"Error compressing PDF: {e}")
-            raise
+        return await worker_pool.run("compress_pdf", _compress_pdf, pdf_content, quality)
     
     @staticmethod
-    async def rotate_pdf(pdf_content: bytes, rotation: int, pages: List[int] = None) -> bytes:
+    @_instrumented
+    async def rotate_pdf(
+        pdf_content: FileSource,
+        rotation: int,
+        pages: Union[str, List[int], None] = None,
+        incremental: bool = False
+    ) -> Tuple[FileSource, Dict[str, Any]]:
         """
         Rotate PDF pages
         
         Args:
-            pdf_content: PDF file content as bytes
+            pdf_content: PDF file content as bytes or path to the file
             rotation: Rotation angle (90, 180, 270)
-            pages: List of page indices to rotate (None = all pages)
+            pages: Page ranges like "1-3,5" (1-indexed), page indices (0-indexed), or None for all pages
+            incremental: Append the changed pages to the original instead of rewriting it
             
         Returns:
-            Rotated PDF as bytes
-        """
-        try:
-            reader = PdfReader(io.BytesIO(pdf_content))
-            writer = PdfWriter()
-            
-            for i, page in enumerate(reader.pages):
-                if pages is None or i in pages:
-                    page.rotate(rotation)
-                writer.add_page(page)
+            Tuple of the rotated PDF (bytes, or the path of a file for incremental
+            saves) and page counts with whether the save was incremental
             
-            output = io.BytesIO()
-            writer.write(output)
-            output.seek(0)
-            
-            logger.info(f"Rotated PDF by {rotation} degrees")
-            return output.getvalue()
-            
-        except Exception as e:
-            logger.error(f"Error rotating PDF: {e}")
-            raise
+        Raises:
+            PageRangeError: A requested page doesn't exist
+        """
+        return await worker_pool.run("rotate_pdf", _rotate_pdf, pdf_content, rotation, pages, incremental)
     
     @staticmethod
-    async def reorder_pdf(pdf_content: bytes, page_order: List[int]) -> bytes:
+    @_instrumented
+    async def reorder_pdf(pdf_content: FileSource, page_order: List[int]) -> Tuple[bytes, Dict[str, Any]]:
         """
         Reorder PDF pages
         
         Args:
-            pdf_content: PDF file content as bytes
-            page_order: New order of pages (0-indexed)
+            pdf_content: PDF file content as bytes or path to the file
+            page_order: Page indices (0-indexed) in the new order
             
         Returns:
-            Reordered PDF as bytes
-        """
-        try:
-            reader = PdfReader(io.BytesIO(pdf_content))
-            writer = PdfWriter()
-            
-            for page_num in page_order:
-                if 0 <= page_num < len(reader.pages):
-                    writer.add_page(reader.pages[page_num])
+            Tuple of the reordered PDF as bytes and the original page count
             
-            output = io.BytesIO()
-            writer.write(output)
-            output.seek(0)
+        Raises:
+            PageRangeError: A page index doesn't exist
+        """
+        return await worker_pool.run("reorder_pdf", _reorder_pdf, pdf_content, page_order)
+    
+    @staticmethod
+    @_instrumented
+    async def run_pipeline(pdf_content: FileSource, steps: List[Dict[str, Any]]) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Apply several operations to one document, parsing and saving it once
+        
+        Args:
+            pdf_content: PDF file content as bytes or path to the file
+            steps: Steps validated by app.services.pipeline.parse_pipeline
             
-            logger.info(f"Reordered PDF with {len(page_order)} pages")
-            return output.getvalue()
+        Returns:
+            Tuple of the resulting PDF as bytes and a per-step report
             
-        except Exception as e:
-            logger.error(f"Error reordering PDF: {e}")
-            raise
+        Raises:
+            PipelineError: A step's pages don't exist at that point of the pipeline
+        """
+        return await worker_pool.run("run_pipeline", _run_pipeline, pdf_content, steps)
     
     @staticmethod
-    def get_pdf_info(pdf_content: bytes) -> dict:
+    @_instrumented
+    async def get_pdf_info(pdf_content: FileSource) -> dict:
         """
         Get PDF metadata
         
         Args:
-            pdf_content: PDF file content as bytes
+            pdf_content: PDF file content as bytes or path to the file
             
         Returns:
             Dictionary with PDF information
         """
-        try:
-            reader = PdfReader(io.BytesIO(pdf_content))
-            
-            return {
-                "pages": len(reader.pages),
-                "size_bytes": len(pdf_content),
-                "metadata": reader.metadata if reader.metadata else {}
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting PDF info: {e}")
-            raise
-
+        return await worker_pool.run("get_pdf_info", _get_pdf_info, pdf_content)
+    
     @staticmethod
-    async def pdf_to_word(pdf_content: bytes) -> bytes:
+    @_instrumented
+    async def pdf_to_word(pdf_content: FileSource, pages: Optional[str] = None) -> bytes:
         """
         Convert PDF to Word document (DOCX)
         
+        Documents longer than PDF_TO_WORD_CHUNK_PAGES are converted in chunks of pages
+        across the worker pool, and the chunk documents are then joined in page
+        order. pdf2docx gives every page its own section, so chunks join at
+        section boundaries and keep their page sizes and margins.
+        
         Args:
-            pdf_content: PDF file content as bytes
+            pdf_content: PDF file content as bytes or path to the file
+            pages: Optional page ranges (e.g., "1-3,5"). If not provided, converts all pages
             
         Returns:
             Word document as bytes
+            
+        Raises:
+            PageRangeError: A requested page doesn't exist
         """
+        output_dir = tempfile.mkdtemp(prefix="docx-")
+        
         try:
-            from pdf2docx import Converter
-            import tempfile
-            import os
-            
-            # Create temporary files for conversion
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as pdf_temp:
-                pdf_temp.write(pdf_content)
-                pdf_path = pdf_temp.name
-            
-            docx_path = pdf_path.replace('.pdf', '.docx')
-            
-            try:
-                # Convert PDF to DOCX
-                cv = Converter(pdf_path)
-                cv.convert(docx_path)
-                cv.close()
+            with _source_path(pdf_content, ".pdf") as pdf_path:
+                page_count = await asyncio.to_thread(_count_pages, pdf_path)
+                if pages is not None:
+                    try:
+                        indices = parse_page_ranges(pages, page_count)
+                    except ValueError as e:
+                        raise PageRangeError(str(e)) from None
+                else:
+                    indices = list(range(page_count))
                 
-                # Read the output file
-                with open(docx_path, 'rb') as f:
-                    docx_content = f.read()
+                chunk_pages = max(1, settings.pdf_to_word_chunk_pages)
+                if len(indices) <= chunk_pages:
+                    return await worker_pool.run(
+                        "pdf_to_word", _pdf_to_word, pdf_path, None if pages is None else indices
+                    )
                 
-                logger.info("Converted PDF to Word successfully")
-                return docx_content
+                chunks = [
+                    (pdf_path, indices[first:first + chunk_pages], output_dir)
+                    for first in range(0, len(indices), chunk_pages)
+                ]
+                paths: List[str] = []
+                results = worker_pool.map("pdf_to_word", _convert_to_docx, chunks)
+                async with aclosing(results):
+                    async for path in results:
+                        paths.append(path)
                 
-            finally:
-                # Cleanup temp files
-                if os.path.exists(pdf_path):
-                    os.remove(pdf_path)
-                if os.path.exists(docx_path):
-                    os.remove(docx_path)
-                    
+                docx_content = await worker_pool.run("pdf_to_word", _merge_docx_parts, paths)
+            
+            logger.info(f"Converted {len(indices)} pages to Word in {len(chunks)} chunks")
+            return docx_content
+            
         except Exception as e:
-            logger.error(f"Error converting PDF to Word: {e}")
+            if not isinstance(e, PageRangeError):
+                logger.error(f"Error converting PDF to Word: {e}")
             raise
-
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+    
     @staticmethod
-    async def pdf_to_images(pdf_content: bytes, image_format: str = "jpeg", dpi: int = 200) -> bytes:
+    @_instrumented
+    async def pdf_to_images(pdf_content: FileSource, image_format: str = "jpeg", dpi: int = 200) -> str:
         """
         Convert PDF pages to images (returns ZIP file with images)
         
+        Pages are rendered in chunks across the worker pool and appended to a
+        ZIP file on disk as each chunk finishes, so memory use does not grow
+        with the page count.
+        
         Args:
-            pdf_content: PDF file content as bytes
+            pdf_content: PDF file content as bytes or path to the file
             image_format: Output format (jpeg, png)
             dpi: Resolution in dots per inch
             
         Returns:
-            ZIP file containing images as bytes
+            Path of the ZIP file containing the images (the caller removes it)
         """
+        ext = 'png' if image_format.lower() == "png" else 'jpg'
+        fd, zip_path = tempfile.mkstemp(suffix=".zip")
+        os.close(fd)
+        render_dir = tempfile.mkdtemp(prefix="pdf2img-")
+        
         try:
-            from pdf2image import convert_from_bytes
-            
-            # Convert PDF to images
-            images = convert_from_bytes(pdf_content, dpi=dpi)
-            
-            # Create ZIP file with images
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for i, image in enumerate(images):
-                    img_buffer = io.BytesIO()
-                    if image_format.lower() == "png":
-                        image.save(img_buffer, format='PNG')
-                        ext = 'png'
-                    else:
-                        image.save(img_buffer, format='JPEG', quality=95)
-                        ext = 'jpg'
-                    img_buffer.seek(0)
-                    zip_file.writestr(f'page_{i + 1}.{ext}', img_buffer.getvalue())
-            
-            zip_buffer.seek(0)
-            logger.info(f"Converted PDF to {len(images)} images")
-            return zip_buffer.getvalue()
+            with _source_path(pdf_content, ".pdf") as pdf_path:
+                page_count = await asyncio.to_thread(_count_pages, pdf_path)
+                chunk_pages = max(1, settings.pdf_to_images_chunk_pages)
+                chunks = [
+                    (pdf_path, first, min(first + chunk_pages - 1, page_count), image_format, dpi, render_dir)
+                    for first in range(1, page_count + 1, chunk_pages)
+                ]
+                
+                with zipfile.ZipFile(zip_path, 'w') as zip_file:
+                    results = worker_pool.map("pdf_to_images", _render_page_range, chunks)
+                    async with aclosing(results):
+                        index = 0
+                        async for paths in results:
+                            await asyncio.to_thread(_append_to_zip, zip_file, paths, chunks[index][1], ext)
+                            index += 1
+            
+            logger.info(f"Converted PDF to {page_count} images")
+            return zip_path
             
         except Exception as e:
             logger.error(f"Error converting PDF to images: {e}")
+            if os.path.exists(zip_path):
+                os.remove(zip_path)
             raise
-
+        finally:
+            shutil.rmtree(render_dir, ignore_errors=True)
+    
     @staticmethod
-    async def images_to_pdf(image_contents: List[bytes]) -> bytes:
+    @_instrumented
+    async def render_thumbnails(pdf_content: FileSource, width: int) -> Tuple[str, List[str]]:
         """
-        Convert images to PDF
+        Render every page as a small JPEG preview
+        
+        poppler scales each page straight to the requested width, and pages are
+        rendered in chunks across the worker pool.
         
         Args:
-            image_contents: List of image file contents as bytes
+            pdf_content: PDF file content as bytes or path to the file
+            width: Thumbnail width in pixels (height keeps the aspect ratio)
             
         Returns:
-            PDF file as bytes
+            Tuple of the directory holding the images (the caller removes it)
+            and the image paths in page order
         """
+        output_dir = tempfile.mkdtemp(prefix="thumbs-")
+        
         try:
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.pdfgen import canvas
-            
-            output = io.BytesIO()
-            c = canvas.Canvas(output, pagesize=A4)
-            a4_width, a4_height = A4
-            
-            for img_content in image_contents:
-                # Open image with PIL
-                img = Image.open(io.BytesIO(img_content))
-                
-                # Convert to RGB if necessary
-                if img.mode in ('RGBA', 'P'):
-                    img = img.convert('RGB')
-                
-                # Get image dimensions
-                img_width, img_height = img.size
-                
-                # Calculate scaling to fit A4 page while maintaining aspect ratio
-                width_ratio = a4_width / img_width
-                height_ratio = a4_height / img_height
-                scale = min(width_ratio, height_ratio) * 0.95  # 5% margin
-                
-                new_width = img_width * scale
-                new_height = img_height * scale
-                
-                # Center the image on the page
-                x = (a4_width - new_width) / 2
-                y = (a4_height - new_height) / 2
-                
-                # Save image to temporary buffer
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format='JPEG', quality=95)
-                img_buffer.seek(0)
-                
-                # Create ImageReader from buffer
-                from reportlab.lib.utils import ImageReader
-                img_reader = ImageReader(img_buffer)
+            with _source_path(pdf_content, ".pdf") as pdf_path:
+                page_count = await asyncio.to_thread(_count_pages, pdf_path)
+                chunk_pages = max(1, settings.thumbnail_chunk_pages)
+                chunks = [
+                    (pdf_path, first, min(first + chunk_pages - 1, page_count), "jpeg", THUMBNAIL_DPI, output_dir, width)
+                    for first in range(1, page_count + 1, chunk_pages)
+                ]
                 
-                # Draw image on canvas
-                c.drawImage(img_reader, x, y, new_width, new_height)
-                c.showPage()
+                paths: List[str] = []
+                results = worker_pool.map("thumbnails", _render_page_range, chunks)
+                async with aclosing(results):
+                    async for chunk_paths in results:
+                        paths.extend(chunk_paths)
             
-            c.save()
-            output.seek(0)
-            
-            logger.info(f"Converted {len(image_contents)} images to PDF")
-            return output.getvalue()
+            logger.info(f"Rendered {len(paths)} thumbnails at {width}px")
+            return output_dir, paths
             
         except Exception as e:
-            logger.error(f"Error converting images to PDF: {e}")
+            logger.error(f"Error rendering thumbnails: {e}")
+            shutil.rmtree(output_dir, ignore_errors=True)
             raise
-
+    
+    @staticmethod
+    @_instrumented
+    async def images_to_pdf(image_contents: List[FileSource]) -> bytes:
+        """
+        Convert images to PDF
+        
+        Args:
+            image_contents: List of image file contents as bytes or file paths
+            
+        Returns:
+            PDF file as bytes
+        """
+        return await worker_pool.run("images_to_pdf", _images_to_pdf, image_contents)
+    
     @staticmethod
-    async def add_watermark(pdf_content: bytes, watermark_text: str, opacity: float = 0.3) -> bytes:
+    @_instrumented
+    async def add_watermark(
+        pdf_content: FileSource,
+        watermark_text: str,
+        opacity: float = 0.3,
+        incremental: bool = False
+    ) -> Tuple[FileSource, Dict[str, Any]]:
         """
         Add text watermark to PDF
         
         Args:
-            pdf_content: PDF file content as bytes
+            pdf_content: PDF file content as bytes or path to the file
             watermark_text: Text to use as watermark
             opacity: Watermark opacity (0.0 to 1.0)
+            incremental: Append the changed pages to the original instead of rewriting it
             
         Returns:
-            Watermarked PDF as bytes
+            Tuple of the watermarked PDF (bytes, or the path of a file for
+            incremental saves) and whether the save was incremental
         """
-        try:
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import letter
-            from reportlab.lib.colors import Color
-            
-            reader = PdfReader(io.BytesIO(pdf_content))
-            writer = PdfWriter()
-            
-            for page in reader.pages:
-                # Get page dimensions
-                page_width = float(page.mediabox.width)
-                page_height = float(page.mediabox.height)
-                
-                # Create watermark
-                watermark_buffer = io.BytesIO()
-                c = canvas.Canvas(watermark_buffer, pagesize=(page_width, page_height))
-                
-                # Set watermark properties
-                c.setFillColor(Color(0.5, 0.5, 0.5, alpha=opacity))
-                c.setFont("Helvetica-Bold", 50)
-                
-                # Rotate and position watermark
-                c.saveState()
-                c.translate(page_width / 2, page_height / 2)
-                c.rotate(45)
-                c.drawCentredString(0, 0, watermark_text)
-                c.restoreState()
-                
-                c.save()
-                watermark_buffer.seek(0)
-                
-                # Merge watermark with page
-                watermark_reader = PdfReader(watermark_buffer)
-                page.merge_page(watermark_reader.pages[0])
-                writer.add_page(page)
-            
-            output = io.BytesIO()
-            writer.write(output)
-            output.seek(0)
-            
-            logger.info(f"Added watermark '{watermark_text}' to PDF")
-            return output.getvalue()
-            
-        except Exception as e:
-            logger.error(f"Error adding watermark: {e}")
-            raise
-
+        return await worker_pool.run("add_watermark", _add_watermark, pdf_content, watermark_text, opacity, incremental)
+    
     @staticmethod
-    async def add_page_numbers(pdf_content: bytes, position: str = "bottom-center") -> bytes:
+    @_instrumented
+    async def add_page_numbers(
+        pdf_content: FileSource,
+        position: str = "bottom-center",
+        incremental: bool = False
+    ) -> Tuple[FileSource, Dict[str, Any]]:
         """
         Add page numbers to PDF
         
         Args:
-            pdf_content: PDF file content as bytes
+            pdf_content: PDF file content as bytes or path to the file
             position: Position of page numbers (bottom-center, bottom-right, bottom-left)
+            incremental: Append the changed pages to the original instead of rewriting it
             
         Returns:
-            PDF with page numbers as bytes
+            Tuple of the numbered PDF (bytes, or the path of a file for
+            incremental saves) and whether the save was incremental
         """
-        try:
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.colors import black
-            
-            reader = PdfReader(io.BytesIO(pdf_content))
-            writer = PdfWriter()
-            total_pages = len(reader.pages)
-            
-            for i, page in enumerate(reader.pages):
-                page_width = float(page.mediabox.width)
-                page_height = float(page.mediabox.height)
-                
-                # Create page number overlay
-                number_buffer = io.BytesIO()
-                c = canvas.Canvas(number_buffer, pagesize=(page_width, page_height))
-                
-                c.setFillColor(black)
-                c.setFont("Helvetica", 10)
-                
-                page_text = f"Page {i + 1} of {total_pages}"
-                
-                # Position based on setting
-                y_pos = 30
-                if position == "bottom-center":
-                    x_pos = page_width / 2
-                    c.drawCentredString(x_pos, y_pos, page_text)
-                elif position == "bottom-right":
-                    x_pos = page_width - 50
-                    c.drawRightString(x_pos, y_pos, page_text)
-                else:  # bottom-left
-                    x_pos = 50
-                    c.drawString(x_pos, y_pos, page_text)
-                
-                c.save()
-                number_buffer.seek(0)
-                
-                # Merge page number with page
-                number_reader = PdfReader(number_buffer)
-                page.merge_page(number_reader.pages[0])
-                writer.add_page(page)
-            
-            output = io.BytesIO()
-            writer.write(output)
-            output.seek(0)
-            
-            logger.info(f"Added page numbers to {total_pages} pages")
-            return output.getvalue()
-            
-        except Exception as e:
-            logger.error(f"Error adding page numbers: {e}")
-            raise
-
+        return await worker_pool.run("add_page_numbers", _add_page_numbers, pdf_content, position, incremental)
+    
     @staticmethod
-    async def pdf_to_excel(pdf_content: bytes) -> bytes:
+    @_instrumented
+    async def pdf_to_excel(pdf_content: FileSource, engine: Optional[str] = None) -> bytes:
         """
         Convert PDF tables to Excel document (XLSX)
         
+        Pages are searched for tables in chunks across the worker pool. Each
+        worker keeps its extractor between requests, so the tabula engine's
+        JVM starts once per worker instead of once per request.
+        
         Args:
-            pdf_content: PDF file content as bytes
+            pdf_content: PDF file content as bytes or path to the file
+            engine: Table engine ("auto", "tabula" or "text"), defaults to TABLE_ENGINE
             
         Returns:
             Excel document as bytes
-        """
-        try:
-            import tempfile
-            import os
-            import pandas as pd
-            from openpyxl import Workbook
             
-            # Create temporary PDF file
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as pdf_temp:
-                pdf_temp.write(pdf_content)
-                pdf_path = pdf_temp.name
-            
-            xlsx_path = pdf_path.replace('.pdf', '.xlsx')
-            
-            try:
-                # Try to extract tables using tabula
-                try:
-                    import tabula
-                    tables = tabula.read_pdf(pdf_path, pages='all', multiple_tables=True)
-                except Exception:
-                    tables = []
-                
-                # Create Excel workbook
-                with pd.ExcelWriter(xlsx_path, engine='openpyxl') as writer:
-                    if tables and len(tables) > 0:
-                        for i, table in enumerate(tables):
-                            if not table.empty:
-                                sheet_name = f'Table_{i + 1}'[:31]  # Excel sheet name limit
-                                table.to_excel(writer, sheet_name=sheet_name, index=False)
-                    else:
-                        # If no tables found, create empty sheet with message
-                        df = pd.DataFrame({'Note': ['No tables found in PDF. This PDF may contain text/images instead of tabular data.']})
-                        df.to_excel(writer, sheet_name='Sheet1', index=False)
-                
-                # Read the output file
-                with open(xlsx_path, 'rb') as f:
-                    xlsx_content = f.read()
-                
-                logger.info("Converted PDF to Excel successfully")
-                return xlsx_content
-                
-            finally:
-                # Cleanup temp files
-                if os.path.exists(pdf_path):
-                    os.remove(pdf_path)
-                if os.path.exists(xlsx_path):
-                    os.remove(xlsx_path)
-                    
-        except Exception as e:
-            logger.error(f"Error converting PDF to Excel: {e}")
-            raise
-
+        Raises:
+            TableEngineUnavailableError: The requested engine can't run on this host
+        """
+        engine = resolve_engine(engine or settings.table_engine)
+        
+        with _source_path(pdf_content, ".pdf") as pdf_path:
+            page_count = await asyncio.to_thread(_count_pages, pdf_path)
+            chunk_pages = max(1, settings.pdf_to_excel_chunk_pages)
+            chunks = [
+                (pdf_path, list(range(first, min(first + chunk_pages, page_count + 1))), engine)
+                for first in range(1, page_count + 1, chunk_pages)
+            ]
+            
+            tables: List[ExtractedTable] = []
+            results = worker_pool.map("pdf_to_excel", _extract_tables, chunks)
+            async with aclosing(results):
+                async for chunk_tables in results:
+                    tables.extend(chunk_tables)
+        
+        logger.info(f"Found {len(tables)} tables on {page_count} pages with the {engine} engine")
+        return await worker_pool.run("pdf_to_excel", _tables_to_excel, tables)
+    
     @staticmethod
-    async def excel_to_pdf(excel_content: bytes) -> bytes:
+    @_instrumented
+    async def excel_to_pdf(excel_content: FileSource) -> bytes:
         """
         Convert Excel document to PDF
         
         Args:
-            excel_content: Excel file content as bytes
+            excel_content: Excel file content as bytes or path to the file
             
         Returns:
             PDF file as bytes
         """
-        try:
-            import pandas as pd
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import A4, landscape
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet
-            
-            # Read Excel file
-            excel_file = io.BytesIO(excel_content)
-            xlsx = pd.ExcelFile(excel_file, engine='openpyxl')
-            
-            # Create PDF
-            output = io.BytesIO()
-            doc = SimpleDocTemplate(output, pagesize=landscape(A4), rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
-            
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            for sheet_name in xlsx.sheet_names:
-                df = pd.read_excel(xlsx, sheet_name=sheet_name)
-                
-                if df.empty:
-                    continue
-                
-                # Add sheet title
-                elements.append(Paragraph(f"<b>{sheet_name}</b>", styles['Heading2']))
-                elements.append(Spacer(1, 12))
-                
-                # Prepare table data
-                data = [df.columns.tolist()] + df.values.tolist()
-                
-                # Convert all values to strings and truncate if too long
-                data = [[str(cell)[:50] if cell is not None else '' for cell in row] for row in data]
-                
-                # Create table
-                table = Table(data)
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ]))
-                
-                elements.append(table)
-                elements.append(Spacer(1, 24))
-            
-            doc.build(elements)
-            output.seek(0)
-            
-            logger.info("Converted Excel to PDF successfully")
-            return output.getvalue()
-            
-        except Exception as e:
-            logger.error(f"Error converting Excel to PDF: {e}")
-            raise
-
+        return await worker_pool.run("excel_to_pdf", _excel_to_pdf, excel_content)
+    
     @staticmethod
-    async def word_to_pdf(word_content: bytes) -> bytes:
+    @_instrumented
+    async def word_to_pdf(word_content: FileSource) -> bytes:
         """
         Convert Word document to PDF
         
         Args:
-            word_content: Word file content as bytes
+            word_content: Word file content as bytes or path to the file
             
         Returns:
             PDF file as bytes
         """
-        try:
-            from docx import Document
-            from reportlab.lib.pagesizes import A4
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib import colors
-            from reportlab.lib.units import inch
-            
-            # Read Word document
-            doc = Document(io.BytesIO(word_content))
-            
-            # Create PDF
-            output = io.BytesIO()
-            pdf = SimpleDocTemplate(output, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
-            
-            styles = getSampleStyleSheet()
-            
-            # Create custom styles
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=12
-            )
-            
-            normal_style = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                fontSize=11,
-                spaceAfter=6,
-                leading=14
-            )
-            
-            elements = []
-            
-            for para in doc.paragraphs:
-                text = para.text.strip()
-                if not text:
-                    elements.append(Spacer(1, 6))
-                    continue
-                
-                # Check if it's a heading
-                if para.style.name.startswith('Heading'):
-                    elements.append(Paragraph(text, heading_style))
-                else:
-                    elements.append(Paragraph(text, normal_style))
-            
-            # Handle tables
-            for table in doc.tables:
-                table_data = []
-                for row in table.rows:
-                    row_data = [cell.text[:100] for cell in row.cells]  # Limit cell text
-                    table_data.append(row_data)
-                
-                if table_data:
-                    t = Table(table_data)
-                    t.setStyle(TableStyle([
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('FONTSIZE', (0, 0), (-1, -1), 9),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                    ]))
-                    elements.append(Spacer(1, 12))
-                    elements.append(t)
-                    elements.append(Spacer(1, 12))
-            
-            if not elements:
-                elements.append(Paragraph("Empty document", normal_style))
-            
-            pdf.build(elements)
-            output.seek(0)
-            
-            logger.info("Converted Word to PDF successfully")
-            return output.getvalue()
-            
-        except Exception as e:
-            logger.error(f"Error converting Word to PDF: {e}")
-            raise
+        return await worker_pool.run("word_to_pdf", _word_to_pdf, word_content)
@@ -0,0 +1,95 @@
+from typing import Any, Dict, List
+import json
+
+# Upper bound on steps per request; each step is applied to the whole document
+MAX_PIPELINE_STEPS = 20
+
+PAGE_NUMBER_POSITIONS = ("bottom-center", "bottom-right", "bottom-left")
+COMPRESSION_QUALITIES = ("low", "medium", "high")
+
+
+class PipelineError(ValueError):
+    """Raised for an invalid pipeline definition or a step that doesn't fit the document"""
+
+
+def _require(condition: bool, message: str):
+    if not condition:
+        raise PipelineError(message)
+
+
+def _parse_step(index: int, raw: Any) -> Dict[str, Any]:
+    """Validate one step and normalise it to {"op": ..., params...}"""
+    where = f"Step {index + 1}"
+    _require(isinstance(raw, dict), f"{where}: must be an object")
+    op = raw.get("op")
+
+    if op == "rotate":
+        rotation = raw.get("rotation")
+        _require(rotation in (90, 180, 270), f"{where}: rotation must be 90, 180, or 270 degrees")
+        pages = raw.get("pages")
+        _require(pages is None or isinstance(pages, str), f"{where}: pages must be a page range string")
+        return {"op": op, "rotation": int(rotation), "pages": pages}
+
+    if op == "reorder":
+        page_order = raw.get("page_order")
+        _require(
+            isinstance(page_order, list) and page_order and all(type(page) is int for page in page_order),
+            f"{where}: page_order must be a non-empty array of page numbers"
+        )
+        return {"op": op, "page_order": page_order}
+
+    if op == "split":
+        pages = raw.get("pages")
+        _require(isinstance(pages, str) and pages.strip(), f"{where}: pages is required (e.g. \"1-3,5\")")
+        return {"op": op, "pages": pages}
+
+    if op == "add-watermark":
+        text = raw.get("watermark_text")
+        _require(isinstance(text, str) and text.strip(), f"{where}: watermark_text is required")
+        _require(len(text) <= 50, f"{where}: watermark_text must be 50 characters or less")
+        opacity = raw.get("opacity", 0.3)
+        _require(
+            isinstance(opacity, (int, float)) and 0.1 <= opacity <= 1.0,
+            f"{where}: opacity must be between 0.1 and 1.0"
+        )
+        return {"op": op, "watermark_text": text.strip(), "opacity": float(opacity)}
+
+    if op == "add-page-numbers":
+        position = raw.get("position", "bottom-center")
+        _require(position in PAGE_NUMBER_POSITIONS, f"{where}: position must be one of: {', '.join(PAGE_NUMBER_POSITIONS)}")
+        return {"op": op, "position": position}
+
+    if op == "compress":
+        quality = raw.get("quality", "medium")
+        _require(quality in COMPRESSION_QUALITIES, f"{where}: quality must be 'low', 'medium', or 'high'")
+        return {"op": op, "quality": quality}
+
+    raise PipelineError(
+        f"{where}: unknown op {op!r} (expected rotate, reorder, split, add-watermark, add-page-numbers or compress)"
+    )
+
+
+def parse_pipeline(definition: str) -> List[Dict[str, Any]]:
+    """
+    Parse and validate a pipeline definition
+
+    Page numbers are checked later, against the page count at each step.
+
+    Args:
+        definition: JSON array of steps, e.g.
+            '[{"op": "rotate", "rotation": 90}, {"op": "compress", "quality": "low"}]'
+
+    Returns:
+        Normalised steps, with defaults filled in
+
+    Raises:
+        PipelineError: The definition is malformed or a step is invalid
+    """
+    try:
+        raw_steps = json.loads(definition)
+    except json.JSONDecodeError:
+        raise PipelineError("Invalid pipeline format. Must be a JSON array of steps")
+
+    _require(isinstance(raw_steps, list) and raw_steps, "Pipeline must be a non-empty JSON array of steps")
+    _require(len(raw_steps) <= MAX_PIPELINE_STEPS, f"Pipeline is limited to {MAX_PIPELINE_STEPS} steps")
+    return [_parse_step(index, raw) for index, raw in enumerate(raw_steps)]
@@ -0,0 +1,263 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+
+from app.core.config import settings
+from app.services.retention import retention_scheduler
+from app.storage import blob_storage
+from app.utils.helpers import generate_unique_filename
+from app.utils.uploads import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+# Entries this close to deletion are treated as misses so we never hand out a dying link
+EXPIRY_MARGIN_SECONDS = 5
+
+# Operations produce bytes or the path of an output file, optionally with extra response fields
+ComputeOutput = Union[bytes, str]
+ComputeResult = Union[ComputeOutput, Tuple[ComputeOutput, Dict[str, Any]]]
+
+
+class ResultCache:
+    """LRU index of stored results keyed by input hash, operation and parameters"""
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return settings.result_cache_max_mb * 1024 * 1024
+
+    @staticmethod
+    def make_key(operation: str, input_hashes: List[str], params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build a cache key for an operation
+
+        Args:
+            operation: Operation name
+            input_hashes: SHA-256 of each input, in order
+            params: Parameters that influence the output
+
+        Returns:
+            Hex digest identifying the result
+        """
+        payload = json.dumps(
+            {"operation": operation, "inputs": input_hashes, "params": params or {}},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a live entry for key, counting the hit or miss"""
+        entry = self._entries.get(key)
+        if entry is not None and entry["expires_at"] - EXPIRY_MARGIN_SECONDS <= time.time():
+            self._remove(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        """Insert an entry, evicting least recently used entries over the byte budget"""
+        if entry["size"] > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry["size"]
+
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def touch(self, key: str, expires_at: float):
+        """Extend the lifetime of an entry after its artifact was rescheduled"""
+        if key in self._entries:
+            self._entries[key]["expires_at"] = expires_at
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry["size"]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing the cache"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.result_cache_enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+async def store_output(
+    output: ComputeOutput,
+    extension: str,
+    content_type: str,
+    output_filename: Optional[str] = None
+) -> Tuple[str, str, int]:
+    """
+    Store an operation output under a new unique name
+
+    Args:
+        output: Output bytes, or the path of an output file (moved into storage)
+        extension: Output file extension
+        content_type: Output MIME type
+        output_filename: Name to store under (generated if not given)
+
+    Returns:
+        Tuple of (filename, download_url, size)
+    """
+    output_filename = output_filename or generate_unique_filename(extension)
+    if isinstance(output, str):
+        size = os.path.getsize(output)
+        download_url = await blob_storage.upload_from_path(output, output_filename, content_type=content_type)
+    else:
+        size = len(output)
+        download_url = await blob_storage.upload_file(output, output_filename, content_type=content_type)
+    return output_filename, download_url, size
+
+
+# Stores still running after a direct response was sent
+_background_stores: Set[asyncio.Task] = set()
+
+
+def _output_size(output: ComputeOutput) -> int:
+    return os.path.getsize(output) if isinstance(output, str) else len(output)
+
+
+async def _read_small_output(output: ComputeOutput) -> Optional[bytes]:
+    """Output bytes if they fit in a direct response, else None"""
+    limit = settings.direct_response_max_bytes
+    if isinstance(output, str):
+        if os.path.getsize(output) > limit:
+            return None
+        with open(output, 'rb') as f:
+            return await asyncio.to_thread(f.read)
+    return output if len(output) <= limit else None
+
+
+async def _store_and_index(
+    output: ComputeOutput,
+    entry: Dict[str, Any],
+    key: Optional[str],
+    extension: str
+):
+    """Store an output, schedule its deletion and add it to the cache"""
+    retention_seconds = settings.file_retention_minutes * 60
+    await store_output(output, extension, entry["content_type"], entry["filename"])
+
+    # Schedule cleanup after the retention period
+    await retention_scheduler.schedule(entry["filename"], retention_seconds)
+
+    entry["expires_at"] = time.time() + retention_seconds
+    if key is not None:
+        result_cache.put(key, entry)
+
+
+async def _store_in_background(output: ComputeOutput, entry: Dict[str, Any], key: Optional[str], extension: str):
+    try:
+        await _store_and_index(output, entry, key, extension)
+    except Exception as e:
+        logger.error(f"Error storing {entry['filename']} after direct response: {e}")
+        if isinstance(output, str) and os.path.exists(output):
+            os.remove(output)
+
+
+async def drain_background_stores():
+    """Wait for stores started by direct responses (called on shutdown)"""
+    if _background_stores:
+        await asyncio.gather(*_background_stores, return_exceptions=True)
+
+
+async def get_or_create_result(
+    operation: str,
+    uploads: List[SpooledUpload],
+    params: Optional[Dict[str, Any]],
+    compute: Callable[[], Awaitable[ComputeResult]],
+    extension: str,
+    content_type: str,
+    direct: bool = False
+) -> Dict[str, Any]:
+    """
+    Return the stored result of an operation, computing and storing it on a miss
+
+    With direct set, outputs up to DIRECT_RESPONSE_MAX_MB are also returned as
+    "content" so the route can send them in the response body. A fresh output
+    is then stored (and cached) in the background, so the response does not
+    wait for storage; its download URL becomes valid once that finishes.
+
+    Args:
+        operation: Operation name (part of the cache key)
+        uploads: Spooled inputs whose hashes are part of the key
+        params: Parameters that influence the output
+        compute: Coroutine factory producing the output bytes or file path, optionally with extra fields
+        extension: Output file extension
+        content_type: Output MIME type
+        direct: Also return small outputs as bytes
+
+    Returns:
+        Dictionary with filename, download_url, size, extra, cached flag and
+        content (bytes for direct responses, else None)
+    """
+    retention_seconds = settings.file_retention_minutes * 60
+    key = None
+
+    if settings.result_cache_enabled:
+        key = ResultCache.make_key(operation, [upload.sha256 for upload in uploads], params)
+        entry = result_cache.get(key)
+        if entry is not None:
+            # Give the new requester a full retention window on the shared artifact
+            await retention_scheduler.schedule(entry["filename"], retention_seconds)
+            result_cache.touch(key, time.time() + retention_seconds)
+            logger.info(f"Result cache hit for {operation}: {entry['filename']}")
+            content = None
+            if direct and entry["size"] <= settings.direct_response_max_bytes:
+                content = await blob_storage.download_file(entry["filename"])
+            return {**entry, "cached": True, "content": content}
+
+    result = await compute()
+    data, extra = result if isinstance(result, tuple) else (result, {})
+
+    content = await _read_small_output(data) if direct else None
+    output_filename = generate_unique_filename(extension)
+    entry = {
+        "filename": output_filename,
+        "download_url": blob_storage.get_download_url(output_filename),
+        "size": len(content) if content is not None else _output_size(data),
+        "content_type": content_type,
+        "extra": extra,
+        "expires_at": time.time() + retention_seconds,
+    }
+
+    if content is not None:
+        task = asyncio.create_task(_store_in_background(data, entry, key, extension))
+        _background_stores.add(task)
+        task.add_done_callback(_background_stores.discard)
+    else:
+        await _store_and_index(data, entry, key, extension)
+
+    return {**entry, "cached": False, "content": content}
+
+
+# Global result cache instance
+result_cache = ResultCache()
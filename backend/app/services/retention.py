@@ -0,0 +1,230 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+
+from app.core.config import settings
+from app.storage import blob_storage
+from app.storage.local_storage import UPLOAD_DIR, LocalFileStorage
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DIR = os.path.join(UPLOAD_DIR, ".retention")
+RETENTION_DB_PATH = os.path.join(RETENTION_DIR, "retention.sqlite3")
+
+
+class RetentionScheduler:
+    """Deletes stored files when they expire, driven by a persistent expiry index"""
+
+    def __init__(self, db_path: str = RETENTION_DB_PATH):
+        self.db_path = db_path
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._initialized:
+            self._init_db()
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create the index directory and expiry table if they don't exist"""
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS expiry (
+                    name TEXT PRIMARY KEY,
+                    expires_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(expiry)")}
+            if "attempts" not in columns:
+                conn.execute("ALTER TABLE expiry ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_expiry_expires_at ON expiry (expires_at)")
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def _upsert(self, names: List[str], expires_at: float):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO expiry (name, expires_at) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET expires_at = excluded.expires_at, attempts = 0",
+                [(name, expires_at) for name in names]
+            )
+
+    def _due(self, now: float, limit: int) -> List[Tuple[str, int]]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT name, attempts FROM expiry WHERE expires_at <= ? ORDER BY expires_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+
+    def _forget(self, names: List[str]):
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM expiry WHERE name = ?", [(name,) for name in names])
+
+    def _retry_later(self, failed: List[Tuple[str, int]], now: float):
+        """Push back files whose delete failed, doubling the wait after each failure"""
+        max_delay = settings.file_retention_minutes * 60
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE expiry SET expires_at = ?, attempts = ? WHERE name = ?",
+                [
+                    (now + min(settings.retention_tick_seconds * 2 ** attempts, max_delay), attempts + 1, name)
+                    for name, attempts in failed
+                ]
+            )
+
+    def _expiry(self, name: str) -> Optional[float]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT expires_at FROM expiry WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _next_expiry(self) -> Optional[float]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT MIN(expires_at) FROM expiry").fetchone()
+        return row[0]
+
+    def _index_untracked_files(self) -> int:
+        """Index stored files that predate the scheduler (e.g. left over by a restart)"""
+        # Only local storage keeps its files in the upload directory
+        if not isinstance(blob_storage, LocalFileStorage) or not os.path.isdir(blob_storage.upload_dir):
+            return 0
+        retention_seconds = settings.file_retention_minutes * 60
+        with self._connect() as conn:
+            tracked = {row[0] for row in conn.execute("SELECT name FROM expiry")}
+            untracked = []
+            for entry in os.scandir(blob_storage.upload_dir):
+                if entry.is_file() and entry.name not in tracked:
+                    untracked.append((entry.name, entry.stat().st_mtime + retention_seconds))
+            conn.executemany("INSERT OR IGNORE INTO expiry (name, expires_at) VALUES (?, ?)", untracked)
+        return len(untracked)
+
+    async def schedule(self, name: str, delay_seconds: Optional[int] = None):
+        """
+        Schedule a stored file for deletion
+
+        Args:
+            name: Blob/file name in storage
+            delay_seconds: Time until deletion (defaults to the retention period)
+        """
+        await self.schedule_many([name], delay_seconds)
+
+    async def schedule_many(self, names: List[str], delay_seconds: Optional[int] = None):
+        """
+        Schedule several stored files for deletion in one transaction
+
+        Args:
+            names: Blob/file names in storage
+            delay_seconds: Time until deletion (defaults to the retention period)
+        """
+        if delay_seconds is None:
+            delay_seconds = settings.file_retention_minutes * 60
+        expires_at = time.time() + delay_seconds
+        await asyncio.to_thread(self._upsert, names, expires_at)
+
+        # Wake the loop if this expiry is earlier than what it is sleeping for
+        if self._wakeup is not None and delay_seconds < settings.retention_tick_seconds:
+            self._wakeup.set()
+
+    async def expires_at(self, name: str) -> Optional[datetime]:
+        """
+        When a stored file is due for deletion, including any extension made since it was stored
+
+        Args:
+            name: Blob/file name in storage
+
+        Returns:
+            Expiry time, or None if the file isn't scheduled
+        """
+        expires_at = await asyncio.to_thread(self._expiry, name)
+        return datetime.fromtimestamp(expires_at, tz=timezone.utc) if expires_at is not None else None
+
+    async def run_once(self) -> int:
+        """
+        Delete every file whose expiry has passed, in batches
+
+        Files whose delete fails stay in the index and are retried later,
+        backing off up to the retention period.
+
+        Returns:
+            Number of files deleted
+        """
+        deleted = 0
+        now = time.time()
+        while True:
+            due = await asyncio.to_thread(self._due, now, settings.retention_batch_size)
+            if not due:
+                break
+            done, failed = [], []
+            for name, attempts in due:
+                try:
+                    await blob_storage.delete_file(name)
+                    done.append(name)
+                    deleted += 1
+                except Exception as e:
+                    logger.error(f"Error deleting expired file {name}: {e}")
+                    failed.append((name, attempts))
+            await asyncio.to_thread(self._forget, done)
+            if failed:
+                await asyncio.to_thread(self._retry_later, failed, now)
+            if len(due) < settings.retention_batch_size:
+                break
+
+        if deleted > 0:
+            logger.info(f"Cleaned up {deleted} expired files")
+        return deleted
+
+    async def start(self):
+        """Create the index, index leftover files and start the background deletion loop"""
+        if self._task is not None:
+            return
+        await asyncio.to_thread(self._init_db)
+        indexed = await asyncio.to_thread(self._index_untracked_files)
+        if indexed:
+            logger.info(f"Indexed {indexed} untracked files for retention")
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run_loop(), name="retention-scheduler")
+
+    async def stop(self):
+        """Stop the background loop; pending expiries stay in the index"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run_loop(self):
+        while True:
+            try:
+                await self.run_once()
+                next_expiry = await asyncio.to_thread(self._next_expiry)
+                timeout = settings.retention_tick_seconds
+                if next_expiry is not None:
+                    timeout = min(timeout, max(0.0, next_expiry - time.time()))
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Retention scheduler error: {e}", exc_info=True)
+                await asyncio.sleep(settings.retention_tick_seconds)
+
+
+# Global retention scheduler instance
+retention_scheduler = RetentionScheduler()
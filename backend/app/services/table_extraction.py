@@ -0,0 +1,216 @@
+from typing import Any, Dict, List, Optional, Tuple
+import importlib.util
+import logging
+import shutil
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ENGINE_AUTO = "auto"
+ENGINE_TABULA = "tabula"
+ENGINE_TEXT = "text"
+
+
+class TableEngineUnavailableError(Exception):
+    """Raised when the configured table engine can't run on this host"""
+
+
+class ExtractedTable:
+    """Rows of one table found on a page (page is 1-indexed)"""
+
+    def __init__(self, page: int, rows: List[List[Any]]):
+        self.page = page
+        self.rows = rows
+
+
+class TableExtractor:
+    """A table-extraction engine, created once per worker and reused across requests"""
+
+    name = ""
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def extract(self, pdf_path: str, pages: List[int]) -> List[ExtractedTable]:
+        """
+        Find the tables on the given pages
+
+        Args:
+            pdf_path: Path to the PDF file
+            pages: Page numbers (1-indexed)
+
+        Returns:
+            Tables in page order
+        """
+        raise NotImplementedError
+
+
+class TabulaExtractor(TableExtractor):
+    """
+    tabula-java running in a JVM inside the worker process
+
+    With JPype installed, tabula-py starts the JVM on first use and keeps it
+    for the life of the process, so only the first request in each worker
+    pays for the JVM startup. Without JPype, tabula-py starts a new Java
+    subprocess for every call, which is what this engine exists to avoid.
+    """
+
+    name = ENGINE_TABULA
+
+    @classmethod
+    def available(cls) -> bool:
+        return (
+            importlib.util.find_spec("tabula") is not None
+            and importlib.util.find_spec("jpype") is not None
+            and shutil.which("java") is not None
+        )
+
+    def extract(self, pdf_path: str, pages: List[int]) -> List[ExtractedTable]:
+        import tabula
+
+        tables = []
+        # tabula doesn't report which page a table came from, so read page by page
+        for page in pages:
+            frames = tabula.read_pdf(pdf_path, pages=page, multiple_tables=True, force_subprocess=False)
+            for frame in frames:
+                if frame.empty:
+                    continue
+                values = frame.astype(object).where(frame.notna(), None).values.tolist()
+                tables.append(ExtractedTable(page, [[str(column) for column in frame.columns]] + values))
+        return tables
+
+
+class TextLayoutExtractor(TableExtractor):
+    """
+    Tables recovered from the positions of words in the text layer
+
+    Words are grouped into rows by their vertical position and into cells by
+    the horizontal gaps between them. Runs of consecutive rows with two or
+    more cells form a table, and its columns are the horizontal bands that
+    the cells of those rows cover. Runs in the worker process without Java,
+    but finds nothing on scanned pages that have no text layer.
+    """
+
+    name = ENGINE_TEXT
+
+    # Vertical gaps are in multiples of the median word height on the page and
+    # horizontal gaps in multiples of the median character width; a space
+    # between words is about half a character wide
+    ROW_TOLERANCE = 0.5
+    TABLE_GAP = 2.5
+    CELL_GAP = 2.0
+
+    def extract(self, pdf_path: str, pages: List[int]) -> List[ExtractedTable]:
+        import pymupdf
+
+        tables = []
+        with pymupdf.open(pdf_path) as document:
+            for page in pages:
+                words = document[page - 1].get_text("words")
+                tables.extend(ExtractedTable(page, rows) for rows in self._page_tables(words))
+        return tables
+
+    def _page_tables(self, words: List[Tuple]) -> List[List[List[str]]]:
+        if not words:
+            return []
+        boxes = np.array([word[:4] for word in words], dtype=float)
+        texts = [word[4] for word in words]
+        height = float(np.median(boxes[:, 3] - boxes[:, 1])) or 1.0
+        lengths = np.array([max(len(text), 1) for text in texts])
+        char_width = float(np.median((boxes[:, 2] - boxes[:, 0]) / lengths)) or 1.0
+
+        # Rows: words whose vertical centers are within ROW_TOLERANCE of the previous word
+        centers = (boxes[:, 1] + boxes[:, 3]) / 2
+        order = np.argsort(centers, kind="stable")
+        row_ids = np.concatenate(([0], np.cumsum(np.diff(centers[order]) > height * self.ROW_TOLERANCE)))
+
+        rows: List[Tuple[float, List[Tuple[float, float, str]]]] = []
+        for row_words in np.split(order, np.flatnonzero(np.diff(row_ids)) + 1):
+            row_words = row_words[np.argsort(boxes[row_words, 0], kind="stable")]
+            rows.append((float(centers[row_words].mean()), self._cells(boxes, texts, row_words, char_width)))
+
+        tables = []
+        block: List[List[Tuple[float, float, str]]] = []
+        previous_center: Optional[float] = None
+        for center, cells in rows:
+            continues = previous_center is not None and center - previous_center <= height * self.TABLE_GAP
+            if len(cells) < 2 or not continues:
+                tables.extend(self._table(block))
+                block = []
+            if len(cells) >= 2:
+                block.append(cells)
+            previous_center = center
+        tables.extend(self._table(block))
+        return tables
+
+    def _cells(self, boxes: np.ndarray, texts: List[str], row_words: np.ndarray,
+               char_width: float) -> List[Tuple[float, float, str]]:
+        """Join the words of a row into cells, splitting where the gap exceeds CELL_GAP"""
+        gaps = boxes[row_words[1:], 0] - boxes[row_words[:-1], 2]
+        cells = []
+        for cell_words in np.split(row_words, np.flatnonzero(gaps > char_width * self.CELL_GAP) + 1):
+            cells.append((
+                float(boxes[cell_words, 0].min()),
+                float(boxes[cell_words, 2].max()),
+                " ".join(texts[i] for i in cell_words)
+            ))
+        return cells
+
+    @staticmethod
+    def _table(block: List[List[Tuple[float, float, str]]]) -> List[List[List[str]]]:
+        """Lay out a run of multi-cell rows on the columns their cells cover"""
+        if len(block) < 2:
+            return []
+        spans = np.array([(x0, x1) for cells in block for x0, x1, _ in cells])
+        spans = spans[np.argsort(spans[:, 0], kind="stable")]
+        # A column starts wherever a cell begins right of every cell before it
+        reach = np.maximum.accumulate(spans[:, 1])
+        starts = spans[np.concatenate(([True], spans[1:, 0] > reach[:-1])), 0]
+        if len(starts) < 2:
+            return []
+
+        rows = []
+        for cells in block:
+            row = [""] * len(starts)
+            for x0, _, text in cells:
+                column = int(np.searchsorted(starts, x0, side="right")) - 1
+                row[column] = f"{row[column]} {text}" if row[column] else text
+            rows.append(row)
+        return [rows]
+
+
+_ENGINES = {engine.name: engine for engine in (TabulaExtractor, TextLayoutExtractor)}
+
+# One extractor per worker process, so a warm engine is reused by later requests
+_extractors: Dict[str, TableExtractor] = {}
+
+
+def resolve_engine(name: str) -> str:
+    """
+    Pick the engine to run for a configured name
+
+    "auto" prefers tabula when it can run warm (tabula-py, JPype and Java are
+    all present) and falls back to the text-layout engine otherwise.
+
+    Raises:
+        TableEngineUnavailableError: The engine is unknown or can't run here
+    """
+    if name == ENGINE_AUTO:
+        return ENGINE_TABULA if TabulaExtractor.available() else ENGINE_TEXT
+    engine = _ENGINES.get(name)
+    if engine is None:
+        raise TableEngineUnavailableError(f"Unknown table engine: {name}")
+    if not engine.available():
+        raise TableEngineUnavailableError(f"Table engine '{name}' needs tabula-py, JPype and a Java runtime")
+    return name
+
+
+def get_extractor(name: str) -> TableExtractor:
+    """The worker's extractor for a resolved engine name, created on first use"""
+    extractor = _extractors.get(name)
+    if extractor is None:
+        extractor = _extractors[name] = _ENGINES[name]()
+        logger.info(f"Started {name} table extractor")
+    return extractor
@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import shutil
+import time
+
+from app.core.config import settings
+from app.services.pdf_service import PDFService
+from app.services.result_cache import EXPIRY_MARGIN_SECONDS
+from app.services.retention import retention_scheduler
+from app.storage import blob_storage
+from app.utils.uploads import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+# Thumbnails moved into storage at once while publishing a render pass
+STORE_CONCURRENCY = 8
+
+
+def thumbnail_name(document_id: str, width: int, page: int) -> str:
+    """Storage name of one page preview (page is 1-indexed)"""
+    return f"thumb_{document_id}_{width}_{page}.jpg"
+
+
+class ThumbnailIndex:
+    """LRU index of documents whose thumbnails are in storage, keyed by content hash and width"""
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(document_id: str, width: int) -> str:
+        return f"{document_id}:{width}"
+
+    def get(self, document_id: str, width: int) -> Optional[Dict[str, Any]]:
+        """Return a live entry, dropping it if its files are about to expire"""
+        key = self.make_key(document_id, width)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires_at"] - EXPIRY_MARGIN_SECONDS <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, document_id: str, width: int, entry: Dict[str, Any]):
+        """Insert an entry, evicting the least recently used documents over the limit"""
+        key = self.make_key(document_id, width)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > max(1, settings.thumbnail_cache_documents):
+            self._entries.popitem(last=False)
+
+
+async def _publish(paths: List[str], names: List[str]):
+    """Move rendered images into storage"""
+    semaphore = asyncio.Semaphore(STORE_CONCURRENCY)
+
+    async def store(path: str, name: str):
+        async with semaphore:
+            await blob_storage.upload_from_path(path, name, content_type="image/jpeg")
+
+    await asyncio.gather(*(store(path, name) for path, name in zip(paths, names)))
+
+
+async def get_or_render_thumbnails(upload: SpooledUpload, width: int) -> Dict[str, Any]:
+    """
+    Return the page previews of a document, rendering them on a miss
+
+    Previews are stored one file per page under a name derived from the
+    document's SHA-256, so reopening the same document (in any session) only
+    extends their retention instead of rendering again.
+
+    Args:
+        upload: Spooled PDF
+        width: Thumbnail width in pixels
+
+    Returns:
+        Dictionary with document_id, width, page_count, expires_at and cached flag
+    """
+    retention_seconds = settings.file_retention_minutes * 60
+    document_id = upload.sha256
+
+    entry = thumbnail_index.get(document_id, width)
+    if entry is not None:
+        names = [thumbnail_name(document_id, width, page) for page in range(1, entry["page_count"] + 1)]
+        await retention_scheduler.schedule_many(names, retention_seconds)
+        entry["expires_at"] = time.time() + retention_seconds
+        logger.info(f"Thumbnail cache hit for {document_id[:12]} at {width}px")
+        return {**entry, "cached": True}
+
+    output_dir, paths = await PDFService.render_thumbnails(upload.path, width)
+    try:
+        names = [thumbnail_name(document_id, width, page) for page in range(1, len(paths) + 1)]
+        await _publish(paths, names)
+        await retention_scheduler.schedule_many(names, retention_seconds)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    entry = {
+        "document_id": document_id,
+        "width": width,
+        "page_count": len(paths),
+        "expires_at": time.time() + retention_seconds,
+    }
+    thumbnail_index.put(document_id, width, entry)
+    return {**entry, "cached": False}
+
+
+# Global thumbnail index instance
+thumbnail_index = ThumbnailIndex()
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from app.core.config import settings
+from app.storage.base import BlobProperties, StorageBackend
+
+STORAGE_BACKENDS = ("local", "azure", "memory")
+
+
+def create_storage(backend: Optional[str] = None) -> StorageBackend:
+    """
+    Build a storage backend
+
+    Backends are imported on demand so the Azure SDK is only loaded when used.
+
+    Args:
+        backend: "local", "azure" or "memory" (defaults to STORAGE_BACKEND,
+            else local or azure depending on USE_LOCAL_STORAGE)
+
+    Returns:
+        Storage backend instance
+    """
+    if backend is None:
+        backend = settings.storage_backend or ("local" if settings.use_local_storage else "azure")
+
+    if backend == "local":
+        from app.storage.local_storage import LocalFileStorage
+        return LocalFileStorage()
+    if backend == "azure":
+        from app.storage.azure_blob import AzureBlobStorage
+        return AzureBlobStorage()
+    if backend == "memory":
+        from app.storage.memory_storage import MemoryStorage
+        return MemoryStorage()
+    raise ValueError(f"Unknown storage backend: {backend} (expected one of {', '.join(STORAGE_BACKENDS)})")
+
+
+# Global storage instance
+blob_storage = create_storage()
+
+__all__ = ["BlobProperties", "StorageBackend", "blob_storage", "create_storage"]
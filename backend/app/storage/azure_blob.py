@@ -1,108 +1,281 @@
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
-from azure.core.exceptions import ResourceNotFoundError
-from datetime import datetime, timedelta
-from typing import Optional
-import io
+from azure.storage.blob import BlobBlock, ContentSettings
+from azure.storage.blob.aio import BlobClient, BlobServiceClient, ContainerClient
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.core.pipeline.transport import AioHttpTransport
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional
+import aiohttp
+import asyncio
+import base64
 import logging
+import os
 
 from app.core.config import settings
+from app.core.metrics import instrument_storage
+from app.storage.base import BlobProperties, download_url, guess_content_type
 
 logger = logging.getLogger(__name__)
 
 
 class AzureBlobStorage:
-    """Azure Blob Storage manager for file operations"""
+    """Azure Blob Storage manager for file operations (async, one pooled client per process)"""
     
     def __init__(self):
-        try:
-            self.blob_service_client = BlobServiceClient.from_connection_string(
-                settings.azure_storage_connection_string
-            )
-            self.container_name = settings.azure_storage_container_name
-            self._ensure_container_exists()
-        except Exception as e:
-            logger.error(f"Failed to initialize Azure Blob Storage: {e}")
-            raise
+        self.container_name = settings.azure_storage_container_name
+        self._service_client: Optional[BlobServiceClient] = None
+        self._container_client: Optional[ContainerClient] = None
+        self._lock: Optional[asyncio.Lock] = None
+    
+    async def _get_container(self) -> ContainerClient:
+        """Create the shared client and container on first use"""
+        if self._container_client is not None:
+            return self._container_client
+        
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._container_client is None:
+                if not settings.azure_storage_connection_string:
+                    raise RuntimeError("AZURE_STORAGE_CONNECTION_STRING is not configured")
+                
+                # One aiohttp session for the process: connections are reused across requests
+                session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=settings.azure_max_connections)
+                )
+                self._service_client = BlobServiceClient.from_connection_string(
+                    settings.azure_storage_connection_string,
+                    transport=AioHttpTransport(session=session, session_owner=True)
+                )
+                container_client = self._service_client.get_container_client(self.container_name)
+                await self._ensure_container_exists(container_client)
+                self._container_client = container_client
+        
+        return self._container_client
     
-    def _ensure_container_exists(self):
+    async def _ensure_container_exists(self, container_client: ContainerClient):
         """Create container if it doesn't exist"""
         try:
-            container_client = self.blob_service_client.get_container_client(
-                self.container_name
-            )
-            if not container_client.exists():
-                container_client.create_container()
-                logger.info(f"Created container: {self.container_name}")
-        except Exception as e:
-            logger.error(f"Error ensuring container exists: {e}")
+            await container_client.create_container()
+            logger.info(f"Created container: {self.container_name}")
+        except ResourceExistsError:
+            pass
+    
+    async def _get_blob(self, blob_name: str) -> BlobClient:
+        container_client = await self._get_container()
+        return container_client.get_blob_client(blob_name)
+    
+    @staticmethod
+    def _metadata() -> Dict[str, str]:
+        """Metadata with expiry time"""
+        expiry_time = datetime.utcnow() + timedelta(
+            minutes=settings.file_retention_minutes
+        )
+        return {
+            "expiry_time": expiry_time.isoformat(),
+            "uploaded_at": datetime.utcnow().isoformat()
+        }
+    
+    async def _upload_blocks(
+        self,
+        blob_client: BlobClient,
+        read_block,
+        content_type: str
+    ):
+        """
+        Stage blocks in parallel and commit them as one blob
+        
+        At most azure_upload_concurrency blocks are read ahead and in flight, so
+        memory stays bounded regardless of the blob size.
+        
+        Args:
+            blob_client: Target blob
+            read_block: Coroutine function returning the next block, b"" when done
+            content_type: MIME type of the blob
+        """
+        semaphore = asyncio.Semaphore(settings.azure_upload_concurrency)
+        block_ids: List[str] = []
+        tasks: List[asyncio.Task] = []
+        
+        async def stage(block_id: str, data: bytes):
+            try:
+                await blob_client.stage_block(block_id, data, length=len(data))
+            finally:
+                semaphore.release()
+        
+        try:
+            while True:
+                await semaphore.acquire()
+                data = await read_block()
+                if not data:
+                    semaphore.release()
+                    break
+                # Block IDs must all have the same length before encoding
+                block_id = base64.b64encode(f"{len(block_ids):08d}".encode()).decode()
+                block_ids.append(block_id)
+                tasks.append(asyncio.create_task(stage(block_id, data)))
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        await blob_client.commit_block_list(
+            [BlobBlock(block_id=block_id) for block_id in block_ids],
+            content_settings=ContentSettings(content_type=content_type),
+            metadata=self._metadata()
+        )
     
+    @instrument_storage("upload")
     async def upload_file(
-        self, 
-        file_content: bytes, 
+        self,
+        file_content: bytes,
         blob_name: str,
         content_type: str = "application/pdf"
     ) -> str:
         """
         Upload file to Azure Blob Storage
         
+        Outputs larger than one block are staged as parallel blocks.
+        
         Args:
             file_content: File content as bytes
             blob_name: Name for the blob
             content_type: MIME type of the file
-            
+        
         Returns:
-            Blob URL
+            Download URL
         """
         try:
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name,
-                blob=blob_name
-            )
+            blob_client = await self._get_blob(blob_name)
+            block_size = settings.azure_block_size_bytes
             
-            # Set metadata with expiry time
-            expiry_time = datetime.utcnow() + timedelta(
-                minutes=settings.file_retention_minutes
-            )
-            metadata = {
-                "expiry_time": expiry_time.isoformat(),
-                "uploaded_at": datetime.utcnow().isoformat()
-            }
+            if len(file_content) <= block_size:
+                await blob_client.upload_blob(
+                    file_content,
+                    overwrite=True,
+                    content_settings=ContentSettings(content_type=content_type),
+                    metadata=self._metadata()
+                )
+            else:
+                view = memoryview(file_content)
+                offset = 0
+                
+                async def read_block() -> bytes:
+                    nonlocal offset
+                    block = view[offset:offset + block_size]
+                    offset += len(block)
+                    return bytes(block)
+                
+                await self._upload_blocks(blob_client, read_block, content_type)
             
-            blob_client.upload_blob(
-                file_content,
-                overwrite=True,
-                content_settings={
-                    "content_type": content_type
-                },
-                metadata=metadata
-            )
+            logger.info(f"Uploaded blob: {blob_name}")
+            return self.get_download_url(blob_name)
+        
+        except Exception as e:
+            logger.error(f"Error uploading file: {e}")
+            raise
+    
+    @instrument_storage("upload")
+    async def upload_from_path(
+        self,
+        file_path: str,
+        blob_name: str,
+        content_type: str = "application/pdf"
+    ) -> str:
+        """
+        Upload a file on disk to Azure Blob Storage, streaming it in blocks
+        
+        Args:
+            file_path: Path of the file to upload (removed after upload)
+            blob_name: Name for the blob
+            content_type: MIME type of the file
+        
+        Returns:
+            Download URL
+        """
+        try:
+            blob_client = await self._get_blob(blob_name)
             
+            with open(file_path, "rb") as f:
+                async def read_block() -> bytes:
+                    return await asyncio.to_thread(f.read, settings.azure_block_size_bytes)
+                
+                await self._upload_blocks(blob_client, read_block, content_type)
+            
+            os.remove(file_path)
             logger.info(f"Uploaded blob: {blob_name}")
-            return blob_client.url
+            return self.get_download_url(blob_name)
+        
+        except Exception as e:
+            logger.error(f"Error uploading file: {e}")
+            raise
+    
+    @instrument_storage("upload")
+    async def upload_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        blob_name: str,
+        content_type: str = "application/pdf"
+    ) -> str:
+        """
+        Upload a stream of chunks to Azure Blob Storage as staged blocks
+        
+        Args:
+            chunks: Async iterable of file content
+            blob_name: Name for the blob
+            content_type: MIME type of the file
+        
+        Returns:
+            Download URL
+        """
+        try:
+            blob_client = await self._get_blob(blob_name)
+            block_size = settings.azure_block_size_bytes
+            iterator = chunks.__aiter__()
+            pending = bytearray()
+            exhausted = False
             
+            async def read_block() -> bytes:
+                # Regroup arbitrary chunk sizes into full blocks
+                nonlocal exhausted
+                while not exhausted and len(pending) < block_size:
+                    try:
+                        pending.extend(await iterator.__anext__())
+                    except StopAsyncIteration:
+                        exhausted = True
+                block = bytes(pending[:block_size])
+                del pending[:block_size]
+                return block
+            
+            await self._upload_blocks(blob_client, read_block, content_type)
+            
+            logger.info(f"Uploaded blob: {blob_name}")
+            return self.get_download_url(blob_name)
+        
         except Exception as e:
             logger.error(f"Error uploading file: {e}")
             raise
     
+    @instrument_storage("download")
     async def download_file(self, blob_name: str) -> Optional[bytes]:
         """
         Download file from Azure Blob Storage
         
         Args:
             blob_name: Name of the blob to download
-            
+        
         Returns:
             File content as bytes or None if not found
         """
         try:
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name,
-                blob=blob_name
-            )
-            
-            download_stream = blob_client.download_blob()
-            return download_stream.readall()
+            blob_client = await self._get_blob(blob_name)
             
+            download_stream = await blob_client.download_blob(
+                max_concurrency=settings.azure_upload_concurrency
+            )
+            return await download_stream.readall()
+        
         except ResourceNotFoundError:
             logger.warning(f"Blob not found: {blob_name}")
             return None
@@ -110,26 +283,95 @@ class AzureBlobStorage:
             logger.error(f"Error downloading file: {e}")
             raise
     
+    async def stream_file(
+        self,
+        blob_name: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> Optional[AsyncIterator[bytes]]:
+        """
+        Stream a blob (or a byte range of it) in chunks without buffering it
+        
+        Args:
+            blob_name: Name of the blob to download
+            offset: First byte to read
+            length: Number of bytes to read (None = to the end)
+        
+        Returns:
+            Async iterator of chunks, or None if not found
+        """
+        try:
+            blob_client = await self._get_blob(blob_name)
+            download_stream = await blob_client.download_blob(
+                offset=offset if offset or length is not None else None,
+                length=length
+            )
+        except ResourceNotFoundError:
+            logger.warning(f"Blob not found: {blob_name}")
+            return None
+        
+        return download_stream.chunks()
+    
+    async def get_properties(self, blob_name: str) -> Optional[BlobProperties]:
+        """
+        Read blob properties, with the expiry time from the retention index
+        
+        The expiry_time metadata is written once at upload and isn't updated
+        when a cache hit extends retention, so it is only used for blobs the
+        index doesn't know.
+        
+        Args:
+            blob_name: Name of the blob
+        
+        Returns:
+            Blob properties or None if not found
+        """
+        try:
+            blob_client = await self._get_blob(blob_name)
+            properties = await blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+        
+        # Imported here since the retention scheduler depends on the storage package
+        from app.services.retention import retention_scheduler
+        
+        expires_at = await retention_scheduler.expires_at(blob_name)
+        expiry_time = (properties.metadata or {}).get("expiry_time")
+        if expires_at is None and expiry_time:
+            expires_at = datetime.fromisoformat(expiry_time).replace(tzinfo=timezone.utc)
+        # Prefer the content MD5 (set on single-put uploads) over the service ETag
+        content_md5 = properties.content_settings.content_md5
+        if content_md5:
+            etag = f'"{bytes(content_md5).hex()}"'
+        else:
+            etag = properties.etag if properties.etag.startswith('"') else f'"{properties.etag}"'
+        return BlobProperties(
+            name=blob_name,
+            size=properties.size,
+            content_type=properties.content_settings.content_type or guess_content_type(blob_name),
+            etag=etag,
+            last_modified=properties.last_modified,
+            expires_at=expires_at
+        )
+    
+    @instrument_storage("delete")
     async def delete_file(self, blob_name: str) -> bool:
         """
         Delete file from Azure Blob Storage
         
         Args:
             blob_name: Name of the blob to delete
-            
+        
         Returns:
             True if deleted, False if not found
         """
         try:
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name,
-                blob=blob_name
-            )
+            blob_client = await self._get_blob(blob_name)
             
-            blob_client.delete_blob()
+            await blob_client.delete_blob()
             logger.info(f"Deleted blob: {blob_name}")
             return True
-            
+        
         except ResourceNotFoundError:
             logger.warning(f"Blob not found for deletion: {blob_name}")
             return False
@@ -140,16 +382,12 @@ class AzureBlobStorage:
     async def cleanup_expired_files(self):
         """Delete files that have exceeded retention time"""
         try:
-            container_client = self.blob_service_client.get_container_client(
-                self.container_name
-            )
+            container_client = await self._get_container()
             
             current_time = datetime.utcnow()
             deleted_count = 0
             
-            blobs = container_client.list_blobs(include=['metadata'])
-            
-            for blob in blobs:
+            async for blob in container_client.list_blobs(include=['metadata']):
                 if blob.metadata and 'expiry_time' in blob.metadata:
                     expiry_time = datetime.fromisoformat(
                         blob.metadata['expiry_time']
@@ -161,10 +399,17 @@ class AzureBlobStorage:
             
             if deleted_count > 0:
                 logger.info(f"Cleaned up {deleted_count} expired files")
-                
+        
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
-
-
-# Global storage instance
-blob_storage = AzureBlobStorage()
+    
+    async def close(self):
+        """Close the pooled client and its connections"""
+        if self._service_client is not None:
+            await self._service_client.close()
+            self._service_client = None
+            self._container_client = None
+    
+    def get_download_url(self, blob_name: str) -> str:
+        """URL served by the download route, so the container can stay private"""
+        return download_url(blob_name)
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from datetime import datetime
+import mimetypes
+import os
+from typing import AsyncIterable, AsyncIterator, Optional, Protocol, runtime_checkable
+
+
+@dataclass
+class BlobProperties:
+    """Metadata of a stored file (datetimes are timezone-aware UTC)"""
+    name: str
+    size: int
+    content_type: str
+    etag: str
+    last_modified: datetime
+    expires_at: Optional[datetime] = None
+
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """Interface shared by the local, Azure and in-memory storage backends"""
+
+    async def upload_file(self, file_content: bytes, blob_name: str, content_type: str = "application/pdf") -> str:
+        """Store bytes and return the download URL"""
+        ...
+
+    async def upload_from_path(self, file_path: str, blob_name: str, content_type: str = "application/pdf") -> str:
+        """Store a file on disk (consuming it) and return the download URL"""
+        ...
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        blob_name: str,
+        content_type: str = "application/pdf"
+    ) -> str:
+        """Store a stream of chunks without buffering it whole and return the download URL"""
+        ...
+
+    async def download_file(self, blob_name: str) -> Optional[bytes]:
+        """Read a whole file, or None if not found"""
+        ...
+
+    async def stream_file(
+        self,
+        blob_name: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> Optional[AsyncIterator[bytes]]:
+        """Stream a file (or the byte range offset..offset+length) in chunks, or None if not found"""
+        ...
+
+    async def get_properties(self, blob_name: str) -> Optional[BlobProperties]:
+        """Size, content type, ETag and expiry of a file, or None if not found"""
+        ...
+
+    async def delete_file(self, blob_name: str) -> bool:
+        """Delete a file, returning False if it didn't exist"""
+        ...
+
+    async def cleanup_expired_files(self):
+        """Delete files past their expiry time"""
+        ...
+
+    async def close(self):
+        """Release connections held by the backend"""
+        ...
+
+    def get_download_url(self, blob_name: str) -> str:
+        """URL clients use to download a stored file"""
+        ...
+
+
+# Output types, listed explicitly since system MIME tables may lack the Office formats
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".zip": "application/zip",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+}
+
+
+def guess_content_type(name: str) -> str:
+    """MIME type for a stored file name"""
+    extension = os.path.splitext(name)[1].lower()
+    return CONTENT_TYPES.get(extension) or mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def download_url(blob_name: str) -> str:
+    """Downloads are always served by the API so every backend can stay private"""
+    return f"/api/download/{blob_name}"
@@ -1,15 +1,50 @@
 import os
 import shutil
-from datetime import datetime, timedelta
-from typing import Optional
+import stat
+import tempfile
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterable, AsyncIterator, Optional, Tuple
+import hashlib
 import logging
 import asyncio
 
+from app.core.config import settings
+from app.core.metrics import instrument_storage
+from app.storage.base import BlobProperties, download_url, guess_content_type
+
 logger = logging.getLogger(__name__)
 
 # Directory for local file storage
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "temp_files")
 
+# Chunk size for streamed reads
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Content hashes kept for ETags, keyed by (name, mtime_ns, size)
+HASH_CACHE_ENTRIES = 4096
+
+
+def _hash_file(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_file(file_path: str, content: bytes):
+    with open(file_path, 'wb') as f:
+        f.write(content)
+
+
+def _read_file(file_path: str) -> Optional[bytes]:
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
 
 class LocalFileStorage:
     """Local file storage manager for development/testing"""
@@ -17,13 +52,15 @@ class LocalFileStorage:
     def __init__(self):
         self.upload_dir = UPLOAD_DIR
         self._ensure_directory_exists()
-        self.file_retention_minutes = 30
+        self.file_retention_minutes = settings.file_retention_minutes
+        self._hashes: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
     
     def _ensure_directory_exists(self):
         """Create upload directory if it doesn't exist"""
         os.makedirs(self.upload_dir, exist_ok=True)
         logger.info(f"Using local storage directory: {self.upload_dir}")
     
+    @instrument_storage("upload")
     async def upload_file(
         self, 
         file_content: bytes, 
@@ -33,6 +70,8 @@ class LocalFileStorage:
         """
         Save file to local storage
         
+        The write runs in a thread so large outputs don't block the event loop.
+        
         Args:
             file_content: File content as bytes
             blob_name: Name for the file
@@ -44,20 +83,84 @@ class LocalFileStorage:
         try:
             file_path = os.path.join(self.upload_dir, blob_name)
             
-            with open(file_path, 'wb') as f:
-                f.write(file_content)
+            await asyncio.to_thread(_write_file, file_path, file_content)
+            
+            logger.info(f"Saved file locally: {blob_name}")
+            return self.get_download_url(blob_name)
+            
+        except Exception as e:
+            logger.error(f"Error saving file locally: {e}")
+            raise
+    
+    @instrument_storage("upload")
+    async def upload_from_path(
+        self,
+        file_path: str,
+        blob_name: str,
+        content_type: str = "application/pdf"
+    ) -> str:
+        """
+        Move a file on disk into local storage without reading it into memory
+        
+        Args:
+            file_path: Path of the file to store (it is moved, not copied)
+            blob_name: Name for the file
+            content_type: MIME type of the file
+            
+        Returns:
+            File URL (local path for download)
+        """
+        try:
+            await asyncio.to_thread(shutil.move, file_path, os.path.join(self.upload_dir, blob_name))
+            
+            logger.info(f"Saved file locally: {blob_name}")
+            return self.get_download_url(blob_name)
+            
+        except Exception as e:
+            logger.error(f"Error saving file locally: {e}")
+            raise
+    
+    @instrument_storage("upload")
+    async def upload_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        blob_name: str,
+        content_type: str = "application/pdf"
+    ) -> str:
+        """
+        Write a stream of chunks to local storage
+        
+        The file is written under a temporary name and renamed when complete,
+        so readers never see a partial file.
+        
+        Args:
+            chunks: Async iterable of file content
+            blob_name: Name for the file
+            content_type: MIME type of the file
+            
+        Returns:
+            File URL (local path for download)
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.upload_dir, prefix=".partial-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                async for chunk in chunks:
+                    await asyncio.to_thread(f.write, chunk)
+            os.replace(temp_path, os.path.join(self.upload_dir, blob_name))
             
             logger.info(f"Saved file locally: {blob_name}")
-            # Return a URL that the frontend can use to download
-            return f"/api/download/{blob_name}"
+            return self.get_download_url(blob_name)
             
         except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
             logger.error(f"Error saving file locally: {e}")
             raise
     
+    @instrument_storage("download")
     async def download_file(self, blob_name: str) -> Optional[bytes]:
         """
-        Read file from local storage
+        Read file from local storage (in a thread, like the writes)
         
         Args:
             blob_name: Name of the file to read
@@ -68,17 +171,102 @@ class LocalFileStorage:
         try:
             file_path = os.path.join(self.upload_dir, blob_name)
             
-            if not os.path.exists(file_path):
+            content = await asyncio.to_thread(_read_file, file_path)
+            if content is None:
                 logger.warning(f"File not found: {blob_name}")
-                return None
-            
-            with open(file_path, 'rb') as f:
-                return f.read()
+            return content
             
         except Exception as e:
             logger.error(f"Error reading file: {e}")
             raise
     
+    async def stream_file(
+        self,
+        blob_name: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> Optional[AsyncIterator[bytes]]:
+        """
+        Stream a file from local storage in chunks
+        
+        Args:
+            blob_name: Name of the file to read
+            offset: First byte to read
+            length: Number of bytes to read (None = to the end)
+            
+        Returns:
+            Async iterator of chunks, or None if not found
+        """
+        file_path = os.path.join(self.upload_dir, blob_name)
+        
+        if not os.path.exists(file_path):
+            logger.warning(f"File not found: {blob_name}")
+            return None
+        
+        async def chunks() -> AsyncIterator[bytes]:
+            remaining = length
+            with open(file_path, 'rb') as f:
+                f.seek(offset)
+                while remaining is None or remaining > 0:
+                    size = STREAM_CHUNK_SIZE if remaining is None else min(STREAM_CHUNK_SIZE, remaining)
+                    chunk = await asyncio.to_thread(f.read, size)
+                    if not chunk:
+                        break
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    yield chunk
+        
+        return chunks()
+    
+    async def get_properties(self, blob_name: str) -> Optional[BlobProperties]:
+        """
+        Read file metadata from the filesystem
+        
+        The content type is derived from the extension and the expiry is read
+        from the retention index, falling back to the modification time plus
+        the retention period for unindexed files. The ETag is the SHA-256 of
+        the content, hashed on first request and cached while the file is
+        unchanged.
+        
+        Args:
+            blob_name: Name of the file
+            
+        Returns:
+            File properties or None if not found
+        """
+        file_path = os.path.join(self.upload_dir, blob_name)
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+        
+        key = (blob_name, file_stat.st_mtime_ns, file_stat.st_size)
+        content_hash = self._hashes.get(key)
+        if content_hash is None:
+            content_hash = await asyncio.to_thread(_hash_file, file_path)
+            self._hashes[key] = content_hash
+            if len(self._hashes) > HASH_CACHE_ENTRIES:
+                self._hashes.popitem(last=False)
+        else:
+            self._hashes.move_to_end(key)
+        
+        # Imported here since the retention scheduler depends on this module
+        from app.services.retention import retention_scheduler
+        
+        last_modified = datetime.fromtimestamp(file_stat.st_mtime, tz=timezone.utc)
+        expires_at = await retention_scheduler.expires_at(blob_name)
+        return BlobProperties(
+            name=blob_name,
+            size=file_stat.st_size,
+            content_type=guess_content_type(blob_name),
+            etag=f'"{content_hash}"',
+            last_modified=last_modified,
+            expires_at=expires_at or last_modified + timedelta(minutes=self.file_retention_minutes)
+        )
+    
+    @instrument_storage("delete")
     async def delete_file(self, blob_name: str, delay_seconds: int = 0) -> bool:
         """
         Delete file from local storage
@@ -128,7 +316,10 @@ class LocalFileStorage:
                 
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
-
-
-# Global storage instance
-blob_storage = LocalFileStorage()
+    
+    async def close(self):
+        """Nothing to release for local storage"""
+    
+    def get_download_url(self, blob_name: str) -> str:
+        """URL served by the download route"""
+        return download_url(blob_name)
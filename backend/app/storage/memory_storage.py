@@ -0,0 +1,163 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterable, AsyncIterator, Dict, Optional
+import asyncio
+import hashlib
+import logging
+import os
+
+from app.core.config import settings
+from app.core.metrics import instrument_storage
+from app.storage.base import BlobProperties, download_url
+
+logger = logging.getLogger(__name__)
+
+# Chunk size for streamed reads
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class _MemoryBlob:
+    data: bytes
+    content_type: str
+    etag: str
+    last_modified: datetime
+    expires_at: datetime
+
+
+class MemoryStorage:
+    """In-process storage for tests and benchmarks; contents are lost on restart"""
+
+    def __init__(self):
+        self._blobs: Dict[str, _MemoryBlob] = {}
+
+    def _put(self, data: bytes, blob_name: str, content_type: str) -> str:
+        now = datetime.now(timezone.utc)
+        self._blobs[blob_name] = _MemoryBlob(
+            data=data,
+            content_type=content_type,
+            etag=f'"{hashlib.sha256(data).hexdigest()}"',
+            last_modified=now,
+            expires_at=now + timedelta(minutes=settings.file_retention_minutes)
+        )
+        return self.get_download_url(blob_name)
+
+    @instrument_storage("upload")
+    async def upload_file(self, file_content: bytes, blob_name: str, content_type: str = "application/pdf") -> str:
+        """
+        Keep file content in memory
+
+        Args:
+            file_content: File content as bytes
+            blob_name: Name for the file
+            content_type: MIME type of the file
+
+        Returns:
+            Download URL
+        """
+        return self._put(bytes(file_content), blob_name, content_type)
+
+    @instrument_storage("upload")
+    async def upload_from_path(self, file_path: str, blob_name: str, content_type: str = "application/pdf") -> str:
+        """
+        Read a file on disk into memory and remove it
+
+        Args:
+            file_path: Path of the file to store (removed after reading)
+            blob_name: Name for the file
+            content_type: MIME type of the file
+
+        Returns:
+            Download URL
+        """
+        with open(file_path, "rb") as f:
+            data = await asyncio.to_thread(f.read)
+        os.remove(file_path)
+        return self._put(data, blob_name, content_type)
+
+    @instrument_storage("upload")
+    async def upload_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        blob_name: str,
+        content_type: str = "application/pdf"
+    ) -> str:
+        """
+        Collect a stream of chunks into memory
+
+        Args:
+            chunks: Async iterable of file content
+            blob_name: Name for the file
+            content_type: MIME type of the file
+
+        Returns:
+            Download URL
+        """
+        data = bytearray()
+        async for chunk in chunks:
+            data.extend(chunk)
+        return self._put(bytes(data), blob_name, content_type)
+
+    @instrument_storage("download")
+    async def download_file(self, blob_name: str) -> Optional[bytes]:
+        """Return the stored bytes or None if not found"""
+        blob = self._blobs.get(blob_name)
+        return blob.data if blob is not None else None
+
+    async def stream_file(
+        self,
+        blob_name: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> Optional[AsyncIterator[bytes]]:
+        """Stream the stored bytes (or a range of them) in chunks, or None if not found"""
+        blob = self._blobs.get(blob_name)
+        if blob is None:
+            return None
+        end = len(blob.data) if length is None else min(offset + length, len(blob.data))
+        view = memoryview(blob.data)
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for start in range(offset, end, STREAM_CHUNK_SIZE):
+                yield bytes(view[start:min(start + STREAM_CHUNK_SIZE, end)])
+
+        return chunks()
+
+    async def get_properties(self, blob_name: str) -> Optional[BlobProperties]:
+        """Properties of a stored blob or None if not found (expiry from the retention index when scheduled)"""
+        # Imported here since the retention scheduler depends on the storage package
+        from app.services.retention import retention_scheduler
+
+        blob = self._blobs.get(blob_name)
+        if blob is None:
+            return None
+        expires_at = await retention_scheduler.expires_at(blob_name)
+        return BlobProperties(
+            name=blob_name,
+            size=len(blob.data),
+            content_type=blob.content_type,
+            etag=blob.etag,
+            last_modified=blob.last_modified,
+            expires_at=expires_at or blob.expires_at
+        )
+
+    @instrument_storage("delete")
+    async def delete_file(self, blob_name: str) -> bool:
+        """Drop a blob, returning False if it didn't exist"""
+        return self._blobs.pop(blob_name, None) is not None
+
+    async def cleanup_expired_files(self):
+        """Drop blobs past their expiry time"""
+        now = datetime.now(timezone.utc)
+        expired = [name for name, blob in self._blobs.items() if blob.expires_at < now]
+        for name in expired:
+            del self._blobs[name]
+        if expired:
+            logger.info(f"Cleaned up {len(expired)} expired files")
+
+    async def close(self):
+        """Nothing to release for in-memory storage"""
+
+    def get_download_url(self, blob_name: str) -> str:
+        """URL served by the download route"""
+        return download_url(blob_name)
@@ -0,0 +1,184 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request
+from fastapi.responses import Response
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+import json
+
+from app.storage.base import BlobProperties
+
+# Headers a browser client needs to read from direct responses
+DIRECT_RESPONSE_HEADERS = ["Content-Disposition", "X-Download-Url", "X-Result"]
+
+
+class RangeNotSatisfiableError(Exception):
+    """Raised when a Range header lies entirely outside the file"""
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def validator_headers(properties: BlobProperties) -> Dict[str, str]:
+    """
+    Caching headers for a stored file
+
+    Stored files never change under the same name, so clients may reuse them
+    until they expire and revalidate cheaply with the ETag afterwards.
+
+    Args:
+        properties: Properties of the stored file
+
+    Returns:
+        ETag, Last-Modified, Cache-Control and Accept-Ranges headers
+    """
+    headers = {
+        "ETag": properties.etag,
+        "Last-Modified": _http_date(properties.last_modified),
+        "Accept-Ranges": "bytes",
+    }
+    if properties.expires_at is not None:
+        max_age = max(0, int((properties.expires_at - datetime.now(timezone.utc)).total_seconds()))
+        headers["Cache-Control"] = f"private, max-age={max_age}"
+        headers["Expires"] = _http_date(properties.expires_at)
+    else:
+        headers["Cache-Control"] = "private, no-cache"
+    return headers
+
+
+def is_not_modified(request_headers: Mapping[str, str], properties: BlobProperties) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since (If-None-Match wins when both are sent)
+
+    Args:
+        request_headers: Request headers
+        properties: Properties of the stored file
+
+    Returns:
+        True if a 304 response should be sent
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {_strip_weak(tag.strip()) for tag in if_none_match.split(",")}
+        return _strip_weak(properties.etag) in candidates
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is not None:
+        since = _parse_http_date(if_modified_since)
+        # HTTP dates have one-second resolution
+        return since is not None and properties.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def _range_applies(request_headers: Mapping[str, str], properties: BlobProperties) -> bool:
+    """If-Range: only honour Range when the client's copy is still current"""
+    if_range = request_headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        # Strong comparison; weak tags never match
+        return if_range == properties.etag
+    since = _parse_http_date(if_range)
+    return since is not None and properties.last_modified.replace(microsecond=0) == since
+
+
+def parse_range(request_headers: Mapping[str, str], properties: BlobProperties) -> Optional[Tuple[int, int]]:
+    """
+    Resolve the Range header to one inclusive byte range
+
+    Multiple ranges, malformed headers and failed If-Range checks fall back to
+    the full file, as RFC 9110 allows.
+
+    Args:
+        request_headers: Request headers
+        properties: Properties of the stored file
+
+    Returns:
+        (first, last) byte positions, or None to send the whole file
+
+    Raises:
+        RangeNotSatisfiableError: The range starts beyond the end of the file
+    """
+    header = request_headers.get("range")
+    if not header or not _range_applies(request_headers, properties):
+        return None
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, dash, last = spec.strip().partition("-")
+    size = properties.size
+    if size == 0:
+        return None
+    try:
+        if not dash:
+            return None
+        if first == "":
+            # Suffix range: the last N bytes
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiableError()
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiableError()
+    if start < 0 or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def wants_direct_response(request: Request) -> bool:
+    """Whether the client asked for the output in the response body (?response_mode=direct)"""
+    return request.query_params.get("response_mode") == "direct"
+
+
+def result_response(result: Dict[str, Any], body: Dict[str, Any]) -> Union[Dict[str, Any], Response]:
+    """
+    Build an operation's response
+
+    Direct results are sent as the output bytes, with the scalar fields of the
+    usual JSON body (sizes, counts, filename) in the X-Result header. Lists and
+    objects, such as per-image details, are left out, since they can grow past
+    header size limits; they're in the JSON response without direct mode.
+    Everything else gets the JSON body with a download URL.
+
+    Args:
+        result: Result of get_or_create_result
+        body: JSON response body
+
+    Returns:
+        Response with the output bytes, or the body to serialize as JSON
+    """
+    content = result.get("content")
+    if content is None:
+        return body
+    summary = {key: value for key, value in body.items() if not isinstance(value, (list, tuple, dict))}
+    return Response(
+        content,
+        media_type=result["content_type"],
+        headers={
+            "Content-Disposition": f'attachment; filename="{result["filename"]}"',
+            "X-Download-Url": result["download_url"],
+            "X-Result": json.dumps(summary, separators=(",", ":"), default=str),
+        }
+    )
@@ -75,6 +75,27 @@ def parse_page_ranges(page_ranges: str, total_pages: int) -> List[int]:
         List of page numbers (0-indexed)
     """
     pages = set()
+    for group in parse_page_range_groups(page_ranges, total_pages):
+        pages.update(group)
+    
+    return sorted(list(pages))
+
+
+def parse_page_range_groups(page_ranges: str, total_pages: int) -> List[List[int]]:
+    """
+    Parse page range string into one list of page numbers per range
+    
+    Unlike parse_page_ranges, ranges are kept apart and in the given order,
+    and may overlap.
+    
+    Args:
+        page_ranges: String like "1-3,5,7-9"
+        total_pages: Total number of pages in PDF
+        
+    Returns:
+        One list of page numbers (0-indexed) per comma-separated range
+    """
+    groups = []
     
     for part in page_ranges.split(','):
         part = part.strip()
@@ -90,12 +111,12 @@ def parse_page_ranges(page_ranges: str, total_pages: int) -> List[int]:
                 raise ValueError(f"Invalid page range: {part}")
             
             # Add pages (convert to 0-indexed)
-            pages.update(range(start - 1, end))
+            groups.append(list(range(start - 1, end)))
         else:
             # Single page
             page = int(part)
             if page < 1 or page > total_pages:
                 raise ValueError(f"Invalid page number: {page}")
-            pages.add(page - 1)
+            groups.append([page - 1])
     
-    return sorted(list(pages))
+    return groups
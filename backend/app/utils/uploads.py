@@ -0,0 +1,153 @@
+from fastapi import HTTPException, UploadFile
+from typing import BinaryIO, List, Optional
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+
+from app.core.config import settings
+from app.storage.local_storage import UPLOAD_DIR
+
+logger = logging.getLogger(__name__)
+
+# Uploads are spooled next to stored files (same filesystem, so they can be moved cheaply
+# into storage instead of copied a third time)
+SPOOL_DIR = os.path.join(UPLOAD_DIR, ".uploads")
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised while spooling when an upload exceeds its byte budget"""
+
+
+class SpooledUpload:
+    """An uploaded file streamed to a temporary file on disk"""
+
+    def __init__(self, filename: str, path: str, size: int, sha256: str):
+        self.filename = filename
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def read_bytes(self) -> bytes:
+        """Read the whole upload into memory (only for callers that need bytes)"""
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def cleanup(self):
+        """Delete the spooled file if it still exists"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _copy_to_spool(source: BinaryIO, suffix: str, max_bytes: int):
+    """Stream source into a new spool file, hashing and size-checking as it goes"""
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=SPOOL_DIR)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError()
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, size, digest.hexdigest()
+
+
+async def spool_upload(file: UploadFile, max_bytes: Optional[int] = None,
+                       limit_message: Optional[str] = None) -> SpooledUpload:
+    """
+    Copy an uploaded file into the spool directory in fixed-size chunks
+
+    Starlette has already buffered the part (in memory, or in a temporary
+    file once it passes 1MB), so this is a second copy. It exists to give
+    the part a stable path that worker processes can open and that can be
+    moved into storage or a job directory. The SHA-256 for the result cache
+    and the size check are computed in the same pass. Oversized request
+    bodies are rejected before parsing by the Content-Length middleware;
+    the checks here apply the per-file limit to each part.
+
+    Args:
+        file: Uploaded file from the request
+        max_bytes: Maximum allowed size (defaults to settings.max_file_size_bytes)
+        limit_message: Error detail used when the limit is exceeded
+
+    Returns:
+        SpooledUpload pointing at the file on disk
+
+    Raises:
+        HTTPException: 413 as soon as more than max_bytes have been read
+    """
+    if max_bytes is None:
+        max_bytes = settings.max_file_size_bytes
+    limit_message = limit_message or f"File size exceeds {settings.max_file_size_mb}MB limit"
+
+    # Reject before copying anything when the multipart parser already knows the size
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=limit_message)
+
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    try:
+        path, size, sha256 = await asyncio.to_thread(_copy_to_spool, file.file, suffix, max_bytes)
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail=limit_message)
+
+    return SpooledUpload(file.filename, path, size, sha256)
+
+
+async def spool_uploads(files: List[UploadFile], max_total_bytes: Optional[int] = None) -> List[SpooledUpload]:
+    """
+    Spool several uploads, each within MAX_FILE_SIZE_MB and all together within a total budget
+
+    Args:
+        files: Uploaded files from the request
+        max_total_bytes: Maximum combined size (defaults to settings.max_total_upload_bytes)
+
+    Returns:
+        List of SpooledUpload in the same order as files
+
+    Raises:
+        HTTPException: 413 naming whichever limit was exceeded
+    """
+    if max_total_bytes is None:
+        max_total_bytes = settings.max_total_upload_bytes
+    total_mb = max_total_bytes // (1024 * 1024)
+
+    uploads: List[SpooledUpload] = []
+    remaining = max_total_bytes
+    try:
+        for file in files:
+            if remaining < settings.max_file_size_bytes:
+                # The total budget is now the tighter limit, so report that one
+                upload = await spool_upload(
+                    file,
+                    max_bytes=remaining,
+                    limit_message=f"Total upload size exceeds {total_mb}MB limit"
+                )
+            else:
+                upload = await spool_upload(file)
+            uploads.append(upload)
+            remaining -= upload.size
+    except BaseException:
+        cleanup_uploads(uploads)
+        raise
+
+    return uploads
+
+
+def cleanup_uploads(uploads: List[SpooledUpload]):
+    """Delete all spooled files in the list"""
+    for upload in uploads:
+        upload.cleanup()
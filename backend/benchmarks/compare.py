@@ -0,0 +1,93 @@
+"""
+Compare two benchmark result files
+
+Usage:
+    python -m benchmarks.compare baseline.json current.json --threshold 0.10
+
+Exits with status 1 when any case's median time (or peak RSS, with
+--memory-threshold) regressed by more than the threshold.
+"""
+from typing import Any, Dict, List, Optional
+import argparse
+import json
+import sys
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _change(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if not before or after is None:
+        return None
+    return (after - before) / before
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    memory_threshold: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Pair up cases present in both runs and flag regressions
+
+    Args:
+        baseline: Parsed baseline results
+        current: Parsed current results
+        threshold: Allowed relative slowdown of the median time (0.10 = 10%)
+        memory_threshold: Allowed relative growth of peak RSS (None = not checked)
+
+    Returns:
+        One row per case with the relative changes and a regression flag
+    """
+    rows = []
+    for name, after in sorted(current["results"].items()):
+        before = baseline["results"].get(name)
+        if before is None or before.get("status") != "ok" or after.get("status") != "ok":
+            continue
+
+        time_change = _change(before["median_s"], after["median_s"])
+        memory_change = _change(before.get("peak_rss_mb"), after.get("peak_rss_mb"))
+        regressed = time_change is not None and time_change > threshold
+        if memory_threshold is not None and memory_change is not None:
+            regressed = regressed or memory_change > memory_threshold
+
+        rows.append({
+            "name": name,
+            "before_s": before["median_s"],
+            "after_s": after["median_s"],
+            "time_change": time_change,
+            "memory_change": memory_change,
+            "regressed": regressed,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed median slowdown (0.10 = 10%%)")
+    parser.add_argument("--memory-threshold", type=float, help="Allowed peak RSS growth (disabled by default)")
+    args = parser.parse_args(argv)
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    if baseline["meta"].get("scale") != current["meta"].get("scale"):
+        print("warning: comparing runs made at different scales")
+
+    rows = compare(baseline, current, args.threshold, args.memory_threshold)
+    for row in rows:
+        memory = f"{row['memory_change']:+7.1%}" if row["memory_change"] is not None else "    n/a"
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{row['name']:48} {row['before_s']:9.3f}s -> {row['after_s']:9.3f}s "
+              f"{row['time_change']:+7.1%}  rss {memory}{flag}")
+
+    regressions = [row for row in rows if row["regressed"]]
+    print(f"{len(rows)} cases compared, {len(regressions)} regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
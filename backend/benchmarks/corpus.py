@@ -0,0 +1,165 @@
+"""
+Synthetic benchmark corpora
+
+Every document is generated from a fixed seed so two runs on the same scale
+benchmark byte-identical inputs.
+"""
+from typing import Dict, List
+import io
+import os
+import random
+
+from PIL import Image, ImageDraw, ImageFilter
+
+# Document dimensions per scale
+SCALES = {
+    "small": {"text_pages": 20, "image_pages": 5, "many_pages": 200, "files": 20, "table_rows": 200},
+    "medium": {"text_pages": 100, "image_pages": 20, "many_pages": 1000, "files": 40, "table_rows": 2000},
+    "large": {"text_pages": 400, "image_pages": 60, "many_pages": 3000, "files": 100, "table_rows": 20000},
+}
+
+SEED = 1234
+
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _photo(rng: random.Random, width: int, height: int) -> Image.Image:
+    """Noise blurred into something that compresses like a scanned photo"""
+    noise = rng.randbytes((width // 4) * (height // 4))
+    image = Image.frombytes("L", (width // 4, height // 4), noise).convert("RGB")
+    image = image.resize((width, height)).filter(ImageFilter.GaussianBlur(3))
+    draw = ImageDraw.Draw(image)
+    for _ in range(8):
+        x, y = rng.randint(0, width), rng.randint(0, height)
+        draw.ellipse((x, y, x + width // 5, y + height // 5), fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    return image
+
+
+def text_heavy_pdf(path: str, pages: int, rng: random.Random):
+    """Dense text pages, the typical office document"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    for page in range(pages):
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(50, height - 50, f"Section {page + 1}")
+        c.setFont("Helvetica", 10)
+        y = height - 80
+        while y > 50:
+            c.drawString(50, y, _sentence(rng, 14))
+            y -= 14
+        c.showPage()
+    c.save()
+
+
+def image_heavy_pdf(path: str, pages: int, rng: random.Random):
+    """Full-page 300 DPI scans, each page a different image"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(path, pagesize=letter)
+    width, height = letter
+    for _ in range(pages):
+        buffer = io.BytesIO()
+        _photo(rng, 2550, 3300).save(buffer, format="JPEG", quality=90)
+        buffer.seek(0)
+        c.drawImage(ImageReader(buffer), 0, 0, width, height)
+        c.showPage()
+    c.save()
+
+
+def table_pdf(path: str, rows: int, rng: random.Random):
+    """Ruled tables for the table-extraction paths"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+    data = [["ID", "Name", "Quantity", "Price"]]
+    data += [[str(i), rng.choice(_WORDS).title(), str(rng.randint(1, 500)), f"{rng.uniform(1, 999):.2f}"]
+             for i in range(rows)]
+    table = Table(data, repeatRows=1)
+    table.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.black)]))
+    SimpleDocTemplate(path, pagesize=A4).build([table])
+
+
+def photo_jpeg(path: str, width: int, height: int, rng: random.Random):
+    _photo(rng, width, height).save(path, format="JPEG", quality=90)
+
+
+def table_xlsx(path: str, rows: int, rng: random.Random):
+    import pandas as pd
+
+    pd.DataFrame({
+        "ID": range(rows),
+        "Name": [rng.choice(_WORDS).title() for _ in range(rows)],
+        "Quantity": [rng.randint(1, 500) for _ in range(rows)],
+        "Price": [round(rng.uniform(1, 999), 2) for _ in range(rows)],
+    }).to_excel(path, index=False)
+
+
+def text_docx(path: str, paragraphs: int, rng: random.Random):
+    from docx import Document
+
+    document = Document()
+    for index in range(paragraphs):
+        if index % 10 == 0:
+            document.add_heading(f"Section {index // 10 + 1}", level=1)
+        document.add_paragraph(_sentence(rng, 60))
+    document.save(path)
+
+
+def build_corpus(output_dir: str, scale: str = "small") -> Dict[str, object]:
+    """
+    Generate (or reuse) the corpus for a scale
+
+    Args:
+        output_dir: Directory for the generated files
+        scale: One of SCALES
+
+    Returns:
+        Mapping of corpus name to a file path, or a list of paths for multi-file inputs
+    """
+    sizes = SCALES[scale]
+    target = os.path.join(output_dir, scale)
+    os.makedirs(target, exist_ok=True)
+
+    def build(name: str, builder, *args) -> str:
+        path = os.path.join(target, name)
+        if not os.path.exists(path):
+            # Each file gets its own seed, so reusing some files never shifts the others
+            rng = random.Random(f"{SEED}-{scale}-{name}")
+            scratch = f"{path}.tmp{os.path.splitext(name)[1]}"
+            builder(scratch, *args, rng)
+            os.replace(scratch, path)
+        return path
+
+    corpus: Dict[str, object] = {
+        "text_heavy": build("text_heavy.pdf", text_heavy_pdf, sizes["text_pages"]),
+        "image_heavy": build("image_heavy.pdf", image_heavy_pdf, sizes["image_pages"]),
+        "many_pages": build("many_pages.pdf", text_heavy_pdf, sizes["many_pages"]),
+        "tables": build("tables.pdf", table_pdf, sizes["table_rows"]),
+        "spreadsheet": build("spreadsheet.xlsx", table_xlsx, sizes["table_rows"]),
+        "document": build("document.docx", text_docx, sizes["text_pages"] * 5),
+    }
+
+    many_files: List[str] = []
+    for index in range(sizes["files"]):
+        many_files.append(build(f"file_{index:03d}.pdf", text_heavy_pdf, 3))
+    corpus["many_files"] = many_files
+
+    photos: List[str] = []
+    for index in range(min(sizes["files"], 20)):
+        photos.append(build(f"photo_{index:03d}.jpg", photo_jpeg, 1600, 1200))
+    corpus["photos"] = photos
+
+    return corpus
@@ -0,0 +1,278 @@
+"""
+Benchmark every PDFService operation and HTTP route
+
+Usage (from the backend directory):
+    python -m benchmarks.run --scale small --repeat 3 --output results.json
+    python -m benchmarks.compare baseline.json results.json --threshold 0.10
+"""
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import SCALES, build_corpus
+
+DEFAULT_CORPUS_DIR = os.path.join(os.path.dirname(__file__), ".corpus")
+
+
+@dataclass
+class Case:
+    """One benchmarked call: a PDFService method or an HTTP route on one corpus"""
+    name: str
+    kind: str  # "service" or "route"
+    corpus: str
+    run: Callable[[], Awaitable[Any]]
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's high-water mark so the next reading is per case (Linux only)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _read_status_kb(field: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _rss_mb() -> float:
+    rss = _read_status_kb("VmRSS")
+    return rss / 1024 if rss is not None else 0.0
+
+
+def _peak_rss_mb() -> float:
+    peak = _read_status_kb("VmHWM")
+    if peak is not None:
+        return peak / 1024
+    # ru_maxrss is KB on Linux and bytes on macOS, and never resets
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _discard(result: Any):
+    """Drop operation outputs that live on disk"""
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, str) and os.path.isfile(result):
+        os.remove(result)
+
+
+def _service_cases(corpus: Dict[str, Any], scale: str) -> List[Case]:
+    from app.services.pdf_service import PDFService
+
+    many_pages = SCALES[scale]["many_pages"]
+    c = corpus
+
+    def case(name: str, corpus_name: str, factory: Callable[[], Awaitable[Any]]) -> Case:
+        return Case(f"service.{name}[{corpus_name}]", "service", corpus_name, factory)
+
+    return [
+        case("merge_pdfs", "many_files", lambda: PDFService.merge_pdfs(c["many_files"])),
+        case("split_pdf", "many_pages", lambda: PDFService.split_pdf(c["many_pages"], list(range(0, many_pages, 2)))),
+        case("split_pdf_two_pages", "many_pages", lambda: PDFService.split_pdf(c["many_pages"], f"1,{many_pages}")),
+        case("split_pdf_to_files", "many_pages", lambda: PDFService.split_pdf_to_files(c["many_pages"], every=10)),
+        case("compress_pdf", "image_heavy", lambda: PDFService.compress_pdf(c["image_heavy"], "medium")),
+        case("compress_pdf", "text_heavy", lambda: PDFService.compress_pdf(c["text_heavy"], "medium")),
+        case("rotate_pdf", "many_pages", lambda: PDFService.rotate_pdf(c["many_pages"], 90)),
+        case("rotate_pdf", "image_heavy", lambda: PDFService.rotate_pdf(c["image_heavy"], 90, "1-2")),
+        case("rotate_pdf_incremental", "image_heavy", lambda: PDFService.rotate_pdf(c["image_heavy"], 90, "1-2", True)),
+        case("reorder_pdf", "many_pages", lambda: PDFService.reorder_pdf(c["many_pages"], list(range(many_pages))[::-1])),
+        case("get_pdf_info", "many_pages", lambda: PDFService.get_pdf_info(c["many_pages"])),
+        case("pdf_to_word", "text_heavy", lambda: PDFService.pdf_to_word(c["text_heavy"])),
+        case("pdf_to_images", "text_heavy", lambda: PDFService.pdf_to_images(c["text_heavy"], "jpeg", 100)),
+        case("images_to_pdf", "photos", lambda: PDFService.images_to_pdf(c["photos"])),
+        case("add_watermark", "many_pages", lambda: PDFService.add_watermark(c["many_pages"], "CONFIDENTIAL", 0.3)),
+        case("add_page_numbers", "many_pages", lambda: PDFService.add_page_numbers(c["many_pages"])),
+        case("add_page_numbers_incremental", "many_pages", lambda: PDFService.add_page_numbers(c["many_pages"], incremental=True)),
+        case("pdf_to_excel", "tables", lambda: PDFService.pdf_to_excel(c["tables"])),
+        case("pdf_to_excel_tabula", "tables", lambda: PDFService.pdf_to_excel(c["tables"], "tabula")),
+        case("pdf_to_excel_text", "tables", lambda: PDFService.pdf_to_excel(c["tables"], "text")),
+        case("excel_to_pdf", "spreadsheet", lambda: PDFService.excel_to_pdf(c["spreadsheet"])),
+        case("word_to_pdf", "document", lambda: PDFService.word_to_pdf(c["document"])),
+    ]
+
+
+def _route_cases(client, corpus: Dict[str, Any], scale: str) -> List[Case]:
+    from app.storage import blob_storage
+
+    many_pages = SCALES[scale]["many_pages"]
+    payloads: Dict[str, Any] = {}
+
+    def payload(path: str) -> bytes:
+        # Read inputs once so the timed section measures the request, not the disk
+        if path not in payloads:
+            with open(path, "rb") as f:
+                payloads[path] = f.read()
+        return payloads[path]
+
+    def case(route: str, corpus_name: str, data: Optional[dict] = None, field: str = "file") -> Case:
+        paths = corpus[corpus_name] if isinstance(corpus[corpus_name], list) else [corpus[corpus_name]]
+
+        async def run():
+            files = [(field, (os.path.basename(path), payload(path))) for path in paths]
+            response = await client.post(f"/api/{route}", files=files, data=data or {})
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+            filename = response.json().get("filename")
+            if filename:
+                await blob_storage.delete_file(filename)
+            return None
+
+        return Case(f"route.{route}[{corpus_name}]", "route", corpus_name, run)
+
+    return [
+        case("merge", "many_files", field="files"),
+        case("split", "many_pages", {"pages": f"1-{many_pages // 2}"}),
+        case("compress", "image_heavy", {"quality": "medium"}),
+        case("rotate", "many_pages", {"rotation": "90"}),
+        case("reorder", "many_pages", {"page_order": json.dumps(list(range(many_pages, 0, -1)))}),
+        case("add-watermark", "many_pages", {"watermark_text": "CONFIDENTIAL"}),
+        case("add-page-numbers", "many_pages"),
+        case("pdf-to-word", "text_heavy"),
+        case("pdf-to-jpg", "text_heavy", {"dpi": "100"}),
+        case("jpg-to-pdf", "photos", field="files"),
+        case("pdf-to-excel", "tables"),
+        case("excel-to-pdf", "spreadsheet"),
+        case("word-to-pdf", "document"),
+    ]
+
+
+async def _measure(case: Case, repeat: int) -> Dict[str, Any]:
+    record: Dict[str, Any] = {"kind": case.kind, "corpus": case.corpus}
+    gc.collect()
+    try:
+        # Warm-up run: imports, caches, pool start-up
+        _discard(await case.run())
+
+        gc.collect()
+        rss_before = _rss_mb()
+        peak_reset = _reset_peak_rss()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = await case.run()
+            timings.append(time.perf_counter() - start)
+            _discard(result)
+            del result
+        peak = _peak_rss_mb()
+    except Exception as e:
+        record.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+        return record
+
+    record.update({
+        "status": "ok",
+        "runs": repeat,
+        "min_s": round(min(timings), 6),
+        "median_s": round(statistics.median(timings), 6),
+        "mean_s": round(statistics.fmean(timings), 6),
+        "peak_rss_mb": round(peak, 1),
+        "peak_rss_delta_mb": round(peak - rss_before, 1) if peak_reset else None,
+    })
+    return record
+
+
+async def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    from app.main import app
+    from app.services.executor import worker_pool
+
+    corpus = build_corpus(args.corpus_dir, args.scale)
+    worker_pool.start()
+    results: Dict[str, Any] = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            cases = []
+            if args.kind in ("all", "service"):
+                cases += _service_cases(corpus, args.scale)
+            if args.kind in ("all", "route"):
+                cases += _route_cases(client, corpus, args.scale)
+            if args.filter:
+                cases = [case for case in cases if args.filter in case.name]
+
+            for case in cases:
+                record = await _measure(case, args.repeat)
+                results[case.name] = record
+                if record["status"] == "ok":
+                    print(f"{case.name:48} {record['median_s']:9.3f}s  peak {record['peak_rss_mb']:8.1f} MB")
+                else:
+                    print(f"{case.name:48} {record['error']}")
+    finally:
+        worker_pool.shutdown()
+
+    return {
+        "meta": {
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "worker_backend": os.environ["WORKER_BACKEND"],
+            "storage_backend": os.environ["STORAGE_BACKEND"],
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PDFService operations and API routes")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (after one warm-up)")
+    parser.add_argument("--kind", choices=["all", "service", "route"], default="all")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--backend", choices=["thread", "process"], default="thread",
+                        help="Worker backend; peak RSS only covers worker memory with 'thread'")
+    parser.add_argument("--storage", choices=["local", "memory"], default="local",
+                        help="Storage backend for route outputs; 'memory' leaves disk I/O out of the timings")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time, so configure the app before importing it.
+    # The result cache would turn every repeat into a cache hit.
+    os.environ["WORKER_BACKEND"] = args.backend
+    os.environ["RESULT_CACHE_ENABLED"] = "false"
+    os.environ["STORAGE_BACKEND"] = args.storage
+
+    report = asyncio.run(run_benchmarks(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
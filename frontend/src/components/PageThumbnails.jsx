@@ -0,0 +1,46 @@
+import { useEffect, useState } from 'react'
+import { pdfService } from '../services/api'
+
+const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000'
+
+export default function PageThumbnails({ file }) {
+  const [thumbnails, setThumbnails] = useState([])
+
+  useEffect(() => {
+    if (!file) {
+      setThumbnails([])
+      return
+    }
+
+    let cancelled = false
+    pdfService.getThumbnails(file)
+      .then((data) => {
+        if (!cancelled) setThumbnails(data.thumbnails)
+      })
+      .catch(() => {
+        // Previews are optional; the tool still works without them
+        if (!cancelled) setThumbnails([])
+      })
+    return () => {
+      cancelled = true
+    }
+  }, [file])
+
+  if (thumbnails.length === 0) return null
+
+  return (
+    <div className="grid grid-cols-4 sm:grid-cols-6 md:grid-cols-8 gap-2 sm:gap-3">
+      {thumbnails.map((url, index) => (
+        <figure key={url} className="text-center">
+          <img
+            src={`${API_BASE_URL}${url}`}
+            alt={`Page ${index + 1}`}
+            loading="lazy"
+            className="w-full border border-gray-200 rounded shadow-sm bg-white"
+          />
+          <figcaption className="text-xs text-gray-500 mt-1">{index + 1}</figcaption>
+        </figure>
+      ))}
+    </div>
+  )
+}
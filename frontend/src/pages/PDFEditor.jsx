@@ -3,6 +3,7 @@ import FileUpload from '../components/FileUpload'
 import ProgressBar from '../components/ProgressBar'
 import ResultDisplay from '../components/ResultDisplay'
 import ErrorMessage from '../components/ErrorMessage'
+import PageThumbnails from '../components/PageThumbnails'
 import { pdfService } from '../services/api'
 import { Edit3, Droplets, Hash } from 'lucide-react'
 import SEO, { generateToolSchema, generateBreadcrumbSchema } from '../components/SEO'
@@ -120,6 +121,8 @@ export default function PDFEditor() {
             accept=".pdf"
           />
 
+          <PageThumbnails file={files[0]} />
+
           {files.length > 0 && (
             <div className="bg-white rounded-lg border border-gray-200 p-3 sm:p-4">
               <h3 className="font-semibold text-gray-900 mb-3 sm:mb-4 text-sm sm:text-base">
@@ -3,6 +3,7 @@ import FileUpload from '../components/FileUpload'
 import ProgressBar from '../components/ProgressBar'
 import ResultDisplay from '../components/ResultDisplay'
 import ErrorMessage from '../components/ErrorMessage'
+import PageThumbnails from '../components/PageThumbnails'
 import { pdfService } from '../services/api'
 import { ArrowUpDown } from 'lucide-react'
 import SEO, { generateToolSchema, generateBreadcrumbSchema } from '../components/SEO'
@@ -89,6 +90,8 @@ export default function ReorderPDF() {
             selectedFiles={file ? [file] : []}
           />
 
+          <PageThumbnails file={file} />
+
           {file && (
             <div>
               <label className="block text-sm font-medium text-gray-700 mb-2">
@@ -64,6 +64,16 @@ export const pdfService = {
     return response.data
   },
 
+  // Page thumbnails
+  getThumbnails: async (file, width = 96) => {
+    const formData = new FormData()
+    formData.append('file', file)
+    formData.append('width', width.toString())
+    
+    const response = await api.post('/api/thumbnails', formData)
+    return response.data
+  },
+
   // PDF to Word
   pdfToWord: async (file) => {
     const formData = new FormData()